@@ -0,0 +1,157 @@
+"""
+allocation.py
+-------------
+Per-run random streams and initial part/aircraft allocation.
+
+Kept free of Streamlit/plotting imports so the simulation core (engine,
+managers, allocation, metrics) loads quickly in headless worker processes.
+Re-exported from utils for existing callers.
+"""
+import numpy as np
+
+from duration_sampler import InitialCycleSampler
+
+
+def make_sim_rng(random_seed, *spawn_key):
+    """
+    Create an isolated random Generator for one simulation run.
+
+    Each run owns its Generator instead of sharing the global np.random state,
+    so runs can execute concurrently (or interleaved) with reproducible results.
+
+    Parameters
+    ----------
+    random_seed : int or None
+        User random seed (params['random_seed'])
+    *spawn_key : int
+        Identifies the scenario/replication stream. Runs with the same
+        random_seed but different spawn keys get independent streams.
+        No spawn key reproduces the plain seeded stream.
+
+    Returns
+    -------
+    np.random.Generator
+    """
+    seed_seq = np.random.SeedSequence(random_seed, spawn_key=tuple(spawn_key))
+    return np.random.default_rng(seed_seq)
+
+
+def calculate_initial_allocation(params, rng) -> dict:
+    """
+    Calculate Initial Conditions.
+    
+    Parameters
+    ----------
+    rng : np.random.Generator
+        Generator used for the randomized initial cycles (make_sim_rng). Pass
+        the same Generator given to SimulationEngine so one stream drives the
+        whole run; two Generators from the same seed would repeat each other's draws.
+        With params['common_random_numbers'] cycles come from per-part_id
+        substreams of this Generator's seed (InitialCycleSampler).
+    params :
+        - n_total_parts: Total parts in the system
+        - n_total_aircraft: Total aircraft in the fleet
+        - mission_capable_rate: Percentage (0.0 to 1.0) of aircraft with parts
+        - depot_capacity: Maximum parts that can be in depot
+        - condemn_cycle: Maximum cycle number for randomizing initial cycles
+        - parts_in_depot: Number of parts starting in depot (from UI)
+        - parts_in_cond_f: Number of parts starting in Condition F (from UI)
+        - parts_in_cond_a: Number of parts starting in Condition A (from UI)
+        
+    Returns
+    -------
+    dict with keys:
+
+        'parts_in_depot': Number of parts starting in depot
+        'parts_in_cond_a': Number of parts starting in Condition A
+        'parts_in_cond_f': Number of parts starting in Condition F
+        'n_aircraft_with_parts': Number of aircraft with parts installed
+        'n_aircraft_w_out_parts': Number of aircraft starting in MICAP
+        'cond_a_part_ids': List of part_ids for Condition A
+        'cond_a_cycles': List of randomized cycle numbers for Condition A parts (NEW)
+        'cond_f_part_ids': List of part_ids for Condition F
+        'depot_part_ids': List of part_ids for depot
+        'micap_ac_ids': List of aircraft IDs starting in MICAP
+    """
+    # Extract params
+    n_total_parts = params['n_total_parts']
+    n_total_aircraft = params['n_total_aircraft']
+    mission_capable_rate = params['mission_capable_rate']
+    depot_capacity = params['depot_capacity']
+    condemn_cycle = params['condemn_cycle']
+    parts_in_depot = params['parts_in_depot']
+    parts_in_cond_f = params['parts_in_cond_f']
+    parts_in_cond_a = params['parts_in_cond_a']
+    
+    # Validate mission_capable_rate
+    if not (0.0 <= mission_capable_rate <= 1.0):
+        raise ValueError(
+            f"mission_capable_rate must be between 0.0 and 1.0, got {mission_capable_rate}"
+        )
+    
+    # Step 1: Calculate aircraft with parts (mission capable). rounds up
+    n_aircraft_with_parts = min(n_total_parts, int(np.ceil(mission_capable_rate * n_total_aircraft)))
+
+    
+    # Aircraft without parts (will start in MICAP)
+    n_aircraft_w_out_parts = n_total_aircraft - n_aircraft_with_parts
+    
+    # Step 2: Calculate part_id lists
+    # Part allocation order: aircraft -> depot -> cond_f -> cond_a
+    
+    # NEED to Get RID of using this to also allocate initial sim_id and des_id
+    # until then the order these events are added need to happen in this order. IC_FS is 1st
+    f_start_ac_part_ids = list(range(0, n_aircraft_with_parts))
+    depot_part_ids = list(range(n_aircraft_with_parts, n_aircraft_with_parts + parts_in_depot)) # 2nd
+    cond_f_part_ids = list(range(n_aircraft_with_parts + parts_in_depot, n_aircraft_with_parts
+                                  + parts_in_depot + parts_in_cond_f)) # 3rd
+    cond_a_part_ids = list(range(n_aircraft_with_parts + parts_in_depot + parts_in_cond_f, 
+                                 n_aircraft_with_parts + parts_in_depot + parts_in_cond_f + parts_in_cond_a)) # 4th
+    micap_ac_ids = list(range(n_aircraft_with_parts, n_aircraft_with_parts + n_aircraft_w_out_parts))
+
+    # Generate randomized cycles for Condition A parts
+    # (1, condemn_cycle + 1) = 1 ≤ cycle ≤ condemn_cycle = randomly chosen between 1 and 20
+    # remove the 1 so randomized does not start part in condemn. 
+    # it will be better to have +1 so it starts parts in condemn
+    # just need to handle the initial functions
+    # to handle condemn parts
+    # I guess code can be added to condmen parts with cycle >=20
+    # but also parts shouldn't have cycles higher then condemn
+    # so its better to find a part with a cycle above 20 then to have the 
+    # model blindly handle them
+
+    # I temporarily set cond_a_cycle to do one less because its restarting cycle in initial
+    # so if it starts at cycle 19, it will be at cycle 20 by end of init cond
+    # and init cond does not have code to handle condemn parts yet
+    if params.get('common_random_numbers', False):
+        # Keyed by part_id so a part starts at the same cycle at every grid point
+        cycle_sampler = InitialCycleSampler(rng)
+        draw_cycle = lambda part_id, high: cycle_sampler.integers(part_id, 1, high)
+    else:
+        draw_cycle = lambda part_id, high: int(rng.integers(1, high))
+    cond_a_cycles = [draw_cycle(part_id, condemn_cycle - 1) for part_id in cond_a_part_ids]
+
+    # generate randomized cycles for parts starting in DEPOT
+    # added in SimulationEngine.inject_initial_depot_parts
+    # (1, condemn_cycle + 1) = 1 ≤ cycle ≤ condemn_cycle = randomly chosen between 1 and 20
+    depot_cycles = [draw_cycle(part_id, condemn_cycle) for part_id in depot_part_ids]
+
+    # generate randomized cycles for parts starting in CONDITION F
+    # added in SimulationEngine.inject_init_cond_f
+    cond_f_cycles = [draw_cycle(part_id, condemn_cycle) for part_id in cond_f_part_ids]
+
+    return {
+        'parts_in_depot': parts_in_depot,
+        'parts_in_cond_a': parts_in_cond_a,
+        'parts_in_cond_f': parts_in_cond_f,
+        'n_aircraft_with_parts': n_aircraft_with_parts,
+        'n_aircraft_w_out_parts': n_aircraft_w_out_parts,
+        'f_start_ac_part_ids': f_start_ac_part_ids,
+        'cond_a_part_ids': cond_a_part_ids,
+        'cond_f_part_ids': cond_f_part_ids,
+        'depot_part_ids': depot_part_ids,
+        'micap_ac_ids': micap_ac_ids,
+        'cond_a_cycles': cond_a_cycles,
+        'depot_cycles': depot_cycles,
+        'cond_f_cycles': cond_f_cycles
+    }
@@ -1,5 +1,19 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+from functools import partial
+
+import numpy as np
+
+# Earliest start field per record frame: decides if a cycle is in the analysis window
+WINDOW_START_FIELDS = {
+    'all_parts_df': ['fleet_start', 'depot_start', 'condition_f_start', 'condition_a_start'],
+    'all_ac_df': ['fleet_start', 'micap_start'],
+}
+
+
+def _lazy_frame(name):
+    """DataSets attribute that builds (and window-filters) its frame on first access."""
+    return property(lambda self: self._frame(name),
+                    lambda self, df: self._set_frame(name, df),
+                    doc=f"{name} (built on first access)")
 
 
 class DataSets:
@@ -14,14 +28,27 @@ class DataSets:
     4. main.py: Created 'datasets = DataSets()' after df_manager creation.
     5. main.py: Added 'datasets=datasets' to SimulationEngine call.
     6. main.py: Updated Excel export to use 'datasets.all_parts_df' and 'datasets.aircraft_df'.
+
+    The six frames are lazy: build_part_ac_df() registers builders, a frame is
+    built on first access and the analysis window (filter_by_remove_days) is
+    applied to it once.
     """
+    all_parts_df = _lazy_frame('all_parts_df')
+    all_ac_df = _lazy_frame('all_ac_df')
+    wip_df = _lazy_frame('wip_df')
+    wip_raw = _lazy_frame('wip_raw')
+    wip_ac_df = _lazy_frame('wip_ac_df')
+    wip_ac_raw = _lazy_frame('wip_ac_raw')
+
     def __init__(self, warmup_periods, closing_periods, sim_time, use_buffer=False):
-        self.all_parts_df = None
-        self.all_ac_df = None
-        self.wip_df = None
-        self.wip_raw = None
-        self.wip_ac_df = None
-        self.wip_ac_raw = None
+        # Frames: all_parts_df, all_ac_df, wip_df, wip_raw, wip_ac_df, wip_ac_raw
+        self._builders = {}       # {frame name: callable building the full-run frame}
+        self._frames = {}         # {frame name: frame as returned (None = not available)}
+        self._filtered = set()    # frames the analysis window has been applied to
+        self._window = None       # (start, end) once filter_by_remove_days() is called
+        self.wip_time_avg = None     # {category: time-weighted avg} from the streaming WipTracker
+        self.wip_ac_time_avg = None
+        self.duration_stats = None   # {field: moments} from metrics-only runs (no DataFrames)
         self.warmup_periods = warmup_periods
         self.closing_periods = closing_periods
         self.sim_time = sim_time
@@ -29,56 +56,97 @@ class DataSets:
         self.interval = 1
         # Add more datasets as needed
 
+    def _frame(self, name):
+        if name not in self._frames:
+            builder = self._builders.pop(name, None)
+            self._frames[name] = builder() if builder is not None else None
+        if self._window is not None and name not in self._filtered:
+            self._frames[name] = self._apply_window(name, self._frames[name])
+            self._filtered.add(name)
+        return self._frames[name]
+
+    def _set_frame(self, name, df):
+        self._builders.pop(name, None)
+        self._frames[name] = df
+        self._filtered.add(name)  # assigned frames are taken as they are
+
+    def has_frame(self, name):
+        """True if the frame is or can be built (without building it)."""
+        if name in self._frames:
+            return self._frames[name] is not None
+        return name in self._builders
+
     def build_part_ac_df(self, get_all_parts_data_df, get_ac_df_func,
                          get_wip_end, get_wip_raw,
                          get_wip_ac_end, get_wip_ac_raw,
-                         sim_time):
+                         sim_time, wip_time_avg=None, wip_ac_time_avg=None):
+        """
+        Register the frame builders at end of simulation (end of engine.run).
+
+        Nothing is built here: each frame is built on first access, then
+        restricted to the analysis window once filter_by_remove_days() has been
+        called. The manager getters should read one frozen snapshot of the
+        records (PartManager/AircraftManager.freeze_records()).
+
+        wip_time_avg / wip_ac_time_avg are the time-weighted WIP averages over
+        [warmup_periods, sim_time - closing_periods] (None unless
+        params['time_weighted_averages']). Fast Scenarios runs that never read
+        a WIP frame never build it.
         """
-        Populate datasets at end of simulation (end of engine.run).
-        If use_buffer is True, applies filter_by_remove_days to remove warmup/closing periods.
+        self._builders = {
+            'all_parts_df': get_all_parts_data_df,
+            'all_ac_df': get_ac_df_func,
+            'wip_df': partial(get_wip_end, sim_time, self.interval),
+            'wip_raw': get_wip_raw,
+            'wip_ac_df': partial(get_wip_ac_end, sim_time, self.interval),
+            'wip_ac_raw': get_wip_ac_raw,
+        }
+        self._frames = {}
+        self._filtered = set()
+        self.wip_time_avg = wip_time_avg
+        self.wip_ac_time_avg = wip_ac_time_avg
+
+    def build_metrics(self, wip_time_avg, wip_ac_time_avg, duration_stats):
         """
-        self.all_parts_df = get_all_parts_data_df()
-        self.all_ac_df = get_ac_df_func()
-        self.wip_df = get_wip_end(sim_time, self.interval)
-        self.wip_raw = get_wip_raw()
-        self.wip_ac_df = get_wip_ac_end(sim_time, self.interval)
-        self.wip_ac_raw = get_wip_ac_raw()
+        Populate datasets for a metrics-only run (params['metrics_only']).
+        
+        No part/aircraft/WIP DataFrames are built (they stay None); only the
+        streaming aggregates already restricted to the analysis window.
         
-        # Only filter if buffer time is enabled
-        if self.use_buffer:
-            self.filter_by_remove_days()
+        Args:
+            wip_time_avg (dict): Time-weighted part WIP averages
+            wip_ac_time_avg (dict): Time-weighted aircraft WIP averages
+            duration_stats (dict): {duration field: CycleStats summary}
+        """
+        self.wip_time_avg = wip_time_avg
+        self.wip_ac_time_avg = wip_ac_time_avg
+        self.duration_stats = duration_stats
 
     def filter_by_remove_days(self):
         """
-        Filter out rows where the earliest start time > remove_days or < warmup_periods.
-        
-        For parts: Uses the earliest available start time (fleet_start, depot_start, 
-        condition_f_start, or condition_a_start) since parts may not all start in fleet.
-        For aircraft: Uses the earliest available start time (fleet_start or micap_start).
+        Restrict the frames to the analysis window [warmup_periods, sim_time - closing_periods].
+
+        Parts/aircraft rows are kept when their earliest start time (parts may
+        not all start in fleet: fleet, depot, condition F or A start; aircraft:
+        fleet or MICAP start) is in the window. WIP rows are kept by sim_time.
+
+        The window is applied once per frame: frames built already are filtered
+        now, the others when first accessed. Calling it again has no effect.
         """
-        import pandas as pd
-        
-        remove_days = self.sim_time - self.closing_periods
-        
-        # Get the minimum start time for each PART
-        start_cols = ['fleet_start', 'depot_start', 'condition_f_start', 'condition_a_start']
-        earliest_start = self.all_parts_df[start_cols].min(axis=1)
-        
-        self.all_parts_df = self.all_parts_df[
-            (earliest_start >= self.warmup_periods) & 
-            (earliest_start <= remove_days)]
-        
-        # # Get the minimum start time for each AIRCRAFT
-        start_cols = ['fleet_start', 'micap_start']
-        earliest_start = self.all_ac_df[start_cols].min(axis=1)
-        
-        self.all_ac_df = self.all_ac_df[
-            (earliest_start >= self.warmup_periods) & 
-            (earliest_start <= remove_days)]
-        
-        # WIP data filtering remains the same (based on sim_time)
-        self.wip_df = self.wip_df[(self.wip_df['sim_time'] >= self.warmup_periods) & (self.wip_df['sim_time'] <= remove_days)]
-        self.wip_raw = self.wip_raw[(self.wip_raw['sim_time'] >= self.warmup_periods) & (self.wip_raw['sim_time'] <= remove_days)]
-        self.wip_ac_df = self.wip_ac_df[(self.wip_ac_df['sim_time'] >= self.warmup_periods) & (self.wip_ac_df['sim_time'] <= remove_days)]
-        self.wip_ac_raw = self.wip_ac_raw[(self.wip_ac_raw['sim_time'] >= self.warmup_periods) & (self.wip_ac_raw['sim_time'] <= remove_days)]
+        self._window = (self.warmup_periods, self.sim_time - self.closing_periods)
+        for name in list(self._frames):
+            self._frame(name)
 
+    def _apply_window(self, name, df):
+        """One pass over a frame: a mask on the earliest start, or a slice of time-sorted WIP rows."""
+        if df is None:
+            return None
+        start, end = self._window
+        if name in WINDOW_START_FIELDS:
+            starts = df[WINDOW_START_FIELDS[name]].to_numpy(dtype=float)
+            earliest = np.fmin.reduce(starts, axis=1) if len(df) else np.empty(0)
+            return df[(earliest >= start) & (earliest <= end)]
+        times = df['sim_time'].to_numpy()
+        if df['sim_time'].is_monotonic_increasing:
+            return df.iloc[np.searchsorted(times, start, side='left'):np.searchsorted(times, end, side='right')]
+        return df[(times >= start) & (times <= end)]
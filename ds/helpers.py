@@ -2,6 +2,15 @@ import pandas as pd
 import numpy as np
 
 
+# Start/end field pair per part WIP category
+PART_WIP_FIELDS = {
+    'fleet': ('fleet_start', 'fleet_end'),
+    'condition_f': ('condition_f_start', 'condition_f_end'),
+    'depot': ('depot_start', 'depot_end'),
+    'condition_a': ('condition_a_start', 'condition_a_end'),
+}
+
+
 def compute_unified_wip(all_parts, sim_time, interval):
     """
     Compute WIP counts over time with forward fill from all_parts dictionary.
@@ -28,6 +37,29 @@ def compute_unified_wip(all_parts, sim_time, interval):
     # Build raw WIP counts for each field
     raw_counts = _compute_raw_counts(all_parts_list)
     
+    return _unified_wip_frame(raw_counts, time_index)
+
+
+def compute_unified_wip_arrays(arrays, sim_time, interval):
+    """
+    Compute WIP counts over time with forward fill from part column arrays.
+    
+    Same output as compute_unified_wip() for the columnar PartManager backend.
+    
+    Args:
+        arrays (dict): {field_name: float64 array} with the PART_WIP_FIELDS columns
+        sim_time (int/float): End time of simulation
+        interval (int): Time interval for sampling
+    """
+    time_index = np.arange(0, sim_time + interval, interval)
+    raw_counts = _compute_raw_counts_from_arrays(arrays, PART_WIP_FIELDS)
+    return _unified_wip_frame(raw_counts, time_index)
+
+
+def _unified_wip_frame(raw_counts, time_index):
+    """
+    Build unified (forward-filled) part WIP DataFrame from raw counts.
+    """
     # Interpolate to regular intervals with forward fill
     unified_df = pd.DataFrame({
         'sim_time': time_index,
@@ -51,23 +83,74 @@ def _compute_raw_counts(all_parts_list):
         dict: {field_name: DataFrame with 'index' and 'count' columns}
     """
     # Extract start/end arrays for each field
-    fleet_starts = np.array([r['fleet_start'] for r in all_parts_list], dtype=np.float64)
-    fleet_ends = np.array([r['fleet_end'] for r in all_parts_list], dtype=np.float64)
-    cdf_starts = np.array([r['condition_f_start'] for r in all_parts_list], dtype=np.float64)
-    cdf_ends = np.array([r['condition_f_end'] for r in all_parts_list], dtype=np.float64)
-    depot_starts = np.array([r['depot_start'] for r in all_parts_list], dtype=np.float64)
-    depot_ends = np.array([r['depot_end'] for r in all_parts_list], dtype=np.float64)
-    cda_starts = np.array([r['condition_a_start'] for r in all_parts_list], dtype=np.float64)
-    cda_ends = np.array([r['condition_a_end'] for r in all_parts_list], dtype=np.float64)
+    arrays = _record_arrays(all_parts_list, PART_WIP_FIELDS)
+    
+    return _compute_raw_counts_from_arrays(arrays, PART_WIP_FIELDS)
+
+
+def _compute_raw_counts_from_arrays(arrays, wip_fields):
+    """
+    Compute raw WIP counts from start/end column arrays.
+    
+    Args:
+        arrays (dict): {field_name: float64 array} (NaN = not reached)
+        wip_fields (dict): {category: (start_field, end_field)}
+    
+    Returns:
+        dict: {category: DataFrame with 'index' and 'count' columns}
+    """
+    return {
+        category: _compute_single_count(
+            np.asarray(arrays[start_field], dtype=np.float64),
+            np.asarray(arrays[end_field], dtype=np.float64))
+        for category, (start_field, end_field) in wip_fields.items()
+    }
+
+
+def compute_time_weighted_wip_arrays(arrays, wip_fields, window_start, window_end):
+    """
+    Time-weighted average WIP per category over [window_start, window_end].
+    
+    Area under the step curve divided by the window length, in one vectorized
+    pass per column (no sort, no raw WIP frame): every start adds the time it
+    spends before window_end inside the window, every end subtracts it.
+    
+    Args:
+        arrays (dict): {field_name: float64 array} (NaN = not reached)
+        wip_fields (dict): {category: (start_field, end_field)}
+        window_start (float): Averaging window start (e.g. warmup_periods)
+        window_end (float): Averaging window end (e.g. sim_time - closing_periods)
+    
+    Returns:
+        dict: {category: float} (NaN if the window has zero length)
+    """
+    width = window_end - window_start
+    if not width > 0:
+        return {category: np.nan for category in wip_fields}
+    
+    def time_in_window(times):
+        times = np.asarray(times, dtype=np.float64)
+        times = times[~np.isnan(times)]
+        return (window_end - np.clip(times, window_start, window_end)).sum()
     
     return {
-        'fleet': _compute_single_count(fleet_starts, fleet_ends),
-        'condition_f': _compute_single_count(cdf_starts, cdf_ends),
-        'depot': _compute_single_count(depot_starts, depot_ends),
-        'condition_a': _compute_single_count(cda_starts, cda_ends)
+        category: float(time_in_window(arrays[start_field]) - time_in_window(arrays[end_field])) / width
+        for category, (start_field, end_field) in wip_fields.items()
     }
 
 
+def _record_arrays(records, wip_fields):
+    """
+    Extract {field: float64 array} for the wip_fields start/end columns from a
+    list of record dictionaries.
+    """
+    arrays = {}
+    for start_field, end_field in wip_fields.values():
+        arrays[start_field] = np.array([r[start_field] for r in records], dtype=np.float64)
+        arrays[end_field] = np.array([r[end_field] for r in records], dtype=np.float64)
+    return arrays
+
+
 def _compute_single_count(starts, ends):
     """
     Compute cumulative WIP count over time for a single start/end pair.
@@ -148,15 +231,53 @@ def compute_raw_wip(all_parts):
     
     all_parts_list = list(all_parts.values())
     raw_counts = _compute_raw_counts(all_parts_list)
+    return _raw_wip_frame(raw_counts, list(PART_WIP_FIELDS))
+
+
+def compute_time_weighted_wip(all_parts, window_start, window_end):
+    """
+    Time-weighted average part WIP per category from all_parts dictionary.
+    
+    Args:
+        all_parts (dict): Dictionary {sim_id: record} from get_all_parts_data()
+        window_start, window_end (float): Averaging window
+    
+    Returns:
+        dict: {'fleet', 'condition_f', 'depot', 'condition_a': float}
+    """
+    arrays = _record_arrays(list(all_parts.values()), PART_WIP_FIELDS)
+    return compute_time_weighted_wip_arrays(arrays, PART_WIP_FIELDS, window_start, window_end)
+
+
+def compute_raw_wip_arrays(arrays):
+    """
+    Compute raw WIP counts (no interpolation) from part column arrays.
+    
+    Same output as compute_raw_wip() for the columnar PartManager backend.
     
+    Args:
+        arrays (dict): {field_name: float64 array} with the PART_WIP_FIELDS columns
+    """
+    raw_counts = _compute_raw_counts_from_arrays(arrays, PART_WIP_FIELDS)
+    return _raw_wip_frame(raw_counts, list(PART_WIP_FIELDS))
+
+
+def _raw_wip_frame(raw_counts, fields):
+    """
+    Build raw WIP DataFrame (one row per unique WIP time) from raw counts.
+    
+    Args:
+        raw_counts (dict): {field: DataFrame with 'index' and 'count' columns}
+        fields (list): Count columns in output order
+    """
     # Collect all unique WIP times from all fields
     all_times = set()
-    for field in ['fleet', 'condition_f', 'depot', 'condition_a']:
+    for field in fields:
         if not raw_counts[field].empty:
             all_times.update(raw_counts[field]['index'].values)
     
     if not all_times:
-        return pd.DataFrame(columns=['sim_time', 'fleet', 'condition_f', 'depot', 'condition_a'])
+        return pd.DataFrame(columns=['sim_time'] + fields)
     
     # Sort times
     all_times = np.array(sorted(all_times))
@@ -164,7 +285,7 @@ def compute_raw_wip(all_parts):
     # For each field, get count at each time
     result = pd.DataFrame({'sim_time': all_times})
     
-    for field in ['fleet', 'condition_f', 'depot', 'condition_a']:
+    for field in fields:
         result[field] = _interpolate_counts(raw_counts[field], all_times)
     
     return result
@@ -173,6 +294,13 @@ def compute_raw_wip(all_parts):
 # AIRCRAFT WIP HELPERS
 # ===========================================================
 
+# Start/end field pair per aircraft WIP category
+AC_WIP_FIELDS = {
+    'fleet': ('fleet_start', 'fleet_end'),
+    'micap': ('micap_start', 'micap_end'),
+}
+
+
 def compute_unified_wip_ac(all_ac, sim_time, interval):
     """
     Compute unified WIP counts over time with forward fill from all_ac dictionary.
@@ -194,6 +322,29 @@ def compute_unified_wip_ac(all_ac, sim_time, interval):
     all_ac_list = list(all_ac.values())
     raw_counts = _compute_raw_counts_ac(all_ac_list)
     
+    return _unified_wip_ac_frame(raw_counts, time_index)
+
+
+def compute_unified_wip_ac_arrays(arrays, sim_time, interval):
+    """
+    Compute unified aircraft WIP counts from aircraft column arrays.
+    
+    Same output as compute_unified_wip_ac() for the columnar AircraftManager backend.
+    
+    Args:
+        arrays (dict): {field_name: float64 array} with the AC_WIP_FIELDS columns
+        sim_time (int/float): End time of simulation
+        interval (int): Time interval for sampling
+    """
+    time_index = np.arange(0, sim_time + interval, interval)
+    raw_counts = _compute_raw_counts_from_arrays(arrays, AC_WIP_FIELDS)
+    return _unified_wip_ac_frame(raw_counts, time_index)
+
+
+def _unified_wip_ac_frame(raw_counts, time_index):
+    """
+    Build unified (forward-filled) aircraft WIP DataFrame from raw counts.
+    """
     unified_df = pd.DataFrame({
         'sim_time': time_index,
         'fleet': _interpolate_counts(raw_counts['fleet'], time_index),
@@ -213,15 +364,9 @@ def _compute_raw_counts_ac(all_ac_list):
     Returns:
         dict: {field_name: DataFrame with 'index' and 'count' columns}
     """
-    fleet_starts = np.array([r['fleet_start'] for r in all_ac_list], dtype=np.float64)
-    fleet_ends = np.array([r['fleet_end'] for r in all_ac_list], dtype=np.float64)
-    micap_starts = np.array([r['micap_start'] for r in all_ac_list], dtype=np.float64)
-    micap_ends = np.array([r['micap_end'] for r in all_ac_list], dtype=np.float64)
+    arrays = _record_arrays(all_ac_list, AC_WIP_FIELDS)
     
-    return {
-        'fleet': _compute_single_count(fleet_starts, fleet_ends),
-        'micap': _compute_single_count(micap_starts, micap_ends)
-    }
+    return _compute_raw_counts_from_arrays(arrays, AC_WIP_FIELDS)
 
 
 def compute_raw_wip_ac(all_ac):
@@ -243,21 +388,32 @@ def compute_raw_wip_ac(all_ac):
     
     all_ac_list = list(all_ac.values())
     raw_counts = _compute_raw_counts_ac(all_ac_list)
+    return _raw_wip_frame(raw_counts, list(AC_WIP_FIELDS))
+
+
+def compute_time_weighted_wip_ac(all_ac, window_start, window_end):
+    """
+    Time-weighted average aircraft WIP per category from all_ac dictionary.
     
-    # Collect all unique WIP times from all fields
-    all_times = set()
-    for field in ['fleet', 'micap']:
-        if not raw_counts[field].empty:
-            all_times.update(raw_counts[field]['index'].values)
-    
-    if not all_times:
-        return pd.DataFrame(columns=['sim_time', 'fleet', 'micap'])
-    
-    all_times = np.array(sorted(all_times))
+    Args:
+        all_ac (dict): Dictionary {des_id: record} from get_all_ac_data()
+        window_start, window_end (float): Averaging window
     
-    result = pd.DataFrame({'sim_time': all_times})
+    Returns:
+        dict: {'fleet', 'micap': float}
+    """
+    arrays = _record_arrays(list(all_ac.values()), AC_WIP_FIELDS)
+    return compute_time_weighted_wip_arrays(arrays, AC_WIP_FIELDS, window_start, window_end)
+
+
+def compute_raw_wip_ac_arrays(arrays):
+    """
+    Compute raw aircraft WIP counts (no interpolation) from aircraft column arrays.
     
-    for field in ['fleet', 'micap']:
-        result[field] = _interpolate_counts(raw_counts[field], all_times)
+    Same output as compute_raw_wip_ac() for the columnar AircraftManager backend.
     
-    return result
\ No newline at end of file
+    Args:
+        arrays (dict): {field_name: float64 array} with the AC_WIP_FIELDS columns
+    """
+    raw_counts = _compute_raw_counts_from_arrays(arrays, AC_WIP_FIELDS)
+    return _raw_wip_frame(raw_counts, list(AC_WIP_FIELDS))
@@ -0,0 +1,155 @@
+"""
+stats.py
+--------
+Simulation statistics computed from DataSets (no Streamlit or plotting), used
+by PostSim. ui/stats.py renders them.
+"""
+import numpy as np
+
+
+def calculate_duration_stats(series, name):
+    """
+    Calculate min, mean, max for a duration series.
+    
+    Parameters
+    ----------
+    series : pd.Series
+        Duration values (with NaN allowed)
+    name : str
+        Name of the duration for display
+    
+    Returns
+    -------
+    dict
+        Keys: name, count, mean, min, max
+    """
+    clean = series.dropna()
+    if len(clean) == 0:
+        return {'name': name, 'count': 0, 'mean': np.nan, 'min': np.nan, 'max': np.nan}
+    
+    return {
+        'name': name,
+        'count': len(clean),
+        'mean': clean.mean(),
+        'min': clean.min(),
+        'max': clean.max()
+    }
+
+
+def calculate_simulation_stats(datasets):
+    """
+    Calculate all simulation statistics from datasets.
+    
+    Parameters
+    ----------
+    datasets : DataSets
+        Contains all_parts_df, all_ac_df, wip_df
+    
+    Returns
+    -------
+    dict
+        All calculated statistics
+    """
+    stats = {}
+    
+    # --- MICAP Stats (from wip_df) ---
+    df = datasets.wip_ac_raw
+    if df is not None and len(df) > 0:
+        micap_all = df['micap']
+        micap_nonzero = df[df['micap'] > 0]['micap']
+        
+        stats['micap'] = {
+            'avg_with_zeros': micap_all.mean(), # average w/ no-micap days included
+            'count_all': len(micap_all),
+            # average micap including days where at least one MICAP existed
+            'avg_no_zeros': micap_nonzero.mean() if len(micap_nonzero) > 0 else np.nan,
+            'count_nonzero': len(micap_nonzero),
+            'max_micap': micap_all.max(),
+            'min_micap': micap_all.min()
+        }
+    else:
+        stats['micap'] = None
+    
+    # --- Metrics-only run: duration moments were accumulated during the run ---
+    if datasets.duration_stats is not None:
+        stats.update(datasets.duration_stats)
+        return stats
+    
+    # --- Duration Stats (from all_parts_df) ---
+    parts_df = datasets.all_parts_df
+    if parts_df is not None and len(parts_df) > 0:
+        stats['fleet_duration'] = calculate_duration_stats(
+            parts_df['fleet_duration'], 'Fleet Duration')
+        stats['depot_duration'] = calculate_duration_stats(
+            parts_df['depot_duration'], 'Depot Duration')
+        stats['condition_a_duration'] = calculate_duration_stats(
+            parts_df['condition_a_duration'], 'Condition A Duration')
+        stats['condition_f_duration'] = calculate_duration_stats(
+            parts_df['condition_f_duration'], 'Condition F Duration')
+    
+    # --- MICAP Duration (from all_ac_df) ---
+    ac_df = datasets.all_ac_df
+    if ac_df is not None and len(ac_df) > 0:
+        stats['micap_duration'] = calculate_duration_stats(
+            ac_df['micap_duration'], 'MICAP Duration')
+    
+    return stats
+
+
+def calculate_multi_run_averages(datasets, time_weighted=False):
+    """
+    Compute averages for multi-model results (for a single run).
+    
+    Parameters
+    ----------
+    datasets : DataSets
+        Simulation output datasets
+    time_weighted : bool
+        False: unweighted mean of the wip_raw/wip_ac_raw rows (one row per WIP
+        change, so bursty periods weigh more). count = number of raw rows.
+        True: area under the WIP step curve divided by the analysis window
+        [warmup_periods, sim_time - closing_periods], taken from
+        datasets.wip_time_avg / wip_ac_time_avg (no raw WIP frames needed).
+        count = window length in days.
+    """
+    if time_weighted:
+        return _time_weighted_multi_run_averages(datasets)
+    
+    wip_ac_raw = datasets.wip_ac_raw
+    wip_raw = datasets.wip_raw
+    if wip_ac_raw is None or len(wip_ac_raw) == 0 or wip_raw is None or len(wip_raw) == 0:
+        return {
+            'avg_micap': np.nan,
+            'avg_fleet': np.nan,
+            'avg_cd_f': np.nan,
+            'avg_depot': np.nan,
+            'avg_cd_a': np.nan,
+            'count': 0
+        }
+    return {
+        'avg_micap': wip_ac_raw['micap'].mean(),
+        'avg_fleet': wip_raw['fleet'].mean(),
+        'avg_cd_f': wip_raw['condition_f'].mean(),
+        'avg_depot': wip_raw['depot'].mean(),
+        'avg_cd_a': wip_raw['condition_a'].mean(),
+        'count': len(wip_ac_raw)
+    }
+
+
+def _time_weighted_multi_run_averages(datasets):
+    """
+    Multi-run averages from the time-weighted WIP averages in datasets.
+    """
+    part_avg = datasets.wip_time_avg
+    ac_avg = datasets.wip_ac_time_avg
+    if part_avg is None or ac_avg is None:
+        raise ValueError("time_weighted averages need datasets.wip_time_avg / wip_ac_time_avg")
+    window = datasets.sim_time - datasets.closing_periods - datasets.warmup_periods
+    return {
+        'avg_micap': ac_avg['micap'],
+        'avg_fleet': part_avg['fleet'],
+        'avg_cd_f': part_avg['condition_f'],
+        'avg_depot': part_avg['depot'],
+        'avg_cd_a': part_avg['condition_a'],
+        'count': max(int(window), 0)
+    }
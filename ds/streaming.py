@@ -0,0 +1,365 @@
+"""
+Streaming WIP accumulator updated by the entity managers during the run.
+
+compute_unified_wip()/compute_raw_wip() in ds/helpers.py rebuild the WIP curves
+after the run from every record. WipTracker produces the same curves online:
+
+- The managers report every write to a WIP start/end field (on_change). A start
+  time adds +1 and an end time adds -1 to that category at that time; an
+  overwritten time first removes its old contribution.
+- Changes are kept in a pending dict keyed by time until the engine clock
+  passes them (advance). Times are often in the future (e.g. depot_end is
+  scheduled at depot_start).
+- Applied changes extend the raw step series and the time-weighted integral
+  over the averaging window, so averages need no record history.
+
+At the end of the run finalize() applies the remaining pending changes (times
+past sim_time, same as the post-hoc helpers).
+
+For metrics-only runs (params['metrics_only']) the tracker is built with
+keep_steps=False and CycleStats folds each completed cycle into running
+duration moments, so a run keeps no per-cycle history.
+
+Classes:
+    WipTracker: Online WIP counts, raw step series and time-weighted averages
+    DurationMoments: Running count/mean/variance/min/max of one duration
+    CycleStats: DurationMoments per duration field for cycles in the window
+"""
+import bisect
+import heapq
+import math
+
+import numpy as np
+import pandas as pd
+
+# Duration stats kept by metrics-only runs (same names as calculate_simulation_stats)
+PART_DURATION_FIELDS = {
+    'fleet_duration': 'Fleet Duration',
+    'depot_duration': 'Depot Duration',
+    'condition_a_duration': 'Condition A Duration',
+    'condition_f_duration': 'Condition F Duration',
+}
+AC_DURATION_FIELDS = {'micap_duration': 'MICAP Duration'}
+
+# Earliest of these decides if a cycle is in the analysis window (DataSets.filter_by_remove_days)
+PART_START_FIELDS = ['fleet_start', 'depot_start', 'condition_f_start', 'condition_a_start']
+AC_START_FIELDS = ['fleet_start', 'micap_start']
+
+
+class WipTracker:
+    """
+    Online WIP counts for a set of start/end field categories.
+
+    Produces the same raw/unified WIP frames as compute_raw_wip()/
+    compute_unified_wip() (and the aircraft versions) for the records whose
+    field writes it was given.
+    """
+
+    def __init__(self, wip_fields, window_start=0.0, window_end=np.inf, keep_steps=True):
+        """
+        Parameters
+        ----------
+        wip_fields : dict
+            {category: (start_field, end_field)}, e.g. PART_WIP_FIELDS
+        window_start, window_end : float
+            Time window for time_weighted_averages()
+        keep_steps : bool
+            Keep the raw step series for raw_frame()/unified_frame(). False keeps
+            only counts and integrals (memory independent of sim_time).
+        """
+        self.categories = list(wip_fields)
+        self.field_slots = {}  # field -> (category index, +1 start / -1 end)
+        for i, (start_field, end_field) in enumerate(wip_fields.values()):
+            self.field_slots[start_field] = (i, 1)
+            self.field_slots[end_field] = (i, -1)
+        self.fields = frozenset(self.field_slots)
+        self.window_start = window_start
+        self.window_end = window_end
+        self.keep_steps = keep_steps
+
+        n = len(self.categories)
+        # time -> [n_refs, delta per category]; n_refs keeps a time in the raw
+        # series even when its start/end deltas cancel (matches post-hoc output)
+        self.pending = {}
+        self.pending_times = []  # heap of pending keys
+        self.clock = -np.inf     # last applied change time; later writes before it are 'late'
+        self.counts = [0] * n
+        self.areas = [0.0] * n   # integral of count over window up to clock
+        self.step_times = []     # raw series: applied times in order
+        self.step_counts = []    # counts after all changes at step_times[i]
+        self.step_refs = []      # field values referencing step_times[i]
+
+    # ===========================================================
+    # UPDATES (called by managers / engine)
+    # ===========================================================
+
+    def on_change(self, field, old, new):
+        """
+        Record a write to a record field. Fields outside wip_fields are ignored.
+
+        Parameters
+        ----------
+        field : str
+            Record field name
+        old : float
+            Previous value (NaN/None if unset)
+        new : float
+            New value (NaN/None to clear)
+        """
+        slot = self.field_slots.get(field)
+        if slot is None or old == new:
+            return
+        index, sign = slot
+        if old is not None and old == old:
+            self._add(old, index, -sign, -1)
+        if new is not None and new == new:
+            self._add(new, index, sign, 1)
+
+    def on_fields(self, fields, old_record=None):
+        """
+        Record writes for a {field: value} update. old_record gives previous
+        values (None for a new record).
+        """
+        slots = self.field_slots
+        for field, new in fields.items():
+            slot = slots.get(field)
+            if slot is None:
+                continue
+            old = old_record[field] if old_record is not None else None
+            if old == new:
+                continue
+            index, sign = slot
+            if old is not None and old == old:
+                self._add(old, index, -sign, -1)
+            if new is not None and new == new:
+                self._add(new, index, sign, 1)
+
+    def _add(self, time, index, delta, ref):
+        if time > self.clock:
+            entry = self.pending.get(time)
+            if entry is None:
+                entry = [0] * (len(self.counts) + 1)
+                self.pending[time] = entry
+                heapq.heappush(self.pending_times, time)
+            entry[0] += ref
+            entry[index + 1] += delta
+        elif time == self.clock and self.step_times and self.step_times[-1] == time:
+            # Write at the current event time (e.g. condition_f_start = fleet_end):
+            # zero-width change, only the last step moves
+            self.counts[index] += delta
+            self.step_counts[-1][index] += delta
+            self.step_refs[-1] += ref
+        else:
+            self._apply_late(time, index, delta, ref)
+
+    def _apply_late(self, time, index, delta, ref):
+        """
+        Apply a change at or before the last applied time: patch the
+        integral and the step series from `time` on.
+        """
+        self.counts[index] += delta
+        lo = max(time, self.window_start)
+        hi = min(self.clock, self.window_end)
+        if hi > lo:
+            self.areas[index] += delta * (hi - lo)
+        if not self.keep_steps:
+            return
+
+        times = self.step_times
+        pos = bisect.bisect_left(times, time)
+        if pos == len(times) or times[pos] != time:
+            previous = list(self.step_counts[pos - 1]) if pos > 0 else [0] * len(self.categories)
+            times.insert(pos, time)
+            self.step_counts.insert(pos, previous)
+            self.step_refs.insert(pos, 0)
+        for counts in self.step_counts[pos:]:
+            counts[index] += delta
+        self.step_refs[pos] += ref
+        if self.step_refs[pos] == 0:
+            del times[pos], self.step_counts[pos], self.step_refs[pos]
+
+    def advance(self, now):
+        """
+        Apply pending changes with time <= now (engine clock moved to `now`).
+        Called by the engine before dispatching each event.
+        """
+        pending_times = self.pending_times
+        while pending_times and pending_times[0] <= now:
+            time = heapq.heappop(pending_times)
+            entry = self.pending.pop(time)
+            self._integrate_to(time)
+            if entry[0] > 0:
+                counts = self.counts
+                for i in range(len(counts)):
+                    counts[i] += entry[i + 1]
+                if not self.keep_steps:
+                    continue
+                self.step_times.append(time)
+                self.step_counts.append(list(counts))
+                self.step_refs.append(entry[0])
+
+    def _integrate_to(self, time):
+        """Add count * overlap([clock, time], window) to each area and move the clock."""
+        if time <= self.clock:
+            return
+        lo = max(self.clock, self.window_start)
+        hi = min(time, self.window_end)
+        if hi > lo:
+            width = hi - lo
+            for i, count in enumerate(self.counts):
+                self.areas[i] += count * width
+        self.clock = time
+
+    def finalize(self):
+        """Apply all remaining pending changes and close the window (end of run)."""
+        if math.isfinite(self.window_end):
+            self.advance(self.window_end)
+            self._integrate_to(self.window_end)
+        if self.pending_times:
+            self.advance(max(self.pending_times))
+
+    # ===========================================================
+    # OUTPUT
+    # ===========================================================
+
+    def raw_frame(self):
+        """
+        Raw WIP step series (one row per change time), same as compute_raw_wip().
+        Empty when keep_steps=False.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns sim_time + categories
+        """
+        if not self.step_times:
+            return pd.DataFrame(columns=['sim_time'] + self.categories)
+        counts = np.array(self.step_counts, dtype=int).reshape(len(self.step_times), -1)
+        result = pd.DataFrame({'sim_time': np.array(self.step_times)})
+        for i, category in enumerate(self.categories):
+            result[category] = counts[:, i]
+        return result
+
+    def unified_frame(self, sim_time, interval):
+        """
+        WIP counts at regular intervals with forward fill, same as compute_unified_wip().
+        """
+        time_index = np.arange(0, sim_time + interval, interval)
+        result = pd.DataFrame({'sim_time': time_index})
+        if not self.step_times:
+            for category in self.categories:
+                result[category] = np.zeros(len(time_index), dtype=int)
+            return result
+        counts = np.array(self.step_counts, dtype=int).reshape(len(self.step_times), -1)
+        indices = np.searchsorted(np.array(self.step_times), time_index, side='right') - 1
+        valid = indices >= 0
+        for i, category in enumerate(self.categories):
+            column = np.zeros(len(time_index), dtype=int)
+            column[valid] = counts[indices[valid], i]
+            result[category] = column
+        return result
+
+    def time_weighted_averages(self):
+        """
+        Time-weighted average count per category over the window.
+
+        Returns
+        -------
+        dict
+            {category: float} (NaN if the window has zero length)
+        """
+        width = min(self.clock, self.window_end) - self.window_start
+        if not width > 0:
+            return {category: np.nan for category in self.categories}
+        return {category: area / width for category, area in zip(self.categories, self.areas)}
+
+
+class DurationMoments:
+    """
+    Running count, mean, variance (Welford), min and max of one duration.
+    """
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def add(self, value):
+        """Add one value (NaN values are skipped)."""
+        if value != value:
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def std(self):
+        """Sample standard deviation (NaN for fewer than 2 values)."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    def summary(self, name):
+        """
+        Return the calculate_duration_stats() layout (plus std).
+
+        Returns
+        -------
+        dict
+            Keys: name, count, mean, min, max, std
+        """
+        if self.count == 0:
+            return {'name': name, 'count': 0, 'mean': np.nan, 'min': np.nan, 'max': np.nan, 'std': np.nan}
+        return {'name': name, 'count': self.count, 'mean': self.mean,
+                'min': self.min, 'max': self.max, 'std': self.std}
+
+
+class CycleStats:
+    """
+    Duration moments over cycle records, for records whose earliest start time
+    falls in [window_start, window_end] (same rule as DataSets.filter_by_remove_days).
+    """
+
+    def __init__(self, duration_fields, start_fields, window_start, window_end):
+        """
+        Parameters
+        ----------
+        duration_fields : dict
+            {field: display name}, e.g. {'fleet_duration': 'Fleet Duration'}
+        start_fields : list
+            Start time fields; the earliest non-NaN one decides the window check
+        window_start, window_end : float
+            Analysis window
+        """
+        self.names = dict(duration_fields)
+        self.start_fields = list(start_fields)
+        self.window_start = window_start
+        self.window_end = window_end
+        self.moments = {field: DurationMoments() for field in self.names}
+
+    def add(self, record):
+        """Fold one cycle record into the moments (skipped if outside the window)."""
+        earliest = np.inf
+        for field in self.start_fields:
+            value = record[field]
+            if value < earliest:  # False for NaN
+                earliest = value
+        if not self.window_start <= earliest <= self.window_end:
+            return
+        for field, moments in self.moments.items():
+            moments.add(record[field])
+
+    def summary(self):
+        """
+        Returns
+        -------
+        dict
+            {field: DurationMoments.summary()}
+        """
+        return {field: moments.summary(self.names[field]) for field, moments in self.moments.items()}
@@ -0,0 +1,295 @@
+"""
+Batched random draws for stage durations.
+
+Drawing one scalar per event (rng.normal / rng.weibull) pays NumPy dispatch
+overhead on every fleet and depot stage. The samplers here draw values in
+vectorized blocks, hand them out one at a time and refill lazily when a block
+runs out.
+
+Block sizes start small and double up to max_block so short runs do not pay
+for 64k draws they never use.
+
+Common random numbers (params['common_random_numbers']): KeyedSampler gives
+every aircraft its own fleet substream, so the n-th fleet stage of ac_id draws
+the same duration in every run with the same seed, whatever depot_capacity /
+n_total_parts do to the event order. Initial part cycles are keyed by part_id
+(InitialCycleSampler). Depot durations stay on their own stream in depot
+arrival order: which part is the n-th arrival changes between grid points,
+the n-th repair job does not, so keying depot draws by part_id decorrelates
+neighbouring points instead.
+
+Antithetic pairs (params['antithetic']): with inverse-CDF sampling
+(params['inverse_cdf'], implied by antithetic) every stage duration is
+F^-1(u) of a uniform u. Replication pairs share a seed and the second run
+uses 1 - u, so a long fleet stage in one run is a short one in the other.
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+# Uniforms for inverse-CDF sampling are clipped to [U_EPS, 1 - U_EPS] so 1 - u
+# never hits 0 or 1 (infinite Normal/Weibull quantiles)
+U_EPS = 2.0 ** -53
+
+# Child index of the run seed sequence used for initial cycles with common
+# random numbers (the four stage streams are children 0-3, see StageSamplers)
+INITIAL_CYCLE_STREAM = 4
+
+# Child index for stage samplers rebuilt by SimulationEngine.fork() on the
+# snapshot's own stream (param_overrides without a new rng)
+FORK_STAGE_STREAM = 5
+
+
+def child_seed_seq(rng, index):
+    """
+    Child `index` of rng's seed sequence, built from an explicit spawn key so it
+    does not depend on how many children rng has already spawned.
+    """
+    seq = rng.bit_generator.seed_seq
+    return np.random.SeedSequence(seq.entropy, spawn_key=seq.spawn_key + (index,))
+
+
+class BlockSampler(ABC):
+    """
+    Base class: hands out pre-drawn values from a block, refilling lazily.
+
+    Subclasses implement sample(rng, size) returning an ndarray of the given size.
+    Values are stored as a reversed Python list so next() is a list.pop().
+    """
+
+    def __init__(self, rng, min_block=1024, max_block=65536):
+        """
+        Parameters
+        ----------
+        rng : np.random.Generator
+            Stream owned by this sampler (do not share with other samplers)
+        min_block : int
+            Size of the first block drawn
+        max_block : int
+            Upper bound for block size (blocks double until reaching it)
+        """
+        self.rng = rng
+        self.block_size = min_block
+        self.max_block = max_block
+        self._buffer = []
+
+    @abstractmethod
+    def sample(self, rng, size):
+        """Draw `size` values (int or shape tuple) from rng; returns an ndarray."""
+
+    def _draw(self, size):
+        return self.sample(self.rng, size)
+
+    def _refill(self):
+        block = self._draw(self.block_size)
+        self._buffer = block[::-1].tolist()
+        self.block_size = min(self.block_size * 2, self.max_block)
+
+    def next(self, key=None):
+        """Return next pre-drawn value (float). key is ignored (one shared stream)."""
+        if not self._buffer:
+            self._refill()
+        return self._buffer.pop()
+
+
+def uniforms(rng, size, antithetic=False):
+    """U(0, 1) draws for inverse-CDF sampling (1 - u when antithetic), clipped away from 0 and 1."""
+    u = rng.random(size)
+    if antithetic:
+        u = 1.0 - u
+    return np.clip(u, U_EPS, 1.0 - U_EPS)
+
+
+class StageDurationSampler(BlockSampler):
+    """
+    Stage duration sampler for the Normal and Weibull stage distributions.
+
+    Keeps the engine semantics:
+    - Normal: max(0, normal(mean, sd))
+    - Weibull: max(0, weibull(shape) * scale)
+      (shape/scale are stored in the *_mean/*_sd params)
+
+    With inverse_cdf the same distributions are drawn as F^-1(u)
+    (antithetic: F^-1(1 - u)).
+    """
+
+    def __init__(self, rng, dist, mean, sd, inverse_cdf=False, antithetic=False, **kwargs):
+        if dist not in ("Normal", "Weibull"):
+            raise ValueError(f"Unknown stage distribution: {dist}")
+        super().__init__(rng, **kwargs)
+        self.dist = dist
+        self.mean = mean
+        self.sd = sd
+        self.inverse_cdf = inverse_cdf or antithetic
+        self.antithetic = antithetic
+
+    def sample(self, rng, size):
+        if self.inverse_cdf:
+            u = uniforms(rng, size, self.antithetic)
+            if self.dist == "Normal":
+                from scipy.special import ndtri  # scipy only loaded for inverse-CDF runs
+                values = self.mean + self.sd * ndtri(u)
+            else:
+                values = self.sd * (-np.log1p(-u)) ** (1.0 / self.mean)
+        elif self.dist == "Normal":
+            values = rng.normal(self.mean, self.sd, size)
+        else:
+            values = rng.weibull(self.mean, size) * self.sd
+        return np.maximum(values, 0.0)
+
+
+class UniformSampler(BlockSampler):
+    """Uniform(low, high) sampler used for the fleet/depot random multipliers."""
+
+    def __init__(self, rng, low, high, inverse_cdf=False, antithetic=False, **kwargs):
+        super().__init__(rng, **kwargs)
+        self.low = low
+        self.high = high
+        self.inverse_cdf = inverse_cdf or antithetic
+        self.antithetic = antithetic
+
+    def sample(self, rng, size):
+        if self.inverse_cdf:
+            return self.low + (self.high - self.low) * uniforms(rng, size, self.antithetic)
+        return rng.uniform(self.low, self.high, size)
+
+
+class KeyedSampler:
+    """
+    One substream per entity key: next(key) returns the next value of key's stream.
+
+    Draws are laid out as a grid: entity rows x draw columns, cut into fixed
+    tiles of `rows` entities by `depth` draws. Tile (chunk, column) is drawn in
+    one call from child (chunk, column) of seed_seq, so the n-th value of key
+    only depends on (key, n) and the seed, and seeding costs one SeedSequence
+    per tile instead of one per entity.
+
+    A tile is dropped once no key is positioned in it (every key that entered
+    it has taken its `depth` values), so memory is bounded by the number of
+    keys, not by the number of draws. A dropped tile that is needed again (a
+    new key starting in it) is redrawn with the same values.
+    """
+
+    def __init__(self, seed_seq, sampler, rows=256, depth=16):
+        """
+        Parameters
+        ----------
+        seed_seq : np.random.SeedSequence
+            Parent sequence of the tile streams
+        sampler : BlockSampler
+            Provides the distribution (sample(rng, size)); its own stream is unused
+        rows, depth : int
+            Tile size: entities per tile, draws per entity per tile
+        """
+        self.seed_seq = seed_seq
+        self.sampler = sampler
+        self.rows = rows
+        self.depth = depth
+        self.tiles = {}       # (chunk, column) -> rows x depth nested list
+        self.tile_users = {}  # (chunk, column) -> keys whose next value is in the tile
+        self.positions = {}   # key -> number of values taken
+
+    def next(self, key):
+        """Return the next value of entity `key`'s substream (float)."""
+        if key is None:
+            raise ValueError("Common random numbers need an entity key (ac_id/part_id)")
+        n = self.positions.get(key, 0)
+        self.positions[key] = n + 1
+        chunk, row = divmod(int(key), self.rows)
+        column, offset = divmod(n, self.depth)
+        tile_id = (chunk, column)
+        tile = self.tiles.get(tile_id)
+        if tile is None:
+            child = np.random.SeedSequence(
+                self.seed_seq.entropy, spawn_key=self.seed_seq.spawn_key + tile_id)
+            tile = self.sampler.sample(np.random.default_rng(child), (self.rows, self.depth)).tolist()
+            self.tiles[tile_id] = tile
+            self.tile_users[tile_id] = 0
+        if offset == 0:
+            self.tile_users[tile_id] += 1
+        value = tile[row][offset]
+        if offset == self.depth - 1:
+            # key moves on to the next column
+            users = self.tile_users[tile_id] - 1
+            if users:
+                self.tile_users[tile_id] = users
+            else:
+                del self.tiles[tile_id]
+                del self.tile_users[tile_id]
+        return value
+
+
+class InitialCycleSampler:
+    """
+    Randomized initial part cycles keyed by part_id (common random numbers).
+
+    Replaces rng.integers(low, high) in calculate_initial_allocation() and
+    Initialization, so a part_id starts at the same cycle at every grid point.
+    """
+
+    def __init__(self, rng):
+        """
+        Parameters
+        ----------
+        rng : np.random.Generator
+            Run Generator; only its seed sequence is used
+        """
+        self.uniform = KeyedSampler(child_seed_seq(rng, INITIAL_CYCLE_STREAM), UniformSampler(None, 0.0, 1.0))
+
+    def integers(self, part_id, low, high):
+        """Return part_id's initial cycle, low <= cycle < high (same range as rng.integers)."""
+        span = high - low
+        return low + min(int(self.uniform.next(part_id) * span), span - 1)
+
+
+class StageSamplers:
+    """
+    Fleet and depot duration samplers (plus optional random multipliers) for one run.
+
+    Each sampler gets its own child stream spawned from the run Generator, so
+    the fleet sequence does not shift when depot draws change and vice versa.
+    With params['common_random_numbers'] the fleet streams are split further
+    into per-aircraft substreams (KeyedSampler) and initial cycles are keyed
+    by part_id; depot streams are unchanged.
+    """
+
+    def __init__(self, rng, params):
+        """
+        Parameters
+        ----------
+        rng : np.random.Generator
+            Run Generator (SimulationEngine.rng)
+        params : Parameters
+            Uses sone_*/sthree_* distribution params and
+            use_fleet_rand/use_depot_rand with their min/max bounds,
+            common_random_numbers for per-entity substreams,
+            inverse_cdf/antithetic for inverse-CDF (1 - u) sampling
+        """
+        fleet_rng, depot_rng, fleet_mult_rng, depot_mult_rng = rng.spawn(4)
+        crn = params.get('common_random_numbers', False)
+        sampling = {'inverse_cdf': params.get('inverse_cdf', False),
+                    'antithetic': params.get('antithetic', False)}
+
+        def keyed(sampler):
+            if crn:
+                return KeyedSampler(sampler.rng.bit_generator.seed_seq, sampler)
+            return sampler
+
+        self.fleet = keyed(StageDurationSampler(
+            fleet_rng, params['sone_dist'], params['sone_mean'], params['sone_sd'], **sampling))
+        self.depot = StageDurationSampler(
+            depot_rng, params['sthree_dist'], params['sthree_mean'], params['sthree_sd'], **sampling)
+
+        # Per-part initial cycles (None: Initialization draws from the run Generator)
+        self.initial_cycle = InitialCycleSampler(rng) if crn else None
+
+        # Multipliers are only used by Initialization when enabled
+        self.fleet_multiplier = None
+        if params.get('use_fleet_rand', False):
+            self.fleet_multiplier = keyed(UniformSampler(
+                fleet_mult_rng, params['fleet_rand_min'], params['fleet_rand_max'], **sampling))
+        self.depot_multiplier = None
+        if params.get('use_depot_rand', False):
+            self.depot_multiplier = UniformSampler(
+                depot_mult_rng, params['depot_rand_min'], params['depot_rand_max'], **sampling)
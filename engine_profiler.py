@@ -0,0 +1,171 @@
+"""
+Opt-in instrumentation for SimulationEngine (params['profile']).
+
+When profiling is off the engine loop is unchanged. When on, _process_events
+swaps in timed versions of its two hot-loop calls:
+
+- every event handler in the dispatch table is wrapped to add its wall time
+  and a call count per event type
+- heappop is wrapped to track the largest heap size on every pop and to
+  sample (event time, heap size) every HEAP_SAMPLE_EVERY events for the chart
+
+run()/finalize() time their phases (initialization, event loop, WIP
+finalize, build_part_ac_df or build_metrics, filter_by_remove_days, PostSim)
+with phase(). DataSets frames are built on first access, so most of their
+cost shows up under post_sim. The summary dict is returned as
+validation_results['profile'].
+
+Classes:
+    EngineProfiler: Accumulates handler, heap and phase timings of one run
+"""
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    from .event_types import EVENT_TYPE_NAMES, N_EVENT_TYPES
+except ImportError:
+    from event_types import EVENT_TYPE_NAMES, N_EVENT_TYPES
+
+HEAP_SAMPLE_EVERY = 100
+
+
+class EngineProfiler:
+    """
+    Handler, heap and phase timings of one engine run.
+
+    Picklable (no wrapped functions are stored), so it survives checkpoints.
+    """
+
+    def __init__(self, heap_sample_every=HEAP_SAMPLE_EVERY):
+        self.heap_sample_every = heap_sample_every
+        self.handler_names = [None] * N_EVENT_TYPES
+        self.handler_time = [0.0] * N_EVENT_TYPES
+        self.handler_calls = [0] * N_EVENT_TYPES
+        self.heap_times = []   # event time of each heap sample
+        self.heap_sizes = []   # heap size after popping that event
+        self.heap_max = 0      # largest heap size seen before any pop (not sampled)
+        self.n_pops = 0
+        self.phase_times = {}  # phase name -> seconds (accumulated over resumed chunks)
+
+    @contextmanager
+    def phase(self, name):
+        """Add the wall time of the with-block to phase_times[name]."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] = self.phase_times.get(name, 0.0) + time.perf_counter() - start
+
+    def wrap_handlers(self, table):
+        """
+        Return a copy of the handler table (list indexed by event code) with timed handlers.
+        """
+        perf_counter = time.perf_counter
+        handler_time = self.handler_time
+        handler_calls = self.handler_calls
+
+        def timed(code, handler):
+            def timed_handler(entity_id):
+                start = perf_counter()
+                handler(entity_id)
+                handler_time[code] += perf_counter() - start
+                handler_calls[code] += 1
+            return timed_handler
+
+        wrapped = list(table)
+        for code, handler in enumerate(table):
+            if handler is not None:
+                self.handler_names[code] = handler.__name__
+                wrapped[code] = timed(code, handler)
+        return wrapped
+
+    def wrap_heappop(self, heappop):
+        """
+        Return heappop that records the heap's peak size on every pop and samples
+        (event time, heap size) every heap_sample_every pops.
+        """
+        every = self.heap_sample_every
+
+        def sampled_heappop(heap):
+            if len(heap) > self.heap_max:
+                self.heap_max = len(heap)
+            event = heappop(heap)
+            self.n_pops += 1
+            if self.n_pops % every == 0:
+                self.heap_times.append(event[0])
+                self.heap_sizes.append(len(heap))
+            return event
+        return sampled_heappop
+
+    # ===========================================================
+    # OUTPUT
+    # ===========================================================
+
+    def handler_frame(self):
+        """
+        Returns
+        -------
+        pd.DataFrame
+            One row per handler: event_type, handler, calls, total_s, mean_us, share
+            (share of the summed handler time), sorted by total_s
+        """
+        rows = []
+        for code in range(N_EVENT_TYPES):
+            if self.handler_names[code] is None:
+                continue
+            calls = self.handler_calls[code]
+            total = self.handler_time[code]
+            rows.append({
+                'event_type': EVENT_TYPE_NAMES[code],
+                'handler': self.handler_names[code],
+                'calls': calls,
+                'total_s': total,
+                'mean_us': total / calls * 1e6 if calls else 0.0,
+            })
+        df = pd.DataFrame(rows, columns=['event_type', 'handler', 'calls', 'total_s', 'mean_us'])
+        handler_total = df['total_s'].sum()
+        df['share'] = df['total_s'] / handler_total if handler_total > 0 else 0.0
+        return df.sort_values('total_s', ascending=False).reset_index(drop=True)
+
+    def phase_frame(self):
+        """
+        Returns
+        -------
+        pd.DataFrame
+            Columns phase, seconds (run order)
+        """
+        return pd.DataFrame(list(self.phase_times.items()), columns=['phase', 'seconds'])
+
+    def heap_frame(self):
+        """
+        Returns
+        -------
+        pd.DataFrame
+            Columns sim_time, heap_size (one row per sample)
+        """
+        return pd.DataFrame({'sim_time': self.heap_times, 'heap_size': self.heap_sizes})
+
+    def summary(self):
+        """
+        Returns
+        -------
+        dict
+            'handlers': handler_frame() records
+            'phases': {phase: seconds}
+            'heap': {'sim_time': [...], 'heap_size': [...] (sampled), 'max': int (peak over every pop)}
+            'loop_overhead_s': event loop time not spent in handlers (heap, WIP advance, counting)
+        """
+        handlers = self.handler_frame()
+        loop_time = self.phase_times.get('event_loop', 0.0)
+        return {
+            'handlers': handlers.to_dict('records'),
+            'phases': dict(self.phase_times),
+            'heap': {
+                'sim_time': list(self.heap_times),
+                'heap_size': list(self.heap_sizes),
+                'max': self.heap_max,
+            },
+            'loop_overhead_s': max(loop_time - float(handlers['total_s'].sum()), 0.0),
+        }
@@ -6,10 +6,14 @@ with dictionary-based O(1) lookups, separating active aircraft state from histor
 
 Classes:
     AircraftManager: Manages aircraft lifecycle, logging, and export with O(1) lookups
+    ColumnarAircraftManager: Same API backed by NumPy column arrays (entity_columnar.py)
 """
 import numpy as np
 import pandas as pd
 
+from entity_columnar import ColumnStore, RecordView, FLOAT, INT, CODE
+from event_path import decode_event_path_column
+
 
 class AircraftManager:
     """
@@ -21,11 +25,24 @@ class AircraftManager:
     Parallel to PartManager class but tracks aircraft (des_df) instead of parts (sim_df).
     """
     
-    def __init__(self):
-        """Initialize manager with active dictionary, ID counter, and completion log."""
+    def __init__(self, wip_tracker=None, keep_log=True, cycle_stats=None):
+        """
+        Initialize manager with active dictionary, ID counter, and completion log.
+
+        Args:
+            wip_tracker (WipTracker, optional): Receives WIP start/end field writes
+                (ds/streaming.py). When set, get_wip_ac_end()/get_wip_ac_raw() read from it.
+            keep_log (bool): Append completed cycles to ac_log. False for
+                metrics-only runs (completed records are dropped).
+            cycle_stats (CycleStats, optional): Receives each completed record
+        """
         self.active = {}  # {des_id: record} - dictionary storage for O(1) lookups
         self.next_des_id = 0  # ID counter (replacing current_des_row)
         self.ac_log = []  # Completed cycles
+        self.wip_tracker = wip_tracker
+        self.keep_log = keep_log
+        self.cycle_stats = cycle_stats
+        self.records_snapshot = None  # {des_id: record} merged once at the end (freeze_records)
     
     # ===========================================================
     # CORE OPERATIONS: ID GENERATION
@@ -68,7 +85,7 @@ class AircraftManager:
         record = {
             'des_id': des_id,
             'ac_id': ac_id,
-            'event_path': fields.get('event_path', ''),
+            'event_path': fields.get('event_path', 0),
             'fleet_duration': fields.get('fleet_duration', np.nan),
             'fleet_start': fields.get('fleet_start', np.nan),
             'fleet_end': fields.get('fleet_end', np.nan),
@@ -86,6 +103,8 @@ class AircraftManager:
         
         # Add to active dictionary
         self.active[des_id] = record
+        if self.wip_tracker is not None:
+            self.wip_tracker.on_fields(fields)
         return {'success': True, 'error': None}
 
     def add_initial_ac(self, ac_id, **fields):
@@ -111,7 +130,7 @@ class AircraftManager:
         record = {
             'des_id': des_id,
             'ac_id': ac_id,
-            'event_path': fields.get('event_path', ''),
+            'event_path': fields.get('event_path', 0),
             'fleet_duration': fields.get('fleet_duration', np.nan),
             'fleet_start': fields.get('fleet_start', np.nan),
             'fleet_end': fields.get('fleet_end', np.nan),
@@ -129,6 +148,8 @@ class AircraftManager:
         
         # Add to active dictionary
         self.active[des_id] = record
+        if self.wip_tracker is not None:
+            self.wip_tracker.on_fields(fields)
         return {'des_id': des_id, 'success': True, 'error': None}
     
     # ===========================================================
@@ -173,6 +194,8 @@ class AircraftManager:
         """
         record = self.active.get(des_id)
         if record:
+            if self.wip_tracker is not None:
+                self.wip_tracker.on_fields(updates, record)
             record.update(updates)
             return True
         return False
@@ -207,7 +230,10 @@ class AircraftManager:
         """
         record = self.active.pop(des_id, None)
         if record:
-            self.ac_log.append(record.copy())
+            if self.cycle_stats is not None:
+                self.cycle_stats.add(record)
+            if self.keep_log:
+                self.ac_log.append(record.copy())
         return record
     
     # ===========================================================
@@ -229,7 +255,7 @@ class AircraftManager:
                 'install_duration', 'install_start', 'install_end',
                 'simone_id', 'partone_id', 'simtwo_id', 'parttwo_id'
             ])
-        return pd.DataFrame(list(self.active.values()))
+        return decode_event_path_column(pd.DataFrame(list(self.active.values())))
     
     def exp_log_cycles(self):
         """
@@ -246,7 +272,7 @@ class AircraftManager:
                 'install_duration', 'install_start', 'install_end',
                 'simone_id', 'partone_id', 'simtwo_id', 'parttwo_id'
             ])
-        return pd.DataFrame(self.ac_log)
+        return decode_event_path_column(pd.DataFrame(self.ac_log))
     
     def get_all_ac_data(self):
         """
@@ -258,7 +284,10 @@ class AircraftManager:
         
         Returns:
             dict: Combined dictionary {des_id: record} containing all aircraft
+                (the frozen snapshot after freeze_records())
         """
+        if self.records_snapshot is not None:
+            return self.records_snapshot
         all_ac_dict = {}
 
         for record in self.ac_log:
@@ -275,6 +304,16 @@ class AircraftManager:
         
         return all_ac_dict
     
+    def freeze_records(self):
+        """
+        Merge active aircraft and completed cycles once when the run is finished.
+
+        get_all_ac_data() then returns this snapshot, so the DataFrame and
+        WIP exports share one merge.
+        """
+        self.records_snapshot = None
+        self.records_snapshot = self.get_all_ac_data()
+
     def get_all_ac_data_df(self):
         """
         Export all aircraft (active + completed) as pandas DataFrame.
@@ -301,7 +340,7 @@ class AircraftManager:
             ])
         
         # Convert dictionary values to list for consistency with other export methods
-        return pd.DataFrame(list(all_ac_dict.values()))
+        return decode_event_path_column(pd.DataFrame(list(all_ac_dict.values())))
 
 
 
@@ -313,6 +352,9 @@ class AircraftManager:
         """
         Get WIP counts over time with forward fill for aircraft.
         """
+        if self.wip_tracker is not None:
+            return self.wip_tracker.unified_frame(sim_time, interval)
+
         from ds.helpers import compute_unified_wip_ac
         
         all_ac = self.get_all_ac_data()
@@ -323,7 +365,264 @@ class AircraftManager:
         """
         Get raw event counts (no interpolation/forward fill) for aircraft.
         """
+        if self.wip_tracker is not None:
+            return self.wip_tracker.raw_frame()
+
         from ds.helpers import compute_raw_wip_ac
         
         all_ac = self.get_all_ac_data()
-        return compute_raw_wip_ac(all_ac)
\ No newline at end of file
+        return compute_raw_wip_ac(all_ac)
+
+    def get_wip_ac_time_avg(self, window_start, window_end):
+        """
+        Get time-weighted average aircraft WIP per category over [window_start, window_end].
+        Uses the WipTracker integral when its window matches.
+        """
+        tracker = self.wip_tracker
+        if tracker is not None and (tracker.window_start, tracker.window_end) == (window_start, window_end):
+            return tracker.time_weighted_averages()
+
+        from ds.helpers import compute_time_weighted_wip_ac
+
+        return compute_time_weighted_wip_ac(self.get_all_ac_data(), window_start, window_end)
+
+# ===========================================================
+# COLUMNAR BACKEND
+# ===========================================================
+
+# (name, kind, default) in export column order - same layout as AircraftManager records
+AC_SCHEMA = [
+    ('des_id', INT, None),
+    ('ac_id', INT, None),
+    ('event_path', CODE, 0),
+    ('fleet_duration', FLOAT, None),
+    ('fleet_start', FLOAT, None),
+    ('fleet_end', FLOAT, None),
+    ('micap_duration', FLOAT, None),
+    ('micap_start', FLOAT, None),
+    ('micap_end', FLOAT, None),
+    ('install_duration', FLOAT, None),
+    ('install_start', FLOAT, None),
+    ('install_end', FLOAT, None),
+    ('simone_id', INT, None),
+    ('partone_id', INT, None),
+    ('simtwo_id', INT, None),
+    ('parttwo_id', INT, None),
+]
+
+
+class ColumnarAircraftManager:
+    """
+    Array-backed alternative to AircraftManager with the same public API.
+
+    Aircraft cycles are rows in a ColumnStore indexed by des_id (float64
+    fleet/micap/install times, int32 ac_id and sim/part foreign keys, interned
+    event_path codes). Buffers double on growth, active aircraft are
+    RecordView objects and completed cycles are not copied.
+
+    Select with params['record_backend'] = 'columnar'.
+
+    Differences from AircraftManager:
+        - get_all_ac_data_df() rows are ordered by des_id
+        - ID columns without missing values export as int32
+    """
+
+    def __init__(self, capacity=1024, wip_tracker=None):
+        """Initialize column store, active views, ID counter (wip_tracker: see AircraftManager)."""
+        self.store = ColumnStore(AC_SCHEMA, capacity)
+        self.active = {}  # {des_id: RecordView}
+        self.next_des_id = 0
+        self.wip_tracker = wip_tracker
+
+    # ===========================================================
+    # CORE OPERATIONS: ID GENERATION
+    # ===========================================================
+
+    def get_next_des_id(self):
+        """
+        Generate next des_id.
+
+        Returns:
+            int: Next available des_id
+        """
+        current_id = self.next_des_id
+        self.next_des_id += 1
+        return current_id
+
+    # ===========================================================
+    # CORE OPERATIONS: ADD AIRCRAFT to ACTIVE DICTIONARY
+    # ===========================================================
+
+    def add_ac(self, des_id, ac_id, **fields):
+        """
+        Add aircraft event to active tracking. See AircraftManager.add_ac().
+
+        Returns:
+            dict: {'success': bool, 'error': str or None}
+        """
+        if des_id in self.active or (des_id < self.store.capacity and self.store.present[des_id]):
+            return {'success': False, 'error': f'Duplicate des_id {des_id}'}
+
+        fields['des_id'] = des_id
+        fields['ac_id'] = ac_id
+        self.store.add_row(des_id, fields)
+        self.active[des_id] = RecordView(self.store, des_id)
+        if self.wip_tracker is not None:
+            self.wip_tracker.on_fields(fields)
+        return {'success': True, 'error': None}
+
+    def add_initial_ac(self, ac_id, **fields):
+        """
+        Add aircraft during initialization phase with auto-generated des_id.
+        See AircraftManager.add_initial_ac().
+
+        Returns:
+            dict: {'des_id': int, 'success': bool, 'error': str or None}
+        """
+        des_id = self.get_next_des_id()
+        result = self.add_ac(des_id, ac_id, **fields)
+        result['des_id'] = des_id
+        return result
+
+    # ===========================================================
+    # CORE OPERATIONS: GET AIRCRAFT RECORD INFORMATION
+    # ===========================================================
+
+    def get_ac(self, des_id):
+        """
+        Get active aircraft by des_id - O(1) lookup.
+
+        Returns:
+            RecordView or None: Aircraft record if found, None if not found
+        """
+        return self.active.get(des_id)
+
+    def get_all_active_ac(self):
+        """
+        Get all currently active aircraft.
+
+        Returns:
+            dict: Dictionary of all active aircraft {des_id: RecordView}
+        """
+        return self.active.copy()
+
+    # ===========================================================
+    # CORE OPERATIONS: MODIFY/UPDATE AIRCRAFT FIELDS
+    # ===========================================================
+
+    def update_fields(self, des_id, updates):
+        """
+        Update multiple fields on active aircraft in a single call.
+
+        Returns:
+            bool: True if aircraft found and updated, False if aircraft not found
+        """
+        if des_id not in self.active:
+            return False
+        if self.wip_tracker is not None:
+            self.wip_tracker.on_fields(updates, self.active[des_id])
+        store = self.store
+        for name, value in updates.items():
+            store.set(des_id, name, value)
+        return True
+
+    # ===========================================================
+    # CORE OPERATIONS: CYCLE COMPLETE AIRCRAFT-REMOVE from ACTIVE
+    # ===========================================================
+
+    def complete_ac_cycle(self, des_id):
+        """
+        Remove aircraft from active tracking. The row stays in the store as the log entry.
+
+        Returns:
+            RecordView or None: Completed aircraft record if found, None if not found
+        """
+        return self.active.pop(des_id, None)
+
+    # ===========================================================
+    # EXPORT/ANALYSIS: DATA EXPORT
+    # ===========================================================
+
+    def _completed_rows(self):
+        present = self.store.present[:self.store.n_rows].copy()
+        present[list(self.active)] = False
+        return np.flatnonzero(present)
+
+    @property
+    def ac_log(self):
+        """Completed cycles as a list of dict records (built on access)."""
+        return [self.store.record(row) for row in self._completed_rows()]
+
+    def exp_active_ac(self):
+        """
+        Export ACTIVE AIRCRAFT as pandas DataFrame for analysis.
+        """
+        return decode_event_path_column(self.store.to_frame(np.array(list(self.active), dtype=np.intp)))
+
+    def exp_log_cycles(self):
+        """
+        Export log (completed cycles, not active ac) as pandas DataFrame for analysis.
+        """
+        return decode_event_path_column(self.store.to_frame(self._completed_rows()))
+
+    def get_all_ac_data(self):
+        """
+        Combine active aircraft and completed cycles into single dictionary.
+
+        Returns:
+            dict: {des_id: record} of plain dict records, ordered by des_id
+        """
+        rows = self.store.present_rows()
+        if isinstance(rows, slice):
+            rows = range(rows.start, rows.stop)
+        return {int(row): self.store.record(row) for row in rows}
+
+    def freeze_records(self):
+        """
+        No-op: columnar exports read the store arrays, there is nothing to merge.
+        """
+
+    def get_all_ac_data_df(self):
+        """
+        Export all aircraft (active + completed) as pandas DataFrame.
+
+        Float columns wrap the store arrays directly (no copy).
+        """
+        return decode_event_path_column(self.store.to_frame())
+
+    def get_wip_ac_end(self, sim_time, interval):
+        """
+        Get WIP counts over time with forward fill for aircraft.
+        """
+        if self.wip_tracker is not None:
+            return self.wip_tracker.unified_frame(sim_time, interval)
+
+        from ds.helpers import compute_unified_wip_ac_arrays, AC_WIP_FIELDS
+
+        arrays = self.store.float_arrays([f for pair in AC_WIP_FIELDS.values() for f in pair])
+        return compute_unified_wip_ac_arrays(arrays, sim_time, interval)
+
+    def get_wip_ac_raw(self):
+        """
+        Get raw event counts (no interpolation/forward fill) for aircraft.
+        """
+        if self.wip_tracker is not None:
+            return self.wip_tracker.raw_frame()
+
+        from ds.helpers import compute_raw_wip_ac_arrays, AC_WIP_FIELDS
+
+        arrays = self.store.float_arrays([f for pair in AC_WIP_FIELDS.values() for f in pair])
+        return compute_raw_wip_ac_arrays(arrays)
+
+    def get_wip_ac_time_avg(self, window_start, window_end):
+        """
+        Get time-weighted average aircraft WIP per category over [window_start, window_end].
+        """
+        tracker = self.wip_tracker
+        if tracker is not None and (tracker.window_start, tracker.window_end) == (window_start, window_end):
+            return tracker.time_weighted_averages()
+
+        from ds.helpers import compute_time_weighted_wip_arrays, AC_WIP_FIELDS
+
+        arrays = self.store.float_arrays([f for pair in AC_WIP_FIELDS.values() for f in pair])
+        return compute_time_weighted_wip_arrays(arrays, AC_WIP_FIELDS, window_start, window_end)
@@ -0,0 +1,207 @@
+"""
+Columnar record storage shared by the array-backed entity managers.
+
+Stores one row per entity cycle in growable NumPy column arrays instead of one
+Python dict per cycle. Rows are indexed directly by the manager's sequential ID
+(sim_id / des_id), so lookups stay O(1) and completed cycles need no copy.
+
+Column kinds:
+    FLOAT: float64, missing = NaN (stage times/durations)
+    INT:   int32, missing = -1 sentinel, read back as np.nan (IDs, cycle)
+    CODE:  int32 code into a per-column codebook (interned values such as
+           packed event_path ints and condemn strings)
+
+Classes:
+    ColumnStore: Growable column arrays with per-column encode/decode
+    RecordView: dict-like view of one row (what get_part()/get_ac() return)
+"""
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+FLOAT = 'float'
+INT = 'int'
+CODE = 'code'
+
+INT_MISSING = -1
+
+
+class ColumnStore:
+    """
+    Growable column arrays for entity cycle records.
+
+    Capacity doubles when a row past the end is written (amortized O(1) append).
+    """
+
+    def __init__(self, schema, capacity=1024):
+        """
+        Parameters
+        ----------
+        schema : list of tuple
+            (name, kind, default) per column in export order. default is only
+            used for CODE columns (e.g. 0 for event_path, 'no' for condemn).
+        capacity : int
+            Initial number of rows allocated
+        """
+        self.names = [name for name, _, _ in schema]
+        self.kinds = {name: kind for name, kind, _ in schema}
+        self.defaults = {name: default for name, kind, default in schema if kind == CODE}
+        self.capacity = max(1, capacity)
+        self.columns = {name: self._new_column(kind, self.capacity) for name, kind, _ in schema}
+        self.codebooks = {name: [] for name in self.defaults}     # code -> value
+        self.code_lookup = {name: {} for name in self.defaults}   # value -> code
+        self.present = np.zeros(self.capacity, dtype=bool)
+        self.n_rows = 0  # 1 + highest row written
+
+    @staticmethod
+    def _new_column(kind, size):
+        if kind == FLOAT:
+            return np.full(size, np.nan, dtype=np.float64)
+        return np.full(size, INT_MISSING, dtype=np.int32)
+
+    def _grow(self, min_capacity):
+        new_capacity = max(self.capacity * 2, min_capacity)
+        for name, column in self.columns.items():
+            grown = self._new_column(self.kinds[name], new_capacity)
+            grown[:self.capacity] = column
+            self.columns[name] = grown
+        present = np.zeros(new_capacity, dtype=bool)
+        present[:self.capacity] = self.present
+        self.present = present
+        self.capacity = new_capacity
+
+    # ===========================================================
+    # WRITE
+    # ===========================================================
+
+    def encode(self, name, value):
+        """Return the code for value in CODE column `name`, adding it if new."""
+        lookup = self.code_lookup[name]
+        code = lookup.get(value)
+        if code is None:
+            code = len(self.codebooks[name])
+            self.codebooks[name].append(value)
+            lookup[value] = code
+        return code
+
+    def set(self, row, name, value):
+        """Write one field. Raises KeyError for fields not in the schema."""
+        kind = self.kinds[name]
+        if kind == FLOAT:
+            self.columns[name][row] = np.nan if value is None else value
+        elif kind == INT:
+            self.columns[name][row] = INT_MISSING if (value is None or value != value) else value
+        else:
+            self.columns[name][row] = self.encode(name, value)
+
+    def add_row(self, row, fields):
+        """
+        Write a new row. Fields not given keep their missing value
+        (CODE columns get their schema default).
+        """
+        if row >= self.capacity:
+            self._grow(row + 1)
+        for name in self.defaults:
+            if name not in fields:
+                self.columns[name][row] = self.encode(name, self.defaults[name])
+        for name, value in fields.items():
+            self.set(row, name, value)
+        self.present[row] = True
+        if row >= self.n_rows:
+            self.n_rows = row + 1
+
+    # ===========================================================
+    # READ
+    # ===========================================================
+
+    def get(self, row, name):
+        """Read one field as a Python value (np.nan for missing INT)."""
+        kind = self.kinds[name]
+        value = self.columns[name][row]
+        if kind == FLOAT:
+            return float(value)
+        if kind == INT:
+            return np.nan if value == INT_MISSING else int(value)
+        return self.codebooks[name][value]
+
+    def record(self, row):
+        """Return row as a plain dict (same layout as the dict managers' records)."""
+        return {name: self.get(row, name) for name in self.names}
+
+    def present_rows(self):
+        """
+        Return rows written so far in ID order: a slice when the ID range is
+        dense (zero-copy column views), otherwise an index array.
+        """
+        present = self.present[:self.n_rows]
+        if present.all():
+            return slice(0, self.n_rows)
+        return np.flatnonzero(present)
+
+    def float_arrays(self, names, rows=None):
+        """Return {name: float64 array} for FLOAT columns (views when rows is a slice)."""
+        if rows is None:
+            rows = self.present_rows()
+        return {name: self.columns[name][rows] for name in names}
+
+    def to_frame(self, rows=None):
+        """
+        Build a DataFrame over the given rows (default: all present rows).
+
+        FLOAT columns, and INT columns without missing values, wrap the column
+        arrays directly (no copy when rows is a slice). INT columns with missing
+        values become float64 with NaN, CODE columns are decoded to objects.
+        """
+        if rows is None:
+            rows = self.present_rows()
+        data = {}
+        for name in self.names:
+            kind = self.kinds[name]
+            column = self.columns[name][rows]
+            if kind == INT:
+                missing = column == INT_MISSING
+                if missing.any():
+                    column = column.astype(np.float64)
+                    column[missing] = np.nan
+            elif kind == CODE:
+                column = np.array(self.codebooks[name] + [None], dtype=object)[column]
+            data[name] = column
+        return pd.DataFrame(data, columns=self.names, copy=False)
+
+
+class RecordView(Mapping):
+    """
+    Dict-like view of one ColumnStore row.
+
+    Supports record['field'], record.get('field'), record['field'] = value,
+    record.update({...}) and record.copy() (returns a plain dict), so engine
+    code written against dict records works unchanged.
+    """
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, name):
+        return self._store.get(self._row, name)
+
+    def __setitem__(self, name, value):
+        self._store.set(self._row, name, value)
+
+    def __iter__(self):
+        return iter(self._store.names)
+
+    def __len__(self):
+        return len(self._store.names)
+
+    def update(self, updates):
+        for name, value in updates.items():
+            self._store.set(self._row, name, value)
+
+    def copy(self):
+        return self._store.record(self._row)
+
+    def __repr__(self):
+        return f"RecordView({self.copy()!r})"
@@ -6,10 +6,14 @@ with dictionary-based O(1) lookups, separating active part state from historical
 
 Classes:
     PartManager: Manages part lifecycle, logging, and export with O(1) lookups
+    ColumnarPartManager: Same API backed by NumPy column arrays (entity_columnar.py)
 """
 import numpy as np
 import pandas as pd
 
+from entity_columnar import ColumnStore, RecordView, FLOAT, INT, CODE
+from event_path import decode_event_path_column
+
 
 class PartManager:
     """
@@ -19,11 +23,24 @@ class PartManager:
     enabling fast lookups during simulation and proper logging for analysis.
     """
     
-    def __init__(self):
-        """Initialize manager with active dictionary, ID counter, and completion log."""
+    def __init__(self, wip_tracker=None, keep_log=True, cycle_stats=None):
+        """
+        Initialize manager with active dictionary, ID counter, and completion log.
+
+        Args:
+            wip_tracker (WipTracker, optional): Receives WIP start/end field writes
+                (ds/streaming.py). When set, get_wip_end()/get_wip_raw() read from it.
+            keep_log (bool): Append completed cycles to part_log. False for
+                metrics-only runs (completed records are dropped).
+            cycle_stats (CycleStats, optional): Receives each completed record
+        """
         self.active = {}  # {sim_id: record} - dictionary storage for O(1) lookups
         self.next_sim_id = 0  # ID counter (replacing current_sim_row)
         self.part_log = []  # Completed cycles
+        self.wip_tracker = wip_tracker
+        self.keep_log = keep_log
+        self.cycle_stats = cycle_stats
+        self.records_snapshot = None  # {sim_id: record} merged once at the end (freeze_records)
     
     # ===========================================================
     # CORE OPERATIONS: ID GENERATION
@@ -68,7 +85,7 @@ class PartManager:
             'sim_id': sim_id,
             'part_id': part_id,
             'cycle': cycle,
-            'event_path': fields.get('event_path', ''),
+            'event_path': fields.get('event_path', 0),
             'fleet_start': fields.get('fleet_start', np.nan), # added np.nan to allow to just include filled variables when calling add_part that way not all variables need to be coded in call 
             'fleet_end': fields.get('fleet_end', np.nan),
             'fleet_duration': fields.get('fleet_duration', np.nan),
@@ -93,6 +110,8 @@ class PartManager:
         
         # Add to active dictionary
         self.active[sim_id] = record
+        if self.wip_tracker is not None:
+            self.wip_tracker.on_fields(fields)
         return {'success': True, 'error': None}
 
     def add_initial_part(self, part_id, cycle, **fields):
@@ -121,7 +140,7 @@ class PartManager:
             'sim_id': sim_id,
             'part_id': part_id,
             'cycle': cycle,
-            'event_path': fields.get('event_path', ''),
+            'event_path': fields.get('event_path', 0),
             'fleet_start': fields.get('fleet_start', np.nan),
             'fleet_end': fields.get('fleet_end', np.nan),
             'fleet_duration': fields.get('fleet_duration', np.nan),
@@ -146,6 +165,8 @@ class PartManager:
         
         # Add to active dictionary
         self.active[sim_id] = record
+        if self.wip_tracker is not None:
+            self.wip_tracker.on_fields(fields)
         return {'sim_id': sim_id, 'success': True, 'error': None}
     
     # ===========================================================
@@ -190,6 +211,8 @@ class PartManager:
         """
         record = self.active.get(sim_id)
         if record:
+            if self.wip_tracker is not None:
+                self.wip_tracker.on_fields(updates, record)
             record.update(updates)
             return True
         return False
@@ -224,7 +247,10 @@ class PartManager:
         """
         record = self.active.pop(sim_id, None)
         if record:
-            self.part_log.append(record.copy())
+            if self.cycle_stats is not None:
+                self.cycle_stats.add(record)
+            if self.keep_log:
+                self.part_log.append(record.copy())
         return record
     
     def complete_pca_cycle(self, sim_id, part_id):
@@ -281,7 +307,7 @@ class PartManager:
                 'install_start', 'install_end', 'install_duration', 'desone_id', 
                 'acone_id', 'destwo_id', 'actwo_id', 'condemn'
             ])
-        return pd.DataFrame(list(self.active.values()))
+        return decode_event_path_column(pd.DataFrame(list(self.active.values())))
     
     def export_completed_cycles(self):
         """
@@ -299,7 +325,7 @@ class PartManager:
                 'install_start', 'install_end', 'install_duration', 'desone_id', 
                 'acone_id', 'destwo_id', 'actwo_id', 'condemn'
             ])
-        return pd.DataFrame(self.part_log)
+        return decode_event_path_column(pd.DataFrame(self.part_log))
     
     def get_all_parts_data(self):
         """
@@ -311,7 +337,10 @@ class PartManager:
         
         Returns:
             dict: Combined dictionary {sim_id: record} containing all parts
+                (the frozen snapshot after freeze_records())
         """
+        if self.records_snapshot is not None:
+            return self.records_snapshot
         all_parts = {}
 
         for record in self.part_log:
@@ -328,6 +357,16 @@ class PartManager:
         
         return all_parts
     
+    def freeze_records(self):
+        """
+        Merge active parts and completed cycles once when the run is finished.
+
+        get_all_parts_data() then returns this snapshot, so the DataFrame and
+        WIP exports share one merge.
+        """
+        self.records_snapshot = None
+        self.records_snapshot = self.get_all_parts_data()
+
     def get_all_parts_data_df(self):
         """
         Export all parts (active + completed) as pandas DataFrame.
@@ -346,7 +385,7 @@ class PartManager:
             ])
         
         # Convert dictionary values to list for consistency with other export methods
-        return pd.DataFrame(list(all_parts.values()))
+        return decode_event_path_column(pd.DataFrame(list(all_parts.values())))
     
     # FUTURE POSSIBLE OPTIONs
     # ===========================================================
@@ -357,6 +396,9 @@ class PartManager:
         """
         Get WIP counts over time with forward fill.
         """
+        if self.wip_tracker is not None:
+            return self.wip_tracker.unified_frame(sim_time, interval)
+
         from ds.helpers import compute_unified_wip
         
         all_parts = self.get_all_parts_data()
@@ -367,7 +409,294 @@ class PartManager:
         """
         Get raw WIP counts (no interpolation/forward fill).
         """
+        if self.wip_tracker is not None:
+            return self.wip_tracker.raw_frame()
+
         from ds.helpers import compute_raw_wip
         
         all_parts = self.get_all_parts_data()
-        return compute_raw_wip(all_parts)
\ No newline at end of file
+        return compute_raw_wip(all_parts)
+
+    def get_wip_time_avg(self, window_start, window_end):
+        """
+        Get time-weighted average WIP per category over [window_start, window_end].
+        Uses the WipTracker integral when its window matches.
+        """
+        tracker = self.wip_tracker
+        if tracker is not None and (tracker.window_start, tracker.window_end) == (window_start, window_end):
+            return tracker.time_weighted_averages()
+
+        from ds.helpers import compute_time_weighted_wip
+
+        return compute_time_weighted_wip(self.get_all_parts_data(), window_start, window_end)
+
+# ===========================================================
+# COLUMNAR BACKEND
+# ===========================================================
+
+# (name, kind, default) in export column order - same layout as PartManager records
+PART_SCHEMA = [
+    ('sim_id', INT, None),
+    ('part_id', INT, None),
+    ('cycle', INT, None),
+    ('event_path', CODE, 0),
+    ('fleet_start', FLOAT, None),
+    ('fleet_end', FLOAT, None),
+    ('fleet_duration', FLOAT, None),
+    ('condition_f_start', FLOAT, None),
+    ('condition_f_end', FLOAT, None),
+    ('condition_f_duration', FLOAT, None),
+    ('depot_start', FLOAT, None),
+    ('depot_end', FLOAT, None),
+    ('depot_duration', FLOAT, None),
+    ('condition_a_start', FLOAT, None),
+    ('condition_a_end', FLOAT, None),
+    ('condition_a_duration', FLOAT, None),
+    ('install_start', FLOAT, None),
+    ('install_end', FLOAT, None),
+    ('install_duration', FLOAT, None),
+    ('desone_id', INT, None),
+    ('acone_id', INT, None),
+    ('destwo_id', INT, None),
+    ('actwo_id', INT, None),
+    ('condemn', CODE, 'no'),
+]
+
+
+class ColumnarPartManager:
+    """
+    Array-backed alternative to PartManager with the same public API.
+
+    Part cycles are rows in a ColumnStore indexed by sim_id (float64 times,
+    int32 IDs, interned codes for event_path/condemn). Active parts are
+    RecordView objects, so completing a cycle only drops the view - the row
+    itself is the log entry and no record copy is made.
+
+    Select with params['record_backend'] = 'columnar'.
+
+    Differences from PartManager:
+        - get_all_parts_data_df() rows are ordered by sim_id
+        - ID columns without missing values export as int32
+    """
+
+    def __init__(self, capacity=1024, wip_tracker=None):
+        """Initialize column store, active views, ID counter (wip_tracker: see PartManager)."""
+        self.store = ColumnStore(PART_SCHEMA, capacity)
+        self.active = {}  # {sim_id: RecordView}
+        self.next_sim_id = 0
+        self.wip_tracker = wip_tracker
+
+    # ===========================================================
+    # CORE OPERATIONS: ID GENERATION
+    # ===========================================================
+
+    def get_next_sim_id(self):
+        """
+        Generate next sim_id.
+
+        Returns:
+            int: Next available sim_id
+        """
+        current_id = self.next_sim_id
+        self.next_sim_id += 1
+        return current_id
+
+    # ===========================================================
+    # CORE OPERATIONS: ADD/CREATE PARTS
+    # ===========================================================
+
+    def add_part(self, sim_id, part_id, cycle, **fields):
+        """
+        Add part to active tracking. See PartManager.add_part().
+
+        Returns:
+            dict: {'success': bool, 'error': str or None}
+        """
+        if sim_id in self.active or (sim_id < self.store.capacity and self.store.present[sim_id]):
+            return {'success': False, 'error': f'Duplicate sim_id {sim_id}'}
+
+        fields['sim_id'] = sim_id
+        fields['part_id'] = part_id
+        fields['cycle'] = cycle
+        self.store.add_row(sim_id, fields)
+        self.active[sim_id] = RecordView(self.store, sim_id)
+        if self.wip_tracker is not None:
+            self.wip_tracker.on_fields(fields)
+        return {'success': True, 'error': None}
+
+    def add_initial_part(self, part_id, cycle, **fields):
+        """
+        Add part during initialization phase with auto-generated sim_id.
+        See PartManager.add_initial_part().
+
+        Returns:
+            dict: {'sim_id': int, 'success': bool, 'error': str or None}
+        """
+        sim_id = self.get_next_sim_id()
+        result = self.add_part(sim_id, part_id, cycle, **fields)
+        result['sim_id'] = sim_id
+        return result
+
+    # ===========================================================
+    # CORE OPERATIONS: READ/ACCESS PARTS
+    # ===========================================================
+
+    def get_part(self, sim_id):
+        """
+        Get active part by sim_id - O(1) lookup.
+
+        Returns:
+            RecordView or None: Part record if found, None if not found
+        """
+        return self.active.get(sim_id)
+
+    def get_all_active_parts(self):
+        """
+        Get all currently active parts.
+
+        Returns:
+            dict: Dictionary of all active parts {sim_id: RecordView}
+        """
+        return self.active.copy()
+
+    # ===========================================================
+    # CORE OPERATIONS: MODIFY/UPDATE PARTS
+    # ===========================================================
+
+    def update_fields(self, sim_id, updates):
+        """
+        Update multiple fields on active part in a single call.
+
+        Returns:
+            bool: True if part found and updated, False if part not found
+        """
+        if sim_id not in self.active:
+            return False
+        if self.wip_tracker is not None:
+            self.wip_tracker.on_fields(updates, self.active[sim_id])
+        store = self.store
+        for name, value in updates.items():
+            store.set(sim_id, name, value)
+        return True
+
+    # ===========================================================
+    # CORE OPERATIONS: LIFECYCLE/COMPLETE PARTS
+    # ===========================================================
+
+    def complete_part_cycle(self, sim_id):
+        """
+        Remove part from active tracking. The row stays in the store as the log entry.
+
+        Returns:
+            RecordView or None: Completed part record if found, None if not found
+        """
+        return self.active.pop(sim_id, None)
+
+    def complete_pca_cycle(self, sim_id, part_id):
+        """
+        Complete cycle for a part leaving Condition A, validating the part_id pair.
+        See PartManager.complete_pca_cycle().
+
+        Raises:
+            ValueError: If part_id in active record does not match provided part_id
+        """
+        record = self.active.get(sim_id)
+        if not record:
+            return None
+
+        if record['part_id'] != part_id:
+            raise ValueError(
+                f"Part ID mismatch for sim_id {sim_id}: "
+                f"Active record has {record['part_id']}, "
+                f"condition_a_df has {part_id}"
+            )
+
+        return self.complete_part_cycle(sim_id)
+
+    # ===========================================================
+    # EXPORT/ANALYSIS: DATA EXPORT
+    # ===========================================================
+
+    def _completed_rows(self):
+        present = self.store.present[:self.store.n_rows].copy()
+        present[list(self.active)] = False
+        return np.flatnonzero(present)
+
+    @property
+    def part_log(self):
+        """Completed cycles as a list of dict records (built on access)."""
+        return [self.store.record(row) for row in self._completed_rows()]
+
+    def export_active_parts(self):
+        """
+        Export ACTIVE PARTS as pandas DataFrame for analysis.
+        """
+        return decode_event_path_column(self.store.to_frame(np.array(list(self.active), dtype=np.intp)))
+
+    def export_completed_cycles(self):
+        """
+        Export completed cycles as pandas DataFrame for analysis.
+        """
+        return decode_event_path_column(self.store.to_frame(self._completed_rows()))
+
+    def get_all_parts_data(self):
+        """
+        Combine active parts and completed cycles into single dictionary.
+
+        Returns:
+            dict: {sim_id: record} of plain dict records, ordered by sim_id
+        """
+        rows = self.store.present_rows()
+        if isinstance(rows, slice):
+            rows = range(rows.start, rows.stop)
+        return {int(row): self.store.record(row) for row in rows}
+
+    def freeze_records(self):
+        """
+        No-op: columnar exports read the store arrays, there is nothing to merge.
+        """
+
+    def get_all_parts_data_df(self):
+        """
+        Export all parts (active + completed) as pandas DataFrame.
+
+        Float columns wrap the store arrays directly (no copy).
+        """
+        return decode_event_path_column(self.store.to_frame())
+
+    def get_wip_end(self, sim_time, interval):
+        """
+        Get WIP counts over time with forward fill.
+        """
+        if self.wip_tracker is not None:
+            return self.wip_tracker.unified_frame(sim_time, interval)
+
+        from ds.helpers import compute_unified_wip_arrays, PART_WIP_FIELDS
+
+        arrays = self.store.float_arrays([f for pair in PART_WIP_FIELDS.values() for f in pair])
+        return compute_unified_wip_arrays(arrays, sim_time, interval)
+
+    def get_wip_raw(self):
+        """
+        Get raw WIP counts (no interpolation/forward fill).
+        """
+        if self.wip_tracker is not None:
+            return self.wip_tracker.raw_frame()
+
+        from ds.helpers import compute_raw_wip_arrays, PART_WIP_FIELDS
+
+        arrays = self.store.float_arrays([f for pair in PART_WIP_FIELDS.values() for f in pair])
+        return compute_raw_wip_arrays(arrays)
+
+    def get_wip_time_avg(self, window_start, window_end):
+        """
+        Get time-weighted average WIP per category over [window_start, window_end].
+        """
+        tracker = self.wip_tracker
+        if tracker is not None and (tracker.window_start, tracker.window_end) == (window_start, window_end):
+            return tracker.time_weighted_averages()
+
+        from ds.helpers import compute_time_weighted_wip_arrays, PART_WIP_FIELDS
+
+        arrays = self.store.float_arrays([f for pair in PART_WIP_FIELDS.values() for f in pair])
+        return compute_time_weighted_wip_arrays(arrays, PART_WIP_FIELDS, window_start, window_end)
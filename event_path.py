@@ -0,0 +1,145 @@
+"""
+Compact event-path encoding for part and aircraft records.
+
+An event_path is the sequence of transitions a part/aircraft went through in
+one cycle (e.g. 'IC_IZ_FS_FE, IC_FE_CF, CF_DE'). Instead of building a new
+string on every transition, each transition token has a small int code and a
+path is a single int with one code per TOKEN_BITS-bit slot:
+
+    append_event(path, code) == (path << TOKEN_BITS) | code
+
+0 is the empty path. Paths are decoded to the familiar comma-separated string
+only at export time (decode_path / decode_paths).
+
+See docs/event_type.md for token meanings.
+"""
+from enum import IntEnum
+
+import numpy as np
+
+TOKEN_BITS = 6
+TOKEN_MASK = (1 << TOKEN_BITS) - 1
+
+# Transition tokens. Code = position + 1 (0 is reserved for the empty path).
+# Append new tokens at the end only - codes must stay stable.
+EVENT_TOKENS = (
+    # Initialization
+    'IC_IZ_FS_FE',
+    'IC_MS',
+    'IC_IjD',
+    'IC_IjCF',
+    'IC_IjCA',
+    'IC_CAS_IE',
+    'IC_MS_IE',
+    'IC_CAP_FS_FE',
+    'IC_MAC_FS_FE',
+    'IC_FE_CF',
+    # Part fleet end -> Condition F -> Depot
+    'CFS_CFE',
+    'DS_DE',
+    'DS_DE_CONDEMN',
+    'CF_DE',
+    # Depot complete
+    'DE_CA',
+    'DE_DMR_IE',
+    'ME_DMR_IE',
+    'DMR_CR_FS_FE',
+    # Aircraft fleet complete
+    'CAE_IE',
+    'FE_IE',
+    'CAP_CR_FS_FE',
+    'FE_MS',
+    'CAE_IE_CR',
+    # New part arrives
+    'NP_CA',
+    'NP_NMR_IE',
+    'ME_NMR_IE',
+    'NMR_CR_FS_FE',
+)
+
+assert len(EVENT_TOKENS) <= TOKEN_MASK, "Too many event tokens for TOKEN_BITS"
+
+# EventCode.<TOKEN> -> int code (e.g. EventCode.DE_CA)
+EventCode = IntEnum('EventCode', [(token, code) for code, token in enumerate(EVENT_TOKENS, start=1)])
+
+_TOKEN_BY_CODE = ('',) + EVENT_TOKENS
+_DECODE_CACHE = {0: ''}
+
+
+def append_event(current_path, code):
+    """
+    Append a transition code to an encoded path.
+
+    Parameters
+    ----------
+    current_path : int
+        Encoded path (0 for empty)
+    code : int
+        EventCode value of the new transition
+
+    Returns
+    -------
+    int
+        Encoded path with code appended
+    """
+    return (current_path << TOKEN_BITS) | code
+
+
+def encode_path(*tokens):
+    """
+    Encode token names into a path, e.g. encode_path('IC_IZ_FS_FE', 'IC_FE_CF').
+    Used for constants compared against record event_path values.
+    """
+    path = 0
+    for token in tokens:
+        path = append_event(path, EventCode[token])
+    return path
+
+
+def decode_path(path):
+    """
+    Decode an encoded path to the comma-separated token string.
+
+    Returns
+    -------
+    str
+        e.g. 'IC_IZ_FS_FE, IC_FE_CF' ('' for the empty path)
+    """
+    decoded = _DECODE_CACHE.get(path)
+    if decoded is None:
+        tokens = []
+        remaining = int(path)
+        while remaining:
+            tokens.append(_TOKEN_BY_CODE[remaining & TOKEN_MASK])
+            remaining >>= TOKEN_BITS
+        decoded = ', '.join(reversed(tokens))
+        _DECODE_CACHE[path] = decoded
+    return decoded
+
+
+def decode_paths(values):
+    """
+    Decode an array/Series of encoded paths to an object array of strings.
+
+    Each distinct path is decoded once.
+    """
+    values = np.asarray(values)
+    if values.size == 0:
+        return values.astype(object)
+    unique, inverse = np.unique(values, return_inverse=True)
+    decoded = np.array([decode_path(int(path)) for path in unique], dtype=object)
+    return decoded[inverse.reshape(values.shape)]
+
+
+def decode_event_path_column(df):
+    """
+    Replace an encoded 'event_path' column with decoded strings (in place).
+
+    Returns
+    -------
+    pd.DataFrame
+        Same DataFrame, for chaining
+    """
+    if 'event_path' in df.columns and len(df) > 0:
+        df['event_path'] = decode_paths(df['event_path'].to_numpy())
+    return df
@@ -0,0 +1,65 @@
+"""
+Integer-coded heap event types for SimulationEngine.
+
+Heap entries are (time, counter, event_code, entity_id) where event_code is a
+plain int (the module constants below, equal to the EventType values). Codes
+index directly into the engine's handler table and per-type counter list, so no
+string hashing/comparison happens per event. The engine pushes the plain ints
+rather than EventType members: indexing a list with an IntEnum member goes
+through __index__ on every lookup.
+
+EVENT_TYPE_NAMES keeps the original string names for progress display and the
+event_counts dict returned by SimulationEngine.run().
+"""
+
+from enum import IntEnum
+
+
+class EventType(IntEnum):
+    """Heap event types. Values are contiguous indices starting at 0."""
+    DEPOT_COMPLETE = 0      # Part completes depot → handle_part_completes_depot()
+    FLEET_COMPLETE = 1      # Aircraft completes fleet → handle_aircraft_needs_part()
+    NEW_PART_ARRIVES = 2    # New part arrives → handle_new_part_arrives()
+    CF_DE = 3               # Condition F part enters depot → event_cf_de()
+    PART_FLEET_END = 4      # Part completes fleet → event_p_cfs_de()
+    PART_CONDEMN = 5        # Part condemned at depot end → event_p_condemn()
+
+
+# Plain int codes pushed on the event heap (EventType values)
+DEPOT_COMPLETE = EventType.DEPOT_COMPLETE.value
+FLEET_COMPLETE = EventType.FLEET_COMPLETE.value
+NEW_PART_ARRIVES = EventType.NEW_PART_ARRIVES.value
+CF_DE = EventType.CF_DE.value
+PART_FLEET_END = EventType.PART_FLEET_END.value
+PART_CONDEMN = EventType.PART_CONDEMN.value
+
+# String names indexed by EventType value
+EVENT_TYPE_NAMES = (
+    'depot_complete',
+    'fleet_complete',
+    'new_part_arrives',
+    'CF_DE',
+    'part_fleet_end',
+    'part_condemn',
+)
+
+N_EVENT_TYPES = len(EVENT_TYPE_NAMES)
+
+
+def event_counts_dict(type_counts):
+    """
+    Build the event_counts dict (string keys + 'total') from per-type counters.
+
+    Parameters
+    ----------
+    type_counts : list of int
+        Counter per EventType value
+
+    Returns
+    -------
+    dict
+        {'depot_complete': n, ..., 'part_condemn': n, 'total': n}
+    """
+    counts = dict(zip(EVENT_TYPE_NAMES, type_counts))
+    counts['total'] = sum(type_counts)
+    return counts
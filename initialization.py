@@ -7,8 +7,12 @@ import numpy as np
 import pandas as pd
 import heapq
 
-def append_event(current_event, new_event):
-    return f"{current_event}, {new_event}"
+from event_path import EventCode, append_event, encode_path
+
+# Encoded paths of parts that get pushed from fleet_end to Condition F
+PATH_IC_IZ_FS_FE = encode_path('IC_IZ_FS_FE')
+PATH_IC_CAP_FS_FE = encode_path('IC_CAP_FS_FE')
+
 
 class Initialization:
     """
@@ -90,7 +94,7 @@ class Initialization:
         # Get list of aircraft-part IDs from allocation
         f_start_ac_part_ids = self.engine.allocation['f_start_ac_part_ids']
         
-        eventtype = "IC_IZ_FS_FE"
+        eventtype = EventCode.IC_IZ_FS_FE
         
         for entity_id in f_start_ac_part_ids:
             # entity_id is both ac_id and part_id for fleet start pairs
@@ -102,11 +106,9 @@ class Initialization:
             des_id = self.engine.ac_manager.get_next_des_id()
             
             # Calculate Fleet duration & optionally randomize duration per user settings
-            d1_base = self.engine.calculate_fleet_duration()
+            d1_base = self.engine.calculate_fleet_duration(ac_id)
             if self.engine.params['use_fleet_rand']:
-                random_multiplier = np.random.uniform(
-                    self.engine.params['fleet_rand_min'], 
-                    self.engine.params['fleet_rand_max'])
+                random_multiplier = self.engine.samplers.fleet_multiplier.next(ac_id)
             else:
                 random_multiplier = 1.0
             d1 = d1_base * random_multiplier
@@ -116,7 +118,10 @@ class Initialization:
             s1_end = s1_start + d1
 
             # Randomize cycle for steady-state initialization
-            initial_cycle = np.random.randint(1, self.engine.params['condemn_cycle'])
+            if self.engine.samplers.initial_cycle is not None:
+                initial_cycle = self.engine.samplers.initial_cycle.integers(part_id, 1, self.engine.params['condemn_cycle'])
+            else:
+                initial_cycle = int(self.engine.rng.integers(1, self.engine.params['condemn_cycle']))
             
             # Add to PartManager using add_part
             self.engine.part_manager.add_part(
@@ -150,7 +155,7 @@ class Initialization:
         Insures micap starting MICAP are tracked by AircraftManager active aircraft
         """
         micap_ac_ids = self.engine.allocation['micap_ac_ids']
-        eventtype="IC_MS"
+        eventtype=EventCode.IC_MS
 
         # Add each aircraft to MICAP queue
         for ac_id in micap_ac_ids:
@@ -189,14 +194,12 @@ class Initialization:
             s3_start = 0.0
             d3_base = self.engine.calculate_depot_duration()
             if self.engine.params['use_depot_rand']:
-                random_multiplier = np.random.uniform(
-                    self.engine.params['depot_rand_min'], 
-                    self.engine.params['depot_rand_max'])
+                random_multiplier = self.engine.samplers.depot_multiplier.next()
             else:
                 random_multiplier = 1.0
             d3 = d3_base * random_multiplier
             s3_end = s3_start + d3
-            eventtype = "IC_IjD"
+            eventtype = EventCode.IC_IjD
 
             self.engine.part_manager.add_initial_part(
                 part_id=part_id,
@@ -227,7 +230,7 @@ class Initialization:
 
         for part_id, cycle in zip(cond_f_part_ids, cond_f_cycles):
             s2_start = 0
-            eventtype = "IC_IjCF"
+            eventtype = EventCode.IC_IjCF
 
             # Add Condition F event
             self.engine.part_manager.add_initial_part(
@@ -255,7 +258,7 @@ class Initialization:
 
         for part_id, cycle in zip(cond_a_part_ids, cond_a_cycles):
             ca_start = 0
-            eventtype = "IC_IjCA"
+            eventtype = EventCode.IC_IjCA
 
             # Add Condition A event to part_manager
             result = self.engine.part_manager.add_initial_part(
@@ -290,10 +293,10 @@ class Initialization:
 
         - MICAP aircraft that get resolved will be advanced to fleet_end
         """
-        eventtype="IC_MS_IE"
-        eventtype_p="IC_CAS_IE"
-        eventtype_restart_p = "IC_CAP_FS_FE"
-        eventtype_restart_a = "IC_MAC_FS_FE"
+        eventtype=EventCode.IC_MS_IE
+        eventtype_p=EventCode.IC_CAS_IE
+        eventtype_restart_p = EventCode.IC_CAP_FS_FE
+        eventtype_restart_a = EventCode.IC_MAC_FS_FE
         
         # Keep processing while both MICAP aircraft and Condition A parts exist
         while self.engine.cond_a_state.count_active() > 0:
@@ -374,7 +377,7 @@ class Initialization:
             new_des_id = self.engine.ac_manager.get_next_des_id()
             
             # Fleet Calculation
-            d1 = self.engine.calculate_fleet_duration()
+            d1 = self.engine.calculate_fleet_duration(first_micap['ac_id'])
             s1_start = s4_install_end
             s1_end = s1_start + d1
 
@@ -427,13 +430,13 @@ class Initialization:
         # push IC_IZ_FS_FE & IC_CAP_FS_FE from fleet_end to CF_Start
         valid_parts = []
         for sim_id, part in active_parts.items():
-            if part['event_path'] in ['IC_IZ_FS_FE', 'IC_CAP_FS_FE']:
+            if part['event_path'] in (PATH_IC_IZ_FS_FE, PATH_IC_CAP_FS_FE):
                 valid_parts.append(part)
         
         # Sort by fleet_end. Maintain chronological order
         valid_parts.sort(key=lambda x: x['fleet_end'] if pd.notna(x['fleet_end']) else float('inf'))
         
-        eventtype = "IC_FE_CF"
+        eventtype = EventCode.IC_FE_CF
         
         for part in valid_parts:
             sim_id = part['sim_id']
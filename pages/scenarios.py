@@ -16,11 +16,11 @@ import matplotlib.pyplot as plt
 from io import BytesIO
 from datetime import datetime
 import zipfile
+import traceback
 
 import warnings
 warnings.simplefilter("ignore", category=FutureWarning)
 
-from parameters import Parameters
 from ui.sc_sidebar import render_scenarios_sidebar
 from ui.sc_loop import render_loop_params
 from ui.sc_results import (
@@ -34,11 +34,11 @@ from ui.sc_tabs import (
     close_all_figures,
 )
 from sc_utils import (
-    run_single_simulation,
-    run_single_simulation_fast,
     generate_analysis_text,
     fig_to_bytes
 )
+from ui.sc_optimizer import render_optimizer_tab
+from sc_executor import iter_scenario_results, order_results
 
 
 def main() -> None:
@@ -52,6 +52,18 @@ def main() -> None:
     
     # Extract values from sidebar_params
     fast_mode = sidebar_params['fast_mode']
+    time_weighted = sidebar_params['time_weighted']
+    compact_records = sidebar_params['compact_records']
+    max_workers = sidebar_params['max_workers']
+    n_reps = sidebar_params['n_reps']
+    max_reps = sidebar_params['max_reps']
+    target_half_width = sidebar_params['target_half_width']
+    common_random_numbers = sidebar_params['common_random_numbers']
+    antithetic = sidebar_params['antithetic']
+    warm_start = sidebar_params['warm_start']
+    cache_dir = sidebar_params['cache_dir']
+    cache_max_mb = sidebar_params['cache_max_mb']
+    force_recompute = sidebar_params['force_recompute']
     n_total_aircraft = sidebar_params['n_total_aircraft']
     analysis_periods = sidebar_params['analysis_periods']
     condemn_cycle = sidebar_params['condemn_cycle']
@@ -76,7 +88,7 @@ def main() -> None:
     # ==========================================================================
     # MAIN AREA - TABS
     # ==========================================================================
-    tab0, tab1, tab2, tab3, tab4, tab5 = st.tabs(["⚙️ Setup", "Charts", "All Metrics", "Full Data", "MICAP Time Series", "Download"])
+    tab0, tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["⚙️ Setup", "Charts", "All Metrics", "Full Data", "MICAP Time Series", "Download", "🎯 Optimizer"])
     
     # ==========================================================================
     # TAB 0 - Setup (Loop Parameters)
@@ -106,6 +118,52 @@ def main() -> None:
     # Either button triggers the simulation
     run_button = run_button_main or run_button_sidebar
     
+    # Build base params dict (used by the grid sweep and the optimizer)
+    base_params = {
+        'n_total_aircraft': n_total_aircraft,
+        'warmup_periods': warmup_periods,
+        'analysis_periods': analysis_periods,
+        'closing_periods': closing_periods,
+        'sim_time': sim_time,
+        'use_buffer': double_periods,
+        'use_percentage_plots': use_percentage_plots,
+        'part_order_lag': part_order_lag,
+        'mission_capable_rate': mission_capable_rate,
+        'condemn_cycle': condemn_cycle,
+        'condemn_depot_fraction': condemn_depot_fraction,
+        'sone_dist': sone_dist,
+        'sone_mean': sone_mean,
+        'sone_sd': sone_sd,
+        'sthree_dist': sthree_dist,
+        'sthree_mean': sthree_mean,
+        'sthree_sd': sthree_sd,
+        'use_fleet_rand': fleet_rand_params['use_fleet_rand'],
+        'fleet_rand_min': fleet_rand_params['fleet_rand_min'],
+        'fleet_rand_max': fleet_rand_params['fleet_rand_max'],
+        'use_depot_rand': depot_rand_params['use_depot_rand'],
+        'depot_rand_min': depot_rand_params['depot_rand_min'],
+        'depot_rand_max': depot_rand_params['depot_rand_max'],
+        'render_plots': not fast_mode,  # False when fast_mode is ON
+        'time_weighted_averages': time_weighted,
+        # Fast + time-weighted averages need no record history (metrics-only engine)
+        'metrics_only': fast_mode and time_weighted,
+        # Columnar records where records are kept at all
+        'record_backend': 'columnar' if compact_records and not (fast_mode and time_weighted) else 'dict',
+        'random_seed': random_seed,
+        'common_random_numbers': common_random_numbers,
+        # Replications fork from one shared warm-up snapshot per point
+        'warm_start': warm_start,
+        # Replication settings (used by the analysis text)
+        'n_reps': n_reps,
+        'max_reps': max_reps,
+        'target_half_width': target_half_width,
+        'antithetic_pairs': antithetic,
+        # Result cache (not part of the cache key)
+        'cache_dir': cache_dir,
+        'cache_max_mb': cache_max_mb,
+        'force_recompute': force_recompute,
+    }
+    
     # ==========================================================================
     # SESSION STATE INIT
     # st.session_state is needed so when session state changes (field updates)
@@ -148,113 +206,69 @@ def main() -> None:
             terminal_max_lines = 20 # Fixed at 20 lines
             terminal_display = st.empty()
         
-        all_results = []
         run_count = 0
         cumulative_total_events = 0
         terminal_output_lines = [] # Store terminal output lines
         
-        # Build base params dict
-        base_params = {
-            'n_total_aircraft': n_total_aircraft,
-            'warmup_periods': warmup_periods,
-            'analysis_periods': analysis_periods,
-            'closing_periods': closing_periods,
-            'sim_time': sim_time,
-            'use_buffer': double_periods,
-            'use_percentage_plots': use_percentage_plots,
-            'part_order_lag': part_order_lag,
-            'mission_capable_rate': mission_capable_rate,
-            'condemn_cycle': condemn_cycle,
-            'condemn_depot_fraction': condemn_depot_fraction,
-            'sone_dist': sone_dist,
-            'sone_mean': sone_mean,
-            'sone_sd': sone_sd,
-            'sthree_dist': sthree_dist,
-            'sthree_mean': sthree_mean,
-            'sthree_sd': sthree_sd,
-            'use_fleet_rand': fleet_rand_params['use_fleet_rand'],
-            'fleet_rand_min': fleet_rand_params['fleet_rand_min'],
-            'fleet_rand_max': fleet_rand_params['fleet_rand_max'],
-            'use_depot_rand': depot_rand_params['use_depot_rand'],
-            'depot_rand_min': depot_rand_params['depot_rand_min'],
-            'depot_rand_max': depot_rand_params['depot_rand_max'],
-            'render_plots': not fast_mode,  # False when fast_mode is ON
-            'random_seed': random_seed,
-        }
-        
-        # Run all combinations
-        for depot_cap in depot_values:
-            for n_parts in parts_values:
-                run_count += 1
-                progress = run_count / total_runs
-                progress_bar.progress(progress)
-                status_text.text(f"Running {run_count}/{total_runs}: depot={depot_cap}, parts={n_parts}")
-                
-                np.random.seed(random_seed)
-                
-                params = Parameters()
-                params.set_all(base_params)
-                params.set('n_total_parts', n_parts)
-                params.set('depot_capacity', depot_cap)
-                
-                # Calculate allocation
-                n_aircraft_with_parts = min(n_parts, int(np.ceil(mission_capable_rate * n_total_aircraft)))
-                parts_air_dif = n_parts - n_aircraft_with_parts
-                parts_in_depot = min(parts_air_dif, depot_cap)
-                remaining_parts = parts_air_dif - parts_in_depot
-                
-                params.set('parts_in_depot', parts_in_depot)
-                params.set('parts_in_cond_f', remaining_parts)
-                params.set('parts_in_cond_a', 0)
-                
-                try:
-                    # Use appropriate simulation function based on fast_mode
-                    if fast_mode:
-                        result = run_single_simulation_fast(params, depot_cap, n_parts)
-                    else:
-                        result = run_single_simulation(params, depot_cap, n_parts)
-                    
-                    result['depot_capacity'] = depot_cap
-                    result['n_total_parts'] = n_parts
-                    all_results.append(result)
-                    
-                    # Update cumulative event counts
-                    last_run_events = result.get('total_events', 0)
-                    cumulative_total_events += last_run_events
-                    
-                    # Update live display
-                    cumulative_events_display.metric(
-                        "Cumulative Total Events", 
-                        f"{cumulative_total_events:,}"
-                    )
-                    last_run_events_display.metric(
-                        f"Last Run Events (depot={depot_cap}, parts={n_parts})", 
-                        f"{last_run_events:,}"
-                    )
-                    
-                    # Add result line to terminal output
-                    avg_micap = result.get('avg_micap', 0)
-                    avg_fleet = result.get('avg_fleet', 0)
-                    terminal_line = f"[{run_count:3d}/{total_runs}] depot={depot_cap:3d}, parts={n_parts:3d} | Avg MICAP: {avg_micap:6.2f}, Avg Fleet: {avg_fleet:6.2f}, Events: {last_run_events:,}"
-                    terminal_output_lines.append(terminal_line)
-                    
-                    # Keep only the last N lines based on user selection, reversed (newest first)
-                    display_lines = terminal_output_lines[-terminal_max_lines:][::-1]
-                    terminal_text = "\n".join(display_lines)
-                    terminal_display.code(terminal_text, language="text")
-                    
-                except Exception as e:
-                    st.warning(f"Run {run_count} failed: {e}")
-                    import traceback
-                    st.code(traceback.format_exc())
-                    
-                    # Add error line to terminal output
-                    terminal_line = f"[{run_count:3d}/{total_runs}] depot={depot_cap:3d}, parts={n_parts:3d} | ERROR: {str(e)}"
-                    terminal_output_lines.append(terminal_line)
-                    display_lines = terminal_output_lines[-terminal_max_lines:][::-1]
-                    terminal_text = "\n".join(display_lines)
-                    terminal_display.code(terminal_text, language="text")
-        
+        # Run all combinations (results stream back in completion order)
+        reps_label = f" x {n_reps}+ replications" if target_half_width is not None else (f" x {n_reps} replications" if n_reps > 1 else "")
+        if antithetic:
+            reps_label += " (antithetic pairs)"
+        status_text.text(f"Running {total_runs} scenarios{reps_label} on {max_workers} worker(s)...")
+        results_by_index = {}
+        scenario_stream = iter_scenario_results(
+            base_params, depot_values, parts_values, fast_mode, max_workers=max_workers,
+            n_reps=n_reps, max_reps=max_reps, target_half_width=target_half_width,
+            antithetic=antithetic
+        )
+        for grid_index, depot_cap, n_parts, result, error in scenario_stream:
+            run_count += 1
+            progress = run_count / total_runs
+            progress_bar.progress(progress)
+            status_text.text(f"Completed {run_count}/{total_runs}: depot={depot_cap}, parts={n_parts}")
+
+            if error is None:
+                results_by_index[grid_index] = result
+
+                # Update cumulative event counts
+                last_run_events = result.get('total_events', 0)
+                cumulative_total_events += last_run_events
+
+                # Update live display
+                cumulative_events_display.metric(
+                    "Cumulative Total Events",
+                    f"{cumulative_total_events:,}"
+                )
+                last_run_events_display.metric(
+                    f"Last Run Events (depot={depot_cap}, parts={n_parts})",
+                    f"{last_run_events:,}"
+                )
+
+                # Add result line to terminal output
+                avg_micap = result.get('avg_micap', 0)
+                avg_fleet = result.get('avg_fleet', 0)
+                terminal_line = f"[{run_count:3d}/{total_runs}] depot={depot_cap:3d}, parts={n_parts:3d} | Avg MICAP: {avg_micap:6.2f}, Avg Fleet: {avg_fleet:6.2f}, Events: {last_run_events:,}"
+                if 'n_reps' in result:
+                    terminal_line += f" | ±{result['avg_micap_ci_half']:.2f} (R={result['n_reps']})"
+                if result.get('cache_hit'):
+                    terminal_line += " | cached"
+            else:
+                st.warning(f"Run {grid_index + 1} (depot={depot_cap}, parts={n_parts}) failed: {error}")
+                st.code("".join(traceback.format_exception(error)))
+
+                # Add error line to terminal output
+                terminal_line = f"[{run_count:3d}/{total_runs}] depot={depot_cap:3d}, parts={n_parts:3d} | ERROR: {str(error)}"
+
+            terminal_output_lines.append(terminal_line)
+
+            # Keep only the last N lines based on user selection, reversed (newest first)
+            display_lines = terminal_output_lines[-terminal_max_lines:][::-1]
+            terminal_text = "\n".join(display_lines)
+            terminal_display.code(terminal_text, language="text")
+
+        # Restore grid order so the results table matches the serial sweep
+        all_results = order_results(results_by_index)
+
         progress_bar.empty()
         status_text.empty()
         
@@ -271,8 +285,19 @@ def main() -> None:
         st.session_state.scenario_parts_values = parts_values
         
         mode_label = "Fast Mode" if fast_mode else "Full Mode"
-        st.success(f"✅ Completed {len(all_results)} simulations ({mode_label})! Total events processed: {cumulative_total_events:,}")
+        n_cached = sum(1 for r in all_results if r.get('cache_hit'))
+        cached_label = f" ({n_cached} from cache)" if n_cached else ""
+        st.success(f"✅ Completed {len(all_results)} simulations ({mode_label}){cached_label}! Total events processed: {cumulative_total_events:,}")
     
+    # ==========================================================================
+    # TAB 6 - Optimizer (adaptive search, independent of the grid results)
+    # ==========================================================================
+    with tab6:
+        render_optimizer_tab(
+            base_params, depot_values, parts_values, max_workers,
+            n_reps=n_reps, max_reps=max_reps, antithetic=antithetic
+        )
+
     # ==========================================================================
     # DISPLAY RESULTS IN TABS
     # ==========================================================================
@@ -19,15 +19,15 @@ warnings.simplefilter("ignore", category=FutureWarning)
 from simulation_engine import SimulationEngine
 from ui.ui_components import render_sidebar
 from ui.downloads import render_download_section
-from ui.stats import render_stats_tab
-from utils import calculate_initial_allocation
+from ui.stats import render_stats_tab, render_engine_profile
+from utils import calculate_initial_allocation, make_sim_rng
 from ui.dist_plots import render_duration_plots
 from ui.wip_plots import render_wip_plots
 from session_manager import SessionStateManager
 from parameters import Parameters
 
 # Clear cache in excel files when engine.run is re-ran
-from ui.downloads import generate_csv_zip, generate_excel 
+from ui.downloads import generate_csv_zip, generate_excel, generate_parquet_zip
 
 def main() -> None:
     st.title("🔬 Solo Run - Discrete Event Simulation")
@@ -47,21 +47,23 @@ def main() -> None:
     if run_button:
         generate_csv_zip.clear()
         generate_excel.clear()
+        generate_parquet_zip.clear()
         # Create placeholders for progress updates
         progress_placeholder = st.empty()
         event_details = st.empty()
         
         with st.spinner("Running simulation..."):
-            # Set random seed for reproducibility
-            np.random.seed(params['random_seed'])
+            # Per-run random stream for reproducibility (no global seed)
+            rng = make_sim_rng(params['random_seed'])
             
             # calculate initial conditions
-            allocation = calculate_initial_allocation(params)
+            allocation = calculate_initial_allocation(params, rng=rng)
             
             # Create SimulationEngine (DataSets created internally during run())
             engine = SimulationEngine(
                 params=params,
-                allocation=allocation
+                allocation=allocation,
+                rng=rng
             )
             
             # Define progress callback for live updates
@@ -166,6 +168,11 @@ def main() -> None:
                 # from ui/dist_plots.py
                 #############################
                 render_duration_plots(post_sim)
+
+                # Engine profile (sidebar 'Profile Engine')
+                if 'profile' in validation_results:
+                    st.markdown("---")
+                    render_engine_profile(validation_results['profile'])
                 
 
             ############################
@@ -180,7 +187,7 @@ def main() -> None:
                     st.info("Plot rendering is disabled. Check 'Render Plots' in sidebar to enable.")
                 
                 # Download Results
-                render_download_section(datasets)
+                render_download_section(datasets, run_data['run_id'])
     
     else:
         # Show message in result tabs when simulation hasn't run yet
@@ -6,26 +6,36 @@ Parts enter after depot completion or new part arrival.
 Parts exit when installed on aircraft (from fleet_complete or MICAP resolution).
 """
 
+import heapq
 import pandas as pd
-from collections import deque
 
 
 class ConditionAState:
     """
-    Manages parts in Condition A (available inventory) with FIFO ordering.
+    Manages parts in Condition A (available inventory).
     
-    Uses deque + dict for O(1) operations while maintaining insertion order.
+    Uses a heap keyed on (condition_a_start, part_id, insertion seq) so the
+    earliest available part is popped in O(log n) instead of sorting the whole
+    inventory per pop. Ties keep insertion order, same as the previous stable sort.
+    Parts only leave through pop_first_available(), so heap and lookup hold
+    the same parts.
     Logs enter/exit events for WIP tracking.
     
     Minimal storage: only sim_id, part_id, condition_a_start.
     Full part details available via part_manager.get_part(sim_id).
     """
     
-    def __init__(self):
-        """Initialize Condition A state management."""
-        self.queue = deque()          # Maintains insertion order (FIFO)
-        self.lookup = {}              # {sim_id: record} for O(1) access
+    def __init__(self, keep_log=True):
+        """
+        Initialize Condition A state management.
+
+        keep_log=False skips condition_a_log (metrics-only runs).
+        """
+        self.heap = []                # (condition_a_start, part_id, seq, sim_id)
+        self.seq = 0                  # Insertion counter (tie-breaker)
+        self.lookup = {}              # {sim_id: record} for O(1) access - active parts
         self.condition_a_log = []     # Enter/exit events for WIP tracking
+        self.keep_log = keep_log
     
     def add_part(self, sim_id, part_id, event_path, condition_a_start):
         """
@@ -59,20 +69,22 @@ class ConditionAState:
             'count': self.count_active()
         }
         
-        self.queue.append(record)
+        heapq.heappush(self.heap, (condition_a_start, part_id, self.seq, sim_id))
+        self.seq += 1
         self.lookup[sim_id] = record
         
         # Log entry event
-        self.condition_a_log.append({
-            'event_time': condition_a_start,
-            'event': 'ENTER_COND_A',
-            'sim_id': sim_id,
-            'part_id': part_id,
-            'event_path': event_path,
-            'condition_a_start': condition_a_start,
-            'condition_a_end': None,
-            'count': self.count_active()
-        })
+        if self.keep_log:
+            self.condition_a_log.append({
+                'event_time': condition_a_start,
+                'event': 'ENTER_COND_A',
+                'sim_id': sim_id,
+                'part_id': part_id,
+                'event_path': event_path,
+                'condition_a_start': condition_a_start,
+                'condition_a_end': None,
+                'count': self.count_active()
+            })
         
         return {'success': True, 'error': None}
     
@@ -90,35 +102,28 @@ class ConditionAState:
         dict or None
             Part record with condition_a_end added, or None if empty
         """
-        if not self.queue:
+        if not self.heap:
             return None
         
-        # Sort queue to find earliest part (by condition_a_start, then part_id)
-        sorted_queue = sorted(self.queue, key=lambda x: (x['condition_a_start'], x['part_id']))
-        first_record = sorted_queue[0]
-        
-        sim_id = first_record['sim_id']
-        
-        # Remove from lookup
-        self.lookup.pop(sim_id)
-        
-        # Remove from deque (rebuild without this record)
-        self.queue = deque(r for r in self.queue if r['sim_id'] != sim_id)
+        # Earliest part (by condition_a_start, then part_id, then insertion order)
+        sim_id = heapq.heappop(self.heap)[3]
+        first_record = self.lookup.pop(sim_id)
         
         # Add condition_a_end to record
         first_record['condition_a_end'] = current_time
         
         # Log exit event
-        self.condition_a_log.append({
-            'event_time': current_time,
-            'event': 'EXIT_COND_A',
-            'sim_id': sim_id,
-            'part_id': first_record['part_id'],
-            'event_path': first_record['event_path'],
-            'condition_a_start': first_record['condition_a_start'],
-            'condition_a_end': current_time,
-            'count': self.count_active()
-        })
+        if self.keep_log:
+            self.condition_a_log.append({
+                'event_time': current_time,
+                'event': 'EXIT_COND_A',
+                'sim_id': sim_id,
+                'part_id': first_record['part_id'],
+                'event_path': first_record['event_path'],
+                'condition_a_start': first_record['condition_a_start'],
+                'condition_a_end': current_time,
+                'count': self.count_active()
+            })
         
         return first_record
     
@@ -128,11 +133,11 @@ class ConditionAState:
 
         Number of available parts
         """
-        return len(self.queue)
+        return len(self.lookup)
     
     def is_empty(self):
         """Check if no parts are available."""
-        return len(self.queue) == 0
+        return len(self.lookup) == 0
     
     def get_log_dataframe(self):
         """
@@ -9,6 +9,8 @@ import pandas as pd
 import numpy as np
 from collections import deque
 
+from event_path import decode_event_path_column
+
 
 class MicapQueue:
     """
@@ -85,12 +87,15 @@ class MicapState:
     compatibility with existing simulation engine interface.
     """
     
-    def __init__(self):
+    def __init__(self, keep_log=True):
         """
         Initialize MICAP state management.
+
+        keep_log=False skips micap_log (metrics-only runs).
         """
         self.active_queue = MicapQueue()
         self.micap_log = []  # Resolved MICAP history
+        self.keep_log = keep_log
         self.errors = []     # Critical errors list
         self._counter = 0    # Track total MICAP events for debugging
     
@@ -140,7 +145,7 @@ class MicapState:
                 'message': result['error'],
                 'ac_id': ac_id
             })
-        else:
+        elif self.keep_log:
             # Log entry event when aircraft enters MICAP
             log_entry = record.copy()
             log_entry['event'] = 'ENTER_MICAP'
@@ -172,11 +177,12 @@ class MicapState:
         record['micap_duration'] = current_time - record['micap_start']
         
         # Log the exit event
-        log_entry = record.copy()
-        log_entry['event'] = 'EXIT_MICAP'
-        log_entry['micap_count'] = self.count_active()  # Count after removal
-        log_entry['event_time'] = current_time
-        self.micap_log.append(log_entry)
+        if self.keep_log:
+            log_entry = record.copy()
+            log_entry['event'] = 'EXIT_MICAP'
+            log_entry['micap_count'] = self.count_active()  # Count after removal
+            log_entry['event_time'] = current_time
+            self.micap_log.append(log_entry)
         
         return record  # Return dict directly, not pd.Series
     
@@ -213,7 +219,7 @@ class MicapState:
         # add code so when sim ends (events stop processing so need to define when it ends)
         # to log_entry for avtive micap at sim end and event name will be end_active_micap 
         # tracks all MICAP, I'm sure log_entry = record.copy() tracks entry but no event name yet. 
-        return pd.DataFrame(self.micap_log)
+        return decode_event_path_column(pd.DataFrame(self.micap_log))
     
     def get_micap_wip_df(self):
         """
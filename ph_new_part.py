@@ -19,7 +19,7 @@ class NewPart:
     Also tracks condemnation log for debugging/analysis.
     """
     
-    def __init__(self, n_total_parts):
+    def __init__(self, n_total_parts, keep_log=True):
         """
         Initialize NewPart state management.
         
@@ -27,10 +27,13 @@ class NewPart:
         ----------
         n_total_parts : int
             Starting value for part_id counter (from user input)
+        keep_log : bool
+            Record condemnations in condemn_log
         """
         self.next_part_id = n_total_parts  # Incrementing counter starts at n_total_parts
         self.active = {}                   # {part_id: record} for O(1) lookups
         self.condemn_log = []              # Track condemnation events (moved from data_manager)
+        self.keep_log = keep_log           # False: skip condemn_log (metrics-only runs)
     
     def get_next_part_id(self):
         """
@@ -142,6 +145,8 @@ class NewPart:
         condition_a_start : float
             Scheduled arrival time for replacement
         """
+        if not self.keep_log:
+            return
         self.condemn_log.append({
             'part_id': old_part_id,
             'depot_end': depot_end,
@@ -6,24 +6,24 @@ are computed inside engine.run()
 
 Ensures post-simulation does not use updated params post-sim
 """
-from ui.stats import calculate_simulation_stats
-from ui.wip_plots import (
-    plot_micap_over_time,
-    plot_fleet_wip_over_time,
-    plot_condition_f_wip_over_time,
-    plot_depot_wip_over_time,
-    plot_condition_a_wip_over_time
-)
-from ui.dist_plots import (
-    plot_fleet_duration_full,
-    plot_fleet_duration_no_init,
-    plot_fleet_duration_init_only,
-    plot_condition_f_duration,
-    plot_depot_duration_full,
-    plot_depot_duration_no_init,
-    plot_depot_duration_init_only,
-    plot_cond_a_duration
-)
+from io import BytesIO
+
+# Plotting modules (matplotlib, Streamlit) are imported only when figures are
+# rendered, so headless / fast runs never load them
+from ds.stats import calculate_simulation_stats, calculate_multi_run_averages
+
+WIP_FIG_KEYS = ('micap', 'fleet', 'condition_f', 'depot', 'condition_a')
+DIST_FIG_KEYS = ('fleet_full', 'fleet_no_init', 'fleet_init_only', 'condition_f',
+                 'depot_full', 'depot_no_init', 'depot_init_only', 'condition_a')
+
+
+def _fig_to_png(fig):
+    """PNG bytes of a figure, then close it (frees the matplotlib objects)."""
+    import matplotlib.pyplot as plt
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=150, bbox_inches='tight')
+    plt.close(fig)
+    return buf.getvalue()
 
 
 class PostSim:
@@ -38,10 +38,11 @@ class PostSim:
     
     Computes and stores:
     - stats: dict of all calculated statistics (from stats.py)
-    - wip_figs: dict of WIP plot figures (if render_plots=True)
-    - dist_figs: dict of distribution plot figures (if render_plots=True)
+    - multi_run_averages: dict of WIP averages (multi-model / solo UI)
     
-    UI code (main.py) accesses these pre-computed values for display.
+    Figures (render_plots=True) are not built here: get_wip_fig() /
+    get_dist_fig() render one on first access and memoize its PNG bytes, so
+    post-processing only pays for the figures that are viewed.
     """
     
     def __init__(self, datasets, event_counts, params, allocation):
@@ -76,82 +77,130 @@ class PostSim:
         self.stats = calculate_simulation_stats(datasets)
 
         # === Compute multi-run averages (for multi-model and solo UI) ===
-        from ui.stats import calculate_multi_run_averages
-        self.multi_run_averages = calculate_multi_run_averages(datasets)
+        # Metrics-only runs keep no raw WIP frames, so averages are time-weighted
+        self.multi_run_averages = calculate_multi_run_averages(
+            datasets,
+            time_weighted=params.get('time_weighted_averages', False) or params.get('metrics_only', False))
         
-        # === Compute figures (only if render_plots=True) ===
-        self.wip_figs = {}
-        self.dist_figs = {}
-        
-        if self.render_plots:
-            self._generate_wip_figures()
-            self._generate_dist_figures()
+        # === Figures: rendered on first access (get_wip_fig / get_dist_fig) ===
+        self._fig_png = {}  # (kind, key, title) -> PNG bytes or None
     
-    def _generate_wip_figures(self):
+    def _build_wip_figure(self, key):
         """
-        Generate all WIP plot figures.
+        Build one WIP plot figure (None without WIP data).
         """
         wip_raw = self.datasets.wip_raw
         wip_ac_raw = self.datasets.wip_ac_raw
         
         # Check if data exists
-        if wip_raw is None or len(wip_raw) == 0:
-            return
+        if not self.has_wip_data():
+            return None
+        
+        from ui.wip_plots import (
+            plot_micap_over_time,
+            plot_fleet_wip_over_time,
+            plot_condition_f_wip_over_time,
+            plot_depot_wip_over_time,
+            plot_condition_a_wip_over_time
+        )
         
-        # Generate figures
-        self.wip_figs['micap'] = plot_micap_over_time(wip_ac_raw, self.n_total_aircraft, self.use_percentage_plots)
-        self.wip_figs['fleet'] = plot_fleet_wip_over_time(wip_ac_raw, self.n_total_aircraft, self.use_percentage_plots)
-        self.wip_figs['condition_f'] = plot_condition_f_wip_over_time(wip_raw, self.n_total_parts, self.use_percentage_plots)
-        self.wip_figs['depot'] = plot_depot_wip_over_time(wip_raw, self.depot_capacity, self.use_percentage_plots)
-        self.wip_figs['condition_a'] = plot_condition_a_wip_over_time(wip_raw, self.n_total_parts, self.use_percentage_plots)
+        if key == 'micap':
+            return plot_micap_over_time(wip_ac_raw, self.n_total_aircraft, self.use_percentage_plots)
+        if key == 'fleet':
+            return plot_fleet_wip_over_time(wip_ac_raw, self.n_total_aircraft, self.use_percentage_plots)
+        if key == 'condition_f':
+            return plot_condition_f_wip_over_time(wip_raw, self.n_total_parts, self.use_percentage_plots)
+        if key == 'depot':
+            return plot_depot_wip_over_time(wip_raw, self.depot_capacity, self.use_percentage_plots)
+        return plot_condition_a_wip_over_time(wip_raw, self.n_total_parts, self.use_percentage_plots)
     
-    def _generate_dist_figures(self):
+    def _build_dist_figure(self, key):
         """
-        Generate all distribution plot figures.
-        
-        Stores figures in self.dist_figs dict with keys:
-        - 'fleet_full': All fleet durations 
-        - 'condition_a': Condition A durations
+        Build one distribution plot figure (None without part records).
         """
         all_parts_df = self.datasets.all_parts_df
         
         # Check if data exists
         if all_parts_df is None or len(all_parts_df) == 0:
-            return
+            return None
+        
+        from ui.dist_plots import (
+            plot_fleet_duration_full,
+            plot_fleet_duration_no_init,
+            plot_fleet_duration_init_only,
+            plot_condition_f_duration,
+            plot_depot_duration_full,
+            plot_depot_duration_no_init,
+            plot_depot_duration_init_only,
+            plot_cond_a_duration
+        )
         
         # Extract allocation values needed for filtering
         n_aircraft_with_parts = self.allocation['n_aircraft_with_parts']
         depot_part_ids = self.allocation['depot_part_ids']
         
-        # Generate figures
-        self.dist_figs['fleet_full'] = plot_fleet_duration_full(all_parts_df)
-        self.dist_figs['fleet_no_init'] = plot_fleet_duration_no_init(all_parts_df, n_aircraft_with_parts)
-        self.dist_figs['fleet_init_only'] = plot_fleet_duration_init_only(all_parts_df, n_aircraft_with_parts)
-        self.dist_figs['condition_f'] = plot_condition_f_duration(all_parts_df)
-        self.dist_figs['depot_full'] = plot_depot_duration_full(all_parts_df)
-        self.dist_figs['depot_no_init'] = plot_depot_duration_no_init(all_parts_df, depot_part_ids)
-        self.dist_figs['depot_init_only'] = plot_depot_duration_init_only(all_parts_df, depot_part_ids)
-        self.dist_figs['condition_a'] = plot_cond_a_duration(all_parts_df)
+        if key == 'fleet_full':
+            return plot_fleet_duration_full(all_parts_df)
+        if key == 'fleet_no_init':
+            return plot_fleet_duration_no_init(all_parts_df, n_aircraft_with_parts)
+        if key == 'fleet_init_only':
+            return plot_fleet_duration_init_only(all_parts_df, n_aircraft_with_parts)
+        if key == 'condition_f':
+            return plot_condition_f_duration(all_parts_df)
+        if key == 'depot_full':
+            return plot_depot_duration_full(all_parts_df)
+        if key == 'depot_no_init':
+            return plot_depot_duration_no_init(all_parts_df, depot_part_ids)
+        if key == 'depot_init_only':
+            return plot_depot_duration_init_only(all_parts_df, depot_part_ids)
+        return plot_cond_a_duration(all_parts_df)
+    
+    def _get_fig_png(self, kind, key, title):
+        """
+        Memoized PNG bytes of a figure (None when plots are off or there is no data).
+        """
+        memo_key = (kind, key, title)
+        if memo_key not in self._fig_png:
+            fig = None
+            if self.has_figures():
+                fig = self._build_wip_figure(key) if kind == 'wip' else self._build_dist_figure(key)
+            if fig is not None and title is not None and fig.axes:
+                fig.axes[0].set_title(title)
+            self._fig_png[memo_key] = _fig_to_png(fig) if fig is not None else None
+        return self._fig_png[memo_key]
+    
+    def has_figures(self):
+        """Check if figures can be rendered (render_plots on and full records kept)."""
+        return bool(self.render_plots) and self.datasets.has_frame('all_parts_df')
     
     def has_wip_data(self):
         """Check if WIP data is available."""
         return self.datasets.wip_raw is not None and len(self.datasets.wip_raw) > 0
     
-    def get_wip_fig(self, key):
+    def get_wip_fig(self, key, title=None):
         """
-        Get a WIP figure by key.
+        Get a WIP figure by key as PNG bytes (rendered on first access).
         
         Parameters
         ----------
         key : str
             One of: 'micap', 'fleet', 'condition_f',
                     'depot', 'condition_a'
+        title : str, optional
+            Replaces the plot title (memoized separately)
+        
+        Returns
+        -------
+        bytes or None
+            None when plots are off or there is no WIP data
         """
-        return self.wip_figs.get(key)
+        if key not in WIP_FIG_KEYS:
+            raise KeyError(f"Unknown WIP figure: {key}")
+        return self._get_fig_png('wip', key, title)
     
     def get_dist_fig(self, key):
         """
-        Get a distribution figure by key.
+        Get a distribution figure by key as PNG bytes (rendered on first access).
         
         Parameters
         ----------
@@ -159,5 +208,12 @@ class PostSim:
             One of: 'fleet_full', 'fleet_no_init', 'fleet_init_only', 
                     'condition_f', 'depot_full', 'depot_no_init', 
                     'depot_init_only', 'condition_a'
+        
+        Returns
+        -------
+        bytes or None
+            PNG bytes, None when plots are off or there are no part records
         """
-        return self.dist_figs.get(key)
+        if key not in DIST_FIG_KEYS:
+            raise KeyError(f"Unknown distribution figure: {key}")
+        return self._get_fig_png('dist', key, None)
@@ -0,0 +1,304 @@
+"""
+run_sweep.py
+--------------------
+Runs a depot_capacity x n_total_parts scenario sweep from the command line,
+without Streamlit (e.g. on a headless compute node).
+
+Usage
+-----
+python run_sweep.py sweep.json -o results.csv --workers 16
+python run_sweep.py sweep.yaml -o results.parquet --resume
+
+Config file (JSON, or YAML if PyYAML is installed)
+-----------
+{
+    "params": {"analysis_periods": 7300, "condemn_cycle": 1000, "random_seed": 132},
+    "depot_capacity": [29, 31, 33, 35],
+    "n_total_parts": {"min": 851, "max": 931, "mode": "interval", "step": 2},
+    "max_workers": 8,
+    "n_reps": 1
+}
+
+- "params" overrides DEFAULT_PARAMS (the Scenarios sidebar defaults). Warmup/
+  closing periods and sim_time follow the sidebar rule (buffer_multiplier x
+  fleet mean when use_buffer is on). "record_backend": "columnar" stores
+  records in column arrays when time_weighted_averages is off.
+- Loop specs are a list of values or {"min", "max", "mode": "all" | "interval"
+  | "count", "step" | "count"} (same modes as the Setup tab).
+- Optional replication settings: n_reps, max_reps, target_half_width, antithetic.
+
+Output
+------
+Runs are fast mode (metrics only, no figures). Every completed point is
+appended to the output as it finishes (completion order): a CSV file, or for a
+.parquet path a directory of part files (needs pyarrow, checked before any
+point runs). <output>.meta.json records the sweep settings; --resume skips the
+(depot, parts) points already in the output and refuses to resume a sweep with
+different settings. Failed points are reported and not written, so a resume
+retries them.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from sc_executor import build_loop_values, default_worker_count, iter_point_results
+
+# Scenarios sidebar defaults
+DEFAULT_PARAMS = {
+    'n_total_aircraft': 826,
+    'analysis_periods': 7300,
+    'condemn_cycle': 1000,
+    'condemn_depot_fraction': 0.10,
+    'part_order_lag': 365,
+    'random_seed': 132,
+    'mission_capable_rate': 0.92,
+    'sone_dist': 'Normal',
+    'sone_mean': 700.0,
+    'sone_sd': 140.0,
+    'sthree_dist': 'Weibull',
+    'sthree_mean': 6.11,
+    'sthree_sd': 22.61,
+    'use_buffer': True,
+    'buffer_multiplier': 2,
+    'use_fleet_rand': True,
+    'fleet_rand_min': 0.01,
+    'fleet_rand_max': 1.0,
+    'use_depot_rand': True,
+    'depot_rand_min': 0.01,
+    'depot_rand_max': 1.0,
+    'time_weighted_averages': True,
+    'record_backend': 'dict',
+    'common_random_numbers': False,
+    'warm_start': False,
+}
+
+REPLICATION_KEYS = ('n_reps', 'max_reps', 'target_half_width', 'antithetic')
+
+# Result entries that are not table columns
+NON_TABLE_KEYS = ('wip_figs_bytes',)
+
+
+def load_config(path):
+    """Read a JSON or YAML sweep config."""
+    with open(path) as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                sys.exit("YAML config needs PyYAML (pip install pyyaml), or use a JSON config.")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def loop_values(spec, name):
+    """Values of a loop spec: a list, or {"min", "max", "mode", "step"/"count"}."""
+    if isinstance(spec, list):
+        return [int(v) for v in spec]
+    if not isinstance(spec, dict) or 'min' not in spec or 'max' not in spec:
+        sys.exit(f"'{name}' must be a list of values or a dict with 'min' and 'max'.")
+    mode = spec.get('mode', 'all')
+    if mode not in ('all', 'interval', 'count'):
+        sys.exit(f"'{name}' mode must be 'all', 'interval' or 'count', got {mode!r}.")
+    param = spec.get('count', 5) if mode == 'count' else spec.get('step', 1)
+    return build_loop_values(False, [], int(spec['min']), int(spec['max']), mode, int(param))
+
+
+def build_base_params(overrides):
+    """
+    Scenario base_params from DEFAULT_PARAMS plus config overrides
+    (timeline rule of render_scenarios_sidebar).
+    """
+    unknown = set(overrides) - set(DEFAULT_PARAMS)
+    if unknown:
+        sys.exit(f"Unknown params in config: {', '.join(sorted(unknown))}")
+    p = dict(DEFAULT_PARAMS, **overrides)
+
+    if p['sone_dist'] == 'Weibull':
+        from utils import weibull_mean
+        fleet_mean_for_buffer = weibull_mean(p['sone_mean'], p['sone_sd'])
+    else:
+        fleet_mean_for_buffer = p['sone_mean']
+    if p['use_buffer']:
+        warmup_periods = fleet_mean_for_buffer * p['buffer_multiplier']
+        closing_periods = fleet_mean_for_buffer * p['buffer_multiplier']
+    else:
+        warmup_periods = 0
+        closing_periods = 0
+    if not p['use_fleet_rand']:
+        p['fleet_rand_min'] = p['fleet_rand_max'] = 1.0
+    if not p['use_depot_rand']:
+        p['depot_rand_min'] = p['depot_rand_max'] = 1.0
+
+    base_params = {k: v for k, v in p.items() if k != 'buffer_multiplier'}
+    base_params.update({
+        'warmup_periods': warmup_periods,
+        'closing_periods': closing_periods,
+        'sim_time': warmup_periods + p['analysis_periods'] + closing_periods,
+        'use_percentage_plots': True,
+        'render_plots': False,
+        # Metrics-only engine when averages are time-weighted (same as Fast Mode)
+        'metrics_only': p['time_weighted_averages'],
+    })
+    if base_params['metrics_only']:
+        base_params['record_backend'] = 'dict'  # metrics-only keeps no records
+    return base_params
+
+
+def is_parquet(output):
+    return output.endswith('.parquet')
+
+
+def check_output_engine(output):
+    """Exit before any point runs if a .parquet output has no Parquet engine."""
+    if not is_parquet(output):
+        return
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        sys.exit("Parquet output needs pyarrow (pip install pyarrow), or use a .csv output.")
+
+
+def read_output(output):
+    """Rows already written to output (None if nothing yet)."""
+    if is_parquet(output):
+        if not glob.glob(os.path.join(output, 'part-*.parquet')):
+            return None
+        return pd.read_parquet(output, engine='pyarrow')
+    if not os.path.exists(output):
+        return None
+    return pd.read_csv(output)
+
+
+def append_rows(output, rows):
+    """
+    Append result rows: CSV append, or one new part file per call for Parquet.
+
+    If the rows have columns the existing CSV header lacks, the CSV is
+    rewritten with the union of columns (earlier rows get blanks) instead of
+    dropping the new columns.
+    """
+    if not rows:
+        return
+    df = pd.DataFrame(rows)
+    if is_parquet(output):
+        os.makedirs(output, exist_ok=True)
+        part = len(glob.glob(os.path.join(output, 'part-*.parquet')))
+        df.to_parquet(os.path.join(output, f'part-{part:05d}.parquet'), engine='pyarrow', index=False)
+    elif os.path.exists(output):
+        columns = pd.read_csv(output, nrows=0).columns
+        if df.columns.difference(columns).empty:
+            df.reindex(columns=columns).to_csv(output, mode='a', header=False, index=False)
+        else:
+            # Schema changed: rewrite through a temp file so an interrupt keeps the old rows
+            tmp_path = output + '.tmp'
+            pd.concat([pd.read_csv(output), df], ignore_index=True).to_csv(tmp_path, index=False)
+            os.replace(tmp_path, output)
+    else:
+        df.to_csv(output, index=False)
+
+
+def remove_output(output):
+    if is_parquet(output):
+        for path in glob.glob(os.path.join(output, 'part-*.parquet')):
+            os.remove(path)
+    elif os.path.exists(output):
+        os.remove(output)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a depot x parts scenario sweep without Streamlit.")
+    parser.add_argument('config', help="Sweep config (.json, or .yaml/.yml with PyYAML)")
+    parser.add_argument('-o', '--output', default=None,
+                        help="Output .csv file or .parquet directory (default: config 'output' or sweep_results.csv)")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="Worker processes (default: config 'max_workers' or all cores)")
+    parser.add_argument('--resume', action='store_true', help="Skip points already in the output")
+    parser.add_argument('--overwrite', action='store_true', help="Delete existing output first")
+    parser.add_argument('--flush-every', type=int, default=50,
+                        help="Write to the output every N completed points (default: 50)")
+    parser.add_argument('--cache-dir', default=None, help="Use the on-disk result cache in this directory")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Only print the summary")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = load_config(args.config)
+
+    output = args.output or config.get('output', 'sweep_results.csv')
+    base_params = build_base_params(config.get('params', {}))
+    depot_values = loop_values(config.get('depot_capacity'), 'depot_capacity')
+    parts_values = loop_values(config.get('n_total_parts'), 'n_total_parts')
+    replication = {k: config[k] for k in REPLICATION_KEYS if config.get(k) is not None}
+    max_workers = args.workers or config.get('max_workers') or default_worker_count()
+
+    check_output_engine(output)
+    meta = {'base_params': base_params, 'replication': replication}
+    meta_path = output.rstrip('/\\') + '.meta.json'
+
+    if args.overwrite:
+        remove_output(output)
+    existing = read_output(output)
+    done = set()
+    if existing is not None:
+        if not args.resume:
+            sys.exit(f"{output} already has results; use --resume to continue or --overwrite to start over.")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                if json.load(f) != json.loads(json.dumps(meta)):
+                    sys.exit(f"{output} was written with different settings ({meta_path}); use --overwrite.")
+        done = set(zip(existing['depot_capacity'].astype(int), existing['n_total_parts'].astype(int)))
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    if args.cache_dir:
+        base_params = dict(base_params, cache_dir=args.cache_dir)
+
+    grid = [(d, p) for d in depot_values for p in parts_values if (d, p) not in done]
+    total = len(grid)
+    print(f"Sweep: {len(depot_values)} depot x {len(parts_values)} parts values, "
+          f"{len(done)} done, {total} to run on {max_workers} worker(s) -> {output}")
+
+    rows = []
+    n_done = n_failed = 0
+    start = time.time()
+    try:
+        for _, depot_cap, n_parts, result, error in iter_point_results(
+                base_params, grid, fast_mode=True, max_workers=max_workers, **replication):
+            n_done += 1
+            if error is not None:
+                n_failed += 1
+                print(f"[{n_done:5d}/{total}] depot={depot_cap:3d}, parts={n_parts:4d} | ERROR: {error}", file=sys.stderr)
+                continue
+            rows.append({k: v for k, v in result.items() if k not in NON_TABLE_KEYS})
+            if not args.quiet:
+                line = (f"[{n_done:5d}/{total}] depot={depot_cap:3d}, parts={n_parts:4d} | "
+                        f"Avg MICAP: {result['avg_micap']:8.3f}, Avg Fleet: {result['avg_fleet']:8.2f}")
+                if 'n_reps' in result:
+                    line += f" | ±{result['avg_micap_ci_half']:.3f} (R={result['n_reps']})"
+                print(line, flush=True)
+            if len(rows) >= args.flush_every:
+                append_rows(output, rows)
+                rows = []
+    finally:
+        # Keep completed points on interrupt so --resume can pick up from here
+        append_rows(output, rows)
+
+    elapsed = time.time() - start
+    print(f"Completed {n_done - n_failed}/{total} points in {elapsed:.1f}s ({n_failed} failed)")
+    results = read_output(output)
+    if results is not None and len(results):
+        best = results.loc[results['avg_micap'].idxmin()]
+        print(f"Lowest Avg MICAP: {best['avg_micap']:.3f} at depot={int(best['depot_capacity'])}, "
+              f"parts={int(best['n_total_parts'])}")
+    return 1 if n_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+sc_cache.py
+-----------------
+On-disk result cache for scenario runs.
+
+Re-running an overlapping sweep (e.g. after widening the parts range) would
+otherwise recompute every point. A run's result only depends on its full
+Parameters dict, its random stream (spawn_key), the run mode and the code,
+so the cache key is a SHA-256 over:
+
+- the canonical JSON of params.to_dict() (sorted keys, numpy scalars as Python
+  values), without the UI-only keys in CACHE_EXCLUDED_KEYS
+- spawn_key and fast_mode
+- code_version(): hash of the simulation sources (*.py at the top level and in
+  ds/, plus the figure modules in FIGURE_SOURCES whose PNG bytes full-mode
+  results hold) and the numpy version, so editing the engine or the plots
+  invalidates old entries
+
+Results are pickled into one SQLite table (safe for the parallel worker
+processes). Entries are evicted least recently used once the stored size is
+above max_bytes. Cache errors are treated as misses, so a locked or corrupt
+cache never fails a run.
+"""
+import contextlib
+import functools
+import glob
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sim_cache')
+DEFAULT_MAX_MB = 512
+
+# UI modules that render the figure bytes stored in full-mode results
+FIGURE_SOURCES = ('ui/wip_plots.py', 'ui/dist_plots.py')
+
+# Run settings that do not change a single run's result
+CACHE_EXCLUDED_KEYS = frozenset({
+    'cache_dir', 'cache_max_mb', 'force_recompute', 'record_backend',
+    'n_reps', 'max_reps', 'target_half_width', 'antithetic_pairs',
+})
+
+
+def _source_files(root):
+    """Files hashed by code_version(), sorted."""
+    files = glob.glob(os.path.join(root, '*.py')) + glob.glob(os.path.join(root, 'ds', '*.py'))
+    files += [os.path.join(root, *name.split('/')) for name in FIGURE_SOURCES]
+    return sorted(files)
+
+
+@functools.lru_cache(maxsize=1)
+def code_version():
+    """Hash of the simulation source files and numpy version (computed once per process)."""
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256(np.__version__.encode())
+    for path in _source_files(root):
+        digest.update(os.path.relpath(path, root).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _canonical(value):
+    """json.dumps default: numpy scalars/arrays to Python values, anything else to repr."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return repr(value)
+
+
+def cache_key(params_dict, spawn_key=(), fast_mode=True):
+    """
+    Cache key of one run.
+
+    Args:
+        params_dict: Full parameter dict (Parameters.to_dict())
+        spawn_key: Random stream of the run (make_sim_rng spawn key)
+        fast_mode: run_single_simulation_fast (True) or run_single_simulation (False)
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    payload = {
+        'params': {k: v for k, v in params_dict.items() if k not in CACHE_EXCLUDED_KEYS},
+        'spawn_key': list(spawn_key),
+        'fast_mode': bool(fast_mode),
+        'code_version': code_version(),
+    }
+    text = json.dumps(payload, sort_keys=True, default=_canonical)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    SQLite-backed result store with size-bounded LRU eviction.
+
+    Usage:
+        cache = ResultCache()
+        result = cache.get(key)       # None on a miss
+        cache.put(key, result)
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        """
+        Args:
+            cache_dir: Directory of the results.sqlite file (created if missing)
+            max_bytes: Evict least recently used entries above this stored size
+        """
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, 'results.sqlite')
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)')
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        """
+        Stored result for key (and mark it recently used), or None on a miss.
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute('UPDATE results SET last_access = ? WHERE key = ?', (time.time(), key))
+            return pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError):
+            return None
+
+    def put(self, key, result):
+        """Store a result dict, then evict LRU entries while above max_bytes."""
+        value = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO results (key, value, size, last_access) VALUES (?, ?, ?, ?)',
+                    (key, value, len(value), time.time())
+                )
+                self._evict(conn)
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in conn.execute('SELECT key, size FROM results ORDER BY last_access'):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany('DELETE FROM results WHERE key = ?', stale)
+
+    def stats(self):
+        """
+        Returns:
+            dict: entries, size_bytes
+        """
+        try:
+            with self._connect() as conn:
+                entries, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+            return {'entries': entries, 'size_bytes': size}
+        except sqlite3.Error:
+            return {'entries': 0, 'size_bytes': 0}
+
+    def clear(self):
+        """Delete all entries."""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM results')
+
+
+def open_result_cache(base_params):
+    """
+    ResultCache configured by base_params ('cache_dir', 'cache_max_mb'), or None
+    when caching is off (no 'cache_dir').
+    """
+    cache_dir = base_params.get('cache_dir')
+    if not cache_dir:
+        return None
+    max_mb = base_params.get('cache_max_mb') or DEFAULT_MAX_MB
+    return ResultCache(cache_dir, max_bytes=int(max_mb * 1024 * 1024))
@@ -0,0 +1,329 @@
+"""
+sc_executor.py
+-----------------
+Scenario executor for depot_capacity x n_total_parts sweeps.
+
+Fans the scenario grid out over a ProcessPoolExecutor and streams results back
+in completion order, so the Scenarios page can drive its progress bar and
+terminal display while other cores keep simulating.
+
+Each grid point is self-contained (params are rebuilt and the run gets its own
+random Generator from make_sim_rng), so results match the serial loop for the
+same seed and no global np.random state is shared between runs.
+
+With replications (n_reps > 1 or a target CI half-width) each (point, replication)
+pair is one task; a point's result is yielded once its replications are
+aggregated (see sc_replications.py).
+
+Runs can be served from the on-disk result cache (see sc_cache.py).
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+import numpy as np
+
+from parameters import Parameters
+from sc_utils import run_single_simulation, run_single_simulation_fast
+from sc_cache import cache_key, open_result_cache
+from sc_replications import (additional_replications, aggregate_replications, replication_params,
+                             threshold_replications)
+
+
+def default_worker_count():
+    """Return number of usable CPU cores (at least 1)."""
+    return max(1, os.cpu_count() or 1)
+
+
+def build_loop_values(use_list, value_list, range_min, range_max, range_mode, range_param):
+    """
+    Build list of values based on configuration.
+
+    Args:
+        use_list: Return value_list as is
+        value_list: Explicit values
+        range_min, range_max: Inclusive range
+        range_mode: 'all' (every value), 'interval' (every range_param, max included)
+            or 'count' (range_param evenly spaced values)
+        range_param: Interval or count
+    """
+    if use_list:
+        return value_list
+    
+    if range_mode == 'all':
+        # Every value in range
+        return list(range(range_min, range_max + 1))
+    
+    elif range_mode == 'interval':
+        # Every X interval
+        values = list(range(range_min, range_max + 1, range_param))
+        # Ensure max is included if not already
+        if values[-1] != range_max:
+            values.append(range_max)
+        return values
+    
+    elif range_mode == 'count':
+        # X evenly spaced values
+        if range_param <= 1:
+            return [range_max]
+        return [int(round(v)) for v in np.linspace(range_min, range_max, range_param)]
+    
+    return list(range(range_min, range_max + 1))
+
+
+def build_scenario_grid(depot_values, parts_values):
+    """
+    Build ordered list of (depot_cap, n_parts) grid points.
+
+    Order matches the nested loop used by the serial sweep
+    (depot outer, parts inner), so grid index doubles as result order.
+    """
+    return [(depot_cap, n_parts) for depot_cap in depot_values for n_parts in parts_values]
+
+
+def build_scenario_params(base_params, depot_cap, n_parts):
+    """
+    Build Parameters object for a single grid point.
+
+    Args:
+        base_params: dict of fixed parameters shared by all grid points
+        depot_cap: Depot capacity for this grid point
+        n_parts: Number of total parts for this grid point
+
+    Returns:
+        Parameters: base_params plus depot/parts values and initial allocation
+    """
+    params = Parameters()
+    params.set_all(base_params)
+    params.set('n_total_parts', n_parts)
+    params.set('depot_capacity', depot_cap)
+
+    # Calculate allocation (same rule as render_allocation_inputs defaults)
+    n_aircraft_with_parts = min(n_parts, int(np.ceil(base_params['mission_capable_rate'] * base_params['n_total_aircraft'])))
+    parts_air_dif = n_parts - n_aircraft_with_parts
+    parts_in_depot = min(parts_air_dif, depot_cap)
+    remaining_parts = parts_air_dif - parts_in_depot
+
+    params.set('parts_in_depot', parts_in_depot)
+    params.set('parts_in_cond_f', remaining_parts)
+    params.set('parts_in_cond_a', 0)
+    return params
+
+
+def run_scenario_point(base_params, depot_cap, n_parts, fast_mode, spawn_key=()):
+    """
+    Run one grid point. Module-level so it can be pickled to worker processes.
+
+    Every grid point uses the same random_seed (spawn_key=()) so scenarios are
+    compared on the same random stream, as in the original serial sweep.
+
+    With base_params['cache_dir'] set, results are looked up in / stored to the
+    on-disk ResultCache (sc_cache.py); base_params['force_recompute'] skips the
+    lookup but still stores the new result.
+
+    Returns:
+        dict: run_single_simulation[_fast] result plus depot_capacity/n_total_parts
+              (and 'cache_hit' when the cache is on)
+    """
+    params = build_scenario_params(base_params, depot_cap, n_parts)
+
+    cache = open_result_cache(base_params)
+    result = None
+    if cache is not None:
+        key = cache_key(params.to_dict(), spawn_key, fast_mode)
+        if not base_params.get('force_recompute', False):
+            result = cache.get(key)
+
+    if result is not None:
+        result['cache_hit'] = True
+    else:
+        if fast_mode:
+            result = run_single_simulation_fast(params, depot_cap, n_parts, spawn_key=spawn_key)
+        else:
+            result = run_single_simulation(params, depot_cap, n_parts, spawn_key=spawn_key)
+        if cache is not None:
+            cache.put(key, result)
+            result['cache_hit'] = False
+
+    result['depot_capacity'] = depot_cap
+    result['n_total_parts'] = n_parts
+    return result
+
+
+def run_replication(base_params, depot_cap, n_parts, fast_mode, rep, antithetic=False):
+    """
+    Run replication `rep` of one grid point on random stream (rep,).
+
+    With antithetic pairs, replications 2k and 2k+1 run on stream (k,) with
+    inverse-CDF sampling, the second one on 1 - u.
+    Only replication 0 renders figures; later replications run without plots.
+
+    Returns:
+        dict: run_scenario_point result tagged with 'replication'
+    """
+    spawn_key, overrides = replication_params(rep, antithetic)
+    if overrides:
+        base_params = dict(base_params, **overrides)
+    if rep > 0 and not fast_mode:
+        base_params = dict(base_params, render_plots=False)
+        fast_mode = True
+    result = run_scenario_point(base_params, depot_cap, n_parts, fast_mode, spawn_key=spawn_key)
+    result['replication'] = rep
+    return result
+
+
+def iter_scenario_results(base_params, depot_values, parts_values, fast_mode, max_workers=1, **replication):
+    """
+    Run every depot_values x parts_values grid point and yield results as they complete.
+
+    See iter_point_results() for max_workers and the replication options.
+
+    Yields:
+        tuple: (grid_index, depot_cap, n_parts, result, error)
+               result is None and error is the raised exception on failure
+    """
+    grid = build_scenario_grid(depot_values, parts_values)
+    yield from iter_point_results(base_params, grid, fast_mode, max_workers=max_workers, **replication)
+
+
+def iter_point_results(base_params, points, fast_mode, max_workers=1,
+                       n_reps=1, max_reps=None, target_half_width=None, ci_metric='avg_micap',
+                       antithetic=False, ci_threshold=None):
+    """
+    Run a list of (depot_cap, n_parts) points and yield results as they complete.
+
+    With max_workers <= 1 (or a single point) the points run serially in this process (list order).
+    Otherwise points are submitted to a ProcessPoolExecutor and yielded in
+    completion order.
+
+    Args:
+        base_params: dict of fixed parameters (must include 'random_seed')
+        points: list of (depot_cap, n_parts), e.g. build_scenario_grid()
+        fast_mode: If True use run_single_simulation_fast (no figures)
+        max_workers: Number of worker processes
+        n_reps: Replications per point (1 = single run on the plain seeded stream)
+        max_reps: Replication cap for sequential stopping (defaults to n_reps)
+        target_half_width: Keep replicating a point while the 95% CI half-width of
+            ci_metric is above this (None = exactly n_reps replications)
+        ci_metric: Metric checked by the stopping rule
+        antithetic: Run replications as antithetic pairs (n_reps/max_reps rounded up to even)
+        ci_threshold: Instead of a half-width target, keep replicating (doubling, up to
+            max_reps) while the 95% CI of ci_metric contains this value
+
+    Yields:
+        tuple: (index in points, depot_cap, n_parts, result, error)
+               result is None and error is the raised exception on failure
+    """
+    max_reps = max(max_reps or n_reps, n_reps)
+    if n_reps > 1 or max_reps > n_reps or target_half_width is not None or antithetic:
+        if antithetic:
+            n_reps, max_reps = n_reps + n_reps % 2, max_reps + max_reps % 2
+        yield from _iter_replicated_results(
+            base_params, points, fast_mode, max_workers,
+            n_reps, max_reps, target_half_width, ci_metric, antithetic, ci_threshold)
+        return
+
+    grid = list(points)
+
+    if max_workers <= 1 or len(grid) <= 1:
+        for grid_index, (depot_cap, n_parts) in enumerate(grid):
+            try:
+                result = run_scenario_point(base_params, depot_cap, n_parts, fast_mode)
+                yield grid_index, depot_cap, n_parts, result, None
+            except Exception as e:
+                yield grid_index, depot_cap, n_parts, None, e
+        return
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(grid))) as pool:
+        futures = {
+            pool.submit(run_scenario_point, base_params, depot_cap, n_parts, fast_mode): (grid_index, depot_cap, n_parts)
+            for grid_index, (depot_cap, n_parts) in enumerate(grid)
+        }
+        for future in as_completed(futures):
+            grid_index, depot_cap, n_parts = futures[future]
+            try:
+                yield grid_index, depot_cap, n_parts, future.result(), None
+            except Exception as e:
+                yield grid_index, depot_cap, n_parts, None, e
+
+
+def _iter_replicated_results(base_params, points, fast_mode, max_workers,
+                             n_reps, max_reps, target_half_width, ci_metric, antithetic=False,
+                             ci_threshold=None):
+    """
+    Replicated version of iter_point_results.
+
+    Each point first runs n_reps replications. When a batch is complete,
+    additional_replications() (or threshold_replications() with ci_threshold)
+    decides the next batch from the finished replications only, so the
+    replications run (and the aggregated result) do not depend on worker
+    count or completion order.
+    """
+    grid = list(points)
+
+    def next_batch(results):
+        values = [r[ci_metric] for r in results]
+        if ci_threshold is not None:
+            return threshold_replications(values, ci_threshold, max_reps, antithetic=antithetic)
+        return additional_replications(values, target_half_width, max_reps, antithetic=antithetic)
+
+    if max_workers <= 1:
+        for grid_index, (depot_cap, n_parts) in enumerate(grid):
+            try:
+                results = []
+                batch = n_reps
+                while batch:
+                    for rep in range(len(results), len(results) + batch):
+                        results.append(run_replication(base_params, depot_cap, n_parts, fast_mode, rep, antithetic))
+                    batch = next_batch(results)
+                yield grid_index, depot_cap, n_parts, aggregate_replications(results, antithetic=antithetic), None
+            except Exception as e:
+                yield grid_index, depot_cap, n_parts, None, e
+        return
+    if not grid:
+        return
+
+    results = {grid_index: [] for grid_index in range(len(grid))}
+    submitted = dict.fromkeys(results, 0)
+    failed = set()
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(grid) * n_reps)) as pool:
+        def submit(grid_index, batch):
+            depot_cap, n_parts = grid[grid_index]
+            for rep in range(submitted[grid_index], submitted[grid_index] + batch):
+                future = pool.submit(run_replication, base_params, depot_cap, n_parts, fast_mode, rep, antithetic)
+                pending[future] = grid_index
+            submitted[grid_index] += batch
+
+        pending = {}
+        for grid_index in results:
+            submit(grid_index, n_reps)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                grid_index = pending.pop(future)
+                if grid_index in failed:
+                    continue
+                depot_cap, n_parts = grid[grid_index]
+                try:
+                    results[grid_index].append(future.result())
+                except Exception as e:
+                    failed.add(grid_index)
+                    yield grid_index, depot_cap, n_parts, None, e
+                    continue
+                if len(results[grid_index]) < submitted[grid_index]:
+                    continue  # batch still running
+                batch = next_batch(sorted(results[grid_index], key=lambda r: r['replication']))
+                if batch:
+                    submit(grid_index, batch)
+                else:
+                    yield grid_index, depot_cap, n_parts, aggregate_replications(results.pop(grid_index), antithetic=antithetic), None
+
+
+def order_results(results_by_index):
+    """
+    Return results as list in grid order.
+
+    Args:
+        results_by_index: dict {grid_index: result} filled in completion order
+    """
+    return [results_by_index[i] for i in sorted(results_by_index)]
@@ -0,0 +1,171 @@
+"""
+sc_optimizer.py
+-----------------
+Adaptive search over depot_capacity x n_total_parts for a MICAP target.
+
+A full grid sweep evaluates every (depot, parts) point. The search here uses
+that avg_micap is (up to noise) non-increasing in both n_total_parts and
+depot_capacity:
+
+- Bisection: for every depot level, binary search the smallest n_total_parts
+  in [parts_min, parts_max] with avg_micap <= micap_target.
+- All depot levels bisect together in rounds; each round's midpoints run in
+  parallel through sc_executor.iter_point_results (fast mode, so
+  run_single_simulation_fast).
+- Bounds are shared between depot levels after every round: a feasible
+  (depot, parts) makes `parts` an upper bound for every larger depot, an
+  infeasible one makes `parts + 1` a lower bound for every smaller depot.
+  An answer inherited this way is run at its own depot before it is reported;
+  if it misses the target, that depot resumes bisection above it.
+- Ranking and selection: with replications, a point whose 95% CI still
+  contains the target gets more replications (doubling up to max_reps,
+  sc_replications.threshold_replications) before it is classified. Among the
+  per-depot minimal configurations the cheapest (depot_cost * depot +
+  part_cost * parts) is selected.
+
+The result also has the Pareto frontier of all evaluated points on
+(depot_capacity, n_total_parts, avg_micap), all minimized.
+"""
+import pandas as pd
+
+from sc_executor import iter_point_results
+
+
+def pareto_frontier(df, columns=('depot_capacity', 'n_total_parts', 'avg_micap')):
+    """
+    Rows of df not dominated on `columns` (all minimized).
+
+    A row is dominated if another row is <= on every column and < on at least one.
+
+    Returns:
+        pd.DataFrame: Frontier rows sorted by the columns
+    """
+    values = df[list(columns)].to_numpy(dtype=float)
+    keep = []
+    for i, row in enumerate(values):
+        dominated = ((values <= row).all(axis=1) & (values < row).any(axis=1)).any()
+        if not dominated:
+            keep.append(i)
+    return df.iloc[keep].sort_values(list(columns)).reset_index(drop=True)
+
+
+def search_min_parts(base_params, depot_values, parts_min, parts_max, micap_target,
+                     max_workers=1, n_reps=1, max_reps=None, antithetic=False,
+                     depot_cost=1.0, part_cost=1.0, progress=None):
+    """
+    Find the smallest n_total_parts meeting micap_target for every depot level.
+
+    Args:
+        base_params: dict of fixed parameters (same as the grid sweep)
+        depot_values: list of depot capacities to search
+        parts_min, parts_max: n_total_parts search range (inclusive)
+        micap_target: Feasible when avg_micap <= micap_target
+        max_workers: Number of worker processes
+        n_reps: Replications per evaluated point
+        max_reps: Replication cap for points whose CI contains the target
+            (defaults to n_reps: no extra replications)
+        antithetic: Run replications as antithetic pairs
+        depot_cost, part_cost: Cost weights used to select the best configuration
+        progress: Optional callback(round_index, n_evaluations, result_row)
+            called after each evaluated point
+
+    Returns:
+        dict with:
+            'evaluations': DataFrame of every evaluated point (plus 'feasible', 'round')
+            'min_parts': {depot: smallest feasible n_total_parts or None}
+            'candidates': DataFrame of per-depot minimal configurations with 'cost'
+            'best': row (dict) of the cheapest candidate, or None if none is feasible
+            'frontier': Pareto frontier DataFrame of the evaluations
+            'errors': list of (depot, parts, exception)
+    """
+    depots = sorted(set(depot_values))
+    # Search state per depot: smallest feasible parts lies in [lo, hi]; hi = parts_max + 1 means none found yet
+    lo = {depot: parts_min for depot in depots}
+    hi = {depot: parts_max + 1 for depot in depots}
+    evaluated = {}
+    errors = []
+    round_index = 0
+
+    while True:
+        # Share bounds across depot levels (monotone in depot capacity). An upper
+        # bound below a depot's own lower bound was refuted by that depot's runs
+        # (noise breaks monotonicity) and is not inherited.
+        for i, depot in enumerate(depots):
+            hi[depot] = min([hi[depot]] + [hi[d] for d in depots[:i] if hi[d] >= lo[depot]])
+        for i, depot in reversed(list(enumerate(depots))):
+            lo[depot] = max([lo[depot]] + [lo[d] for d in depots[i + 1:]])
+        for depot in depots:
+            if lo[depot] >= hi[depot] and (depot, hi[depot]) in evaluated:
+                result = evaluated[(depot, hi[depot])]
+                if result is None or not result['feasible']:
+                    # Inherited answer failed its own run: resume bisection above it
+                    lo[depot] = hi[depot] + 1
+                    hi[depot] = parts_max + 1
+
+        # Bisection midpoints, and answers inherited from another depot that this depot has not run
+        points = []
+        for depot in depots:
+            if lo[depot] < hi[depot]:
+                point = (depot, (lo[depot] + hi[depot]) // 2)
+            elif hi[depot] <= parts_max:
+                point = (depot, hi[depot])
+            else:
+                continue
+            if point not in evaluated:
+                points.append(point)
+        if not points and all(lo[d] >= hi[d] for d in depots):
+            break
+
+        results = iter_point_results(
+            base_params, points, fast_mode=True, max_workers=max_workers,
+            n_reps=n_reps, max_reps=max_reps, antithetic=antithetic,
+            ci_threshold=micap_target)
+        for _, depot, n_parts, result, error in results:
+            if error is not None:
+                errors.append((depot, n_parts, error))
+                result = None
+            else:
+                result = dict(result, feasible=bool(result['avg_micap'] <= micap_target), round=round_index)
+            evaluated[(depot, n_parts)] = result
+            if progress is not None and result is not None:
+                progress(round_index, len(evaluated), result)
+
+        # Bisection step for every depot whose midpoint is now known
+        for depot in depots:
+            if lo[depot] >= hi[depot]:
+                continue
+            mid = (lo[depot] + hi[depot]) // 2
+            result = evaluated.get((depot, mid))
+            if result is None:
+                # Failed run: treat as infeasible so the search still terminates
+                lo[depot] = mid + 1
+            elif result['feasible']:
+                hi[depot] = mid
+            else:
+                lo[depot] = mid + 1
+        round_index += 1
+
+    # Every reported answer was run at its own depot and met the target
+    min_parts = {depot: (hi[depot] if hi[depot] <= parts_max else None) for depot in depots}
+
+    rows = [r for r in evaluated.values() if r is not None]
+    evaluations = pd.DataFrame(rows)
+
+    candidates = []
+    for depot, n_parts in min_parts.items():
+        result = evaluated.get((depot, n_parts)) if n_parts is not None else None
+        if result is not None:
+            candidates.append(dict(result, cost=depot_cost * depot + part_cost * n_parts))
+    candidates_df = pd.DataFrame(candidates)
+    best = None
+    if candidates:
+        best = min(candidates, key=lambda r: (r['cost'], r['avg_micap']))
+
+    return {
+        'evaluations': evaluations,
+        'min_parts': min_parts,
+        'candidates': candidates_df,
+        'best': best,
+        'frontier': pareto_frontier(evaluations) if len(evaluations) else evaluations,
+        'errors': errors,
+    }
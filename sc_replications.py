@@ -0,0 +1,173 @@
+"""
+sc_replications.py
+-----------------
+Independent replications for scenario grid points.
+
+A single run per (depot_capacity, n_total_parts) point is one sample of a
+stochastic output, so the lowest avg_micap in a sweep can be noise. With
+replications each point runs R times on independent random streams
+(make_sim_rng(random_seed, rep)) and reports, for every metric, the mean over
+replications with its standard error and a Student-t confidence interval.
+
+Sequential stopping: after each batch, a point gets more replications only
+while the CI half-width of ci_metric is above target_half_width (and fewer
+than max_reps have run). The next batch size is the usual estimate of the
+replications needed, n ~ (t * s / target)^2.
+
+Replication r uses spawn key (r,) at every grid point, so points are still
+compared on common random streams.
+
+Antithetic pairs: replications 2k and 2k+1 share spawn key (k,) and the
+second run uses 1 - u for every stage duration draw (params['antithetic']).
+The two runs are averaged first; mean, se and CI are computed over the
+independent pair means, and the stopping rule adds whole pairs.
+"""
+import math
+
+import numpy as np
+
+# Per-run averages that get mean / se / CI columns
+REPLICATION_METRICS = ('avg_micap', 'avg_fleet', 'avg_cd_f', 'avg_depot', 'avg_cd_a')
+
+
+def _t_ppf(q, df):
+    """Student t quantile (scipy is imported on first use, not by worker processes)."""
+    from scipy import stats
+    return stats.t.ppf(q, df)
+
+
+def confidence_interval(values, confidence=0.95):
+    """
+    Mean, standard error and Student-t confidence interval of replication values.
+
+    Args:
+        values: Sequence of per-replication values
+        confidence: Two-sided confidence level
+
+    Returns:
+        dict: mean, se, half_width, low, high (se/half_width/low/high are NaN for fewer than 2 values)
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    mean = float(values.mean()) if n else np.nan
+    if n < 2:
+        return {'mean': mean, 'se': np.nan, 'half_width': np.nan, 'low': np.nan, 'high': np.nan}
+    se = float(values.std(ddof=1) / math.sqrt(n))
+    half_width = float(_t_ppf(0.5 + confidence / 2, n - 1) * se)
+    return {'mean': mean, 'se': se, 'half_width': half_width,
+            'low': mean - half_width, 'high': mean + half_width}
+
+
+def pair_means(values):
+    """Average antithetic pairs: replications (2k, 2k+1) -> one value per pair."""
+    return np.asarray(values, dtype=float).reshape(-1, 2).mean(axis=1)
+
+
+def replication_params(rep, antithetic=False):
+    """
+    Random stream and sampling params of replication `rep`.
+
+    Returns:
+        tuple: (spawn_key, param overrides)
+    """
+    if antithetic:
+        return (rep // 2,), {'inverse_cdf': True, 'antithetic': rep % 2 == 1}
+    return (rep,), {}
+
+
+def additional_replications(values, target_half_width, max_reps, confidence=0.95, antithetic=False):
+    """
+    Number of further replications a point needs (sequential stopping rule).
+
+    Args:
+        values: ci_metric values of the replications run so far
+        target_half_width: Stop once the CI half-width is at or below this (None = fixed R)
+        max_reps: Upper bound on total replications
+        confidence: Two-sided confidence level
+        antithetic: values are antithetic pairs (CI over pair means, batches of whole pairs)
+
+    Returns:
+        int: 0 when the point is done, else the size of the next batch
+    """
+    if antithetic:
+        return 2 * additional_replications(pair_means(values), target_half_width, max_reps // 2, confidence)
+    n = len(values)
+    if target_half_width is None or n >= max_reps:
+        return 0
+    if n < 2:
+        return min(2, max_reps) - n
+    ci = confidence_interval(values, confidence)
+    if not ci['half_width'] > target_half_width:  # also stops on NaN metrics
+        return 0
+    # Replications needed for the target with the current variance estimate
+    t_value = _t_ppf(0.5 + confidence / 2, n - 1)
+    std = ci['se'] * math.sqrt(n)
+    needed = math.ceil((t_value * std / target_half_width) ** 2)
+    return int(min(max(needed - n, 1), max_reps - n))
+
+
+def threshold_replications(values, threshold, max_reps, confidence=0.95, antithetic=False):
+    """
+    Number of further replications needed to place a point on one side of a
+    threshold (ranking-and-selection step of sc_optimizer).
+
+    Replications double while the CI still contains the threshold.
+
+    Args:
+        values: Metric values of the replications run so far
+        threshold: Value the point is compared against (e.g. MICAP target)
+        max_reps: Upper bound on total replications
+        confidence: Two-sided confidence level
+        antithetic: values are antithetic pairs
+
+    Returns:
+        int: 0 when the comparison is decided (or max_reps reached), else the next batch size
+    """
+    if antithetic:
+        return 2 * threshold_replications(pair_means(values), threshold, max_reps // 2, confidence)
+    n = len(values)
+    if n >= max_reps:
+        return 0
+    if n < 2:
+        return min(2, max_reps) - n
+    ci = confidence_interval(values, confidence)
+    if not ci['low'] <= threshold <= ci['high']:  # decided (or NaN)
+        return 0
+    return min(n, max_reps - n)
+
+
+def aggregate_replications(results, confidence=0.95, antithetic=False):
+    """
+    Combine the replication results of one grid point into one result row.
+
+    Metric columns hold the mean over replications; each metric gets
+    <metric>_se, <metric>_ci_low, <metric>_ci_high and <metric>_ci_half columns.
+    Figures (full mode) come from replication 0.
+
+    Args:
+        results: list of run_scenario_point results tagged with 'replication'
+        confidence: Two-sided confidence level
+        antithetic: Average antithetic pairs before the CI (adds n_pairs)
+
+    Returns:
+        dict: Aggregated result with n_reps and summed total_events
+    """
+    results = sorted(results, key=lambda r: r['replication'])
+    aggregated = dict(results[0])
+    aggregated.pop('replication')
+    for metric in REPLICATION_METRICS:
+        values = [r[metric] for r in results]
+        ci = confidence_interval(pair_means(values) if antithetic else values, confidence)
+        aggregated[metric] = ci['mean']
+        aggregated[f'{metric}_se'] = ci['se']
+        aggregated[f'{metric}_ci_low'] = ci['low']
+        aggregated[f'{metric}_ci_high'] = ci['high']
+        aggregated[f'{metric}_ci_half'] = ci['half_width']
+    aggregated['count'] = float(np.mean([r['count'] for r in results]))
+    aggregated['total_events'] = sum(r.get('total_events', 0) for r in results)
+    aggregated['n_reps'] = len(results)
+    if 'cache_hit' in aggregated:
+        aggregated['cache_hit'] = all(r['cache_hit'] for r in results)
+    if antithetic:
+        aggregated['n_pairs'] = len(results) // 2
+    return aggregated
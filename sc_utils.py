@@ -6,12 +6,18 @@ Utility functions for multi-run simulations.
 Contains helper functions for running simulations, generating analysis text,
 and handling figure conversions.
 """
-import matplotlib.pyplot as plt
+from collections import OrderedDict
 from io import BytesIO
 from datetime import datetime
 
+from parameters import Parameters
 from simulation_engine import SimulationEngine
-from utils import calculate_initial_allocation
+from allocation import calculate_initial_allocation, make_sim_rng
+
+# Params a warm-start fork sets for its continuation; the shared warm-up ignores them
+WARM_START_FORK_PARAMS = ('render_plots', 'use_percentage_plots', 'inverse_cdf', 'antithetic')
+WARMUP_SNAPSHOT_CACHE_SIZE = 8
+_warmup_snapshots = OrderedDict()  # per-process LRU: params key -> warm-up snapshot bytes
 
 
 def fig_to_bytes(fig):
@@ -26,18 +32,17 @@ def get_multi_wip_figs_as_bytes(post_sim, depot_cap, n_parts):
     """
     Get the WIP figures needed for multi-model results as PNG bytes.
     
-    Converts figures to bytes immediately and closes them to prevent
-    memory accumulation across multiple simulation runs.
+    PostSim renders only these figures (titled with the scenario point) and
+    closes them right away, so nothing accumulates across runs.
     
     Args:
-        post_sim: PostSim object with pre-rendered figures
+        post_sim: PostSim object of the run
         depot_cap: Depot capacity for title
         n_parts: Number of parts for title
         
     Returns:
         dict: Selected figures as PNG bytes for multi-model time series tab
     """
-    wip_figs = post_sim.wip_figs
     result = {}
     
     # Keys to extract (add more here to include additional plots)
@@ -48,27 +53,61 @@ def get_multi_wip_figs_as_bytes(post_sim, depot_cap, n_parts):
         # 'fleet',
         # 'condition_f',
         # 'condition_a',
-        # 'wip_overview',
     ]
     
     for key in keys_to_extract:
-        fig = wip_figs.get(key)
-        if fig is not None:
-            # Update title to show which simulation
-            if fig.axes:
-                display_name = key.replace('_', ' ').title()
-                fig.axes[0].set_title(f"{display_name} Over Time (Depot={depot_cap}, Parts={n_parts})")
-            # Convert to bytes
-            result[key] = fig_to_bytes(fig)
-            # Close figure immediately to free memory
-            plt.close(fig)
-        else:
-            result[key] = None
+        # Title shows which simulation
+        display_name = key.replace('_', ' ').title()
+        result[key] = post_sim.get_wip_fig(
+            key, title=f"{display_name} Over Time (Depot={depot_cap}, Parts={n_parts})")
     
     return result
 
 
-def run_single_simulation(params, depot_cap, n_parts):
+def warmup_snapshot(params):
+    """
+    Warm-up snapshot of params on the plain seeded stream (spawn key ()),
+    memoized per process so every replication of a point runs warm-up once.
+    """
+    base = {k: v for k, v in params.to_dict().items() if k not in WARM_START_FORK_PARAMS}
+    key = repr(sorted(base.items()))
+    snapshot = _warmup_snapshots.get(key)
+    if snapshot is None:
+        base_params = Parameters()
+        base_params.set_all(base)
+        rng = make_sim_rng(base_params['random_seed'])
+        allocation = calculate_initial_allocation(base_params, rng=rng)
+        snapshot = SimulationEngine(params=base_params, allocation=allocation, rng=rng).warmup_snapshot()
+        _warmup_snapshots[key] = snapshot
+        if len(_warmup_snapshots) > WARMUP_SNAPSHOT_CACHE_SIZE:
+            _warmup_snapshots.popitem(last=False)
+    else:
+        _warmup_snapshots.move_to_end(key)
+    return snapshot
+
+
+def build_engine(params, spawn_key=()):
+    """
+    SimulationEngine for one run on random stream spawn_key.
+
+    With params['warm_start'] and a replication stream (non-empty spawn_key) the
+    engine is forked from the shared warm-up snapshot: warm-up runs once on the
+    plain seeded stream and only the post-warm-up events use the replication stream.
+    """
+    if params.get('warm_start', False) and spawn_key:
+        overrides = {k: params[k] for k in WARM_START_FORK_PARAMS if k in params.keys()}
+        rng = make_sim_rng(params['random_seed'], *spawn_key)
+        return SimulationEngine.fork(warmup_snapshot(params), rng=rng, param_overrides=overrides)
+    rng = make_sim_rng(params['random_seed'], *spawn_key)
+    allocation = calculate_initial_allocation(params, rng=rng)
+    return SimulationEngine(
+        params=params,
+        allocation=allocation,
+        rng=rng
+    )
+
+
+def run_single_simulation(params, depot_cap, n_parts, spawn_key=()):
     """
     Run a single simulation and return results.
     
@@ -76,30 +115,18 @@ def run_single_simulation(params, depot_cap, n_parts):
         params: Parameters object with all simulation settings
         depot_cap: Depot capacity value (for plot titles)
         n_parts: Number of parts value (for plot titles)
+        spawn_key: tuple passed to make_sim_rng to select this run's random stream
         
     Returns:
-        dict: Results including averages for all metrics and pre-rendered figure bytes
+        dict: Results including averages for all metrics and rendered figure bytes
     """
-    allocation = calculate_initial_allocation(params)
-
-    sim_engine = SimulationEngine(
-        params=params,
-        allocation=allocation
-    )
+    sim_engine = build_engine(params, spawn_key)
     validation_results = sim_engine.run()
 
-    # Get pre-rendered figures from PostSim as bytes (closes figs immediately)
+    # Render only the multi-model figures, as PNG bytes
     post_sim = validation_results['post_sim']
     multi_figs_bytes = get_multi_wip_figs_as_bytes(post_sim, depot_cap, n_parts)
 
-    # Close remaining PostSim figures we don't need for multi-model
-    for key, fig in post_sim.wip_figs.items():
-        if fig is not None:
-            plt.close(fig)
-    for key, fig in post_sim.dist_figs.items():
-        if fig is not None:
-            plt.close(fig)
-
     # Use multi_run_averages from PostSim (pre-computed)
     averages = post_sim.multi_run_averages
     
@@ -114,14 +141,14 @@ def run_single_simulation(params, depot_cap, n_parts):
         'avg_depot': averages['avg_depot'],
         'avg_cd_a': averages['avg_cd_a'],
         'count': averages['count'],
-        # Pre-rendered figures as PNG bytes (memory efficient)
+        # Rendered figures as PNG bytes (memory efficient)
         'wip_figs_bytes': multi_figs_bytes,
         # Event counts for cumulative tracking
         'total_events': total_events,
     }
 
 
-def run_single_simulation_fast(params, depot_cap, n_parts):
+def run_single_simulation_fast(params, depot_cap, n_parts, spawn_key=()):
     """
     Run a single simulation WITHOUT figure generation for maximum speed.
     
@@ -132,16 +159,12 @@ def run_single_simulation_fast(params, depot_cap, n_parts):
         params: Parameters object with all simulation settings
         depot_cap: Depot capacity value
         n_parts: Number of parts value
+        spawn_key: tuple passed to make_sim_rng to select this run's random stream
         
     Returns:
         dict: Results including averages for all metrics (no figures)
     """
-    allocation = calculate_initial_allocation(params)
-
-    sim_engine = SimulationEngine(
-        params=params,
-        allocation=allocation
-    )
+    sim_engine = build_engine(params, spawn_key)
     validation_results = sim_engine.run()
 
     # Get PostSim for averages only - no figure processing
@@ -167,6 +190,13 @@ def run_single_simulation_fast(params, depot_cap, n_parts):
     }
 
 
+def _ci_text(row):
+    """' ± half-width (R=n)' for replicated results, '' for single runs."""
+    if 'avg_micap_ci_half' not in row:
+        return ""
+    return f" ± {row['avg_micap_ci_half']:.2f} (R={int(row['n_reps'])})"
+
+
 def generate_analysis_text(df, best_results, best_by_parts, params_dict, depot_values, parts_values):
     """Generate the analysis text file content similar to _forloop3.py output."""
     lines = []
@@ -198,6 +228,17 @@ def generate_analysis_text(df, best_results, best_by_parts, params_dict, depot_v
     lines.append(f"condemn_cycle = {params_dict['condemn_cycle']}")
     lines.append(f"condemn_depot_fraction = {params_dict['condemn_depot_fraction']}")
     lines.append(f"random_seed = {params_dict['random_seed']}")
+    if params_dict.get('common_random_numbers'):
+        lines.append("common_random_numbers = True")
+    if 'n_reps' in df.columns:
+        lines.append(f"replications = {params_dict['n_reps']}"
+                     + (f" (sequential stopping: MICAP 95% CI half-width <= {params_dict['target_half_width']}, "
+                        f"max {params_dict['max_reps']})" if params_dict.get('target_half_width') is not None else ""))
+        if params_dict.get('antithetic_pairs'):
+            lines.append("antithetic pairs: CI computed over pair means (second run of each pair uses 1 - u)")
+        if params_dict.get('warm_start'):
+            lines.append("warm-start: replications share one warm-up run; CI covers post-warm-up variability only")
+        lines.append("Metrics are means over replications; ± is the 95% CI half-width.")
     lines.append("")
     
     # Summary: Best for each depot_capacity
@@ -210,7 +251,7 @@ def generate_analysis_text(df, best_results, best_by_parts, params_dict, depot_v
         row = best_results[depot_cap]
         lines.append(f"depot_capacity = {depot_cap}")
         lines.append(f"  ★ Best: n_total_parts = {row['n_total_parts']}")
-        lines.append(f"    Avg MICAP = {row['avg_micap']:.2f}")
+        lines.append(f"    Avg MICAP = {row['avg_micap']:.2f}{_ci_text(row)}")
         lines.append(f"    Avg Fleet = {row['avg_fleet']:.2f}")
         lines.append(f"    Avg Cd_F = {row['avg_cd_f']:.2f}")
         lines.append(f"    Avg Depot = {row['avg_depot']:.2f}")
@@ -251,7 +292,7 @@ def generate_analysis_text(df, best_results, best_by_parts, params_dict, depot_v
         row = best_by_parts[n_parts]
         lines.append(f"n_total_parts = {n_parts}")
         lines.append(f"  ★ Best: depot_capacity = {row['depot_capacity']}")
-        lines.append(f"    Avg MICAP = {row['avg_micap']:.2f}")
+        lines.append(f"    Avg MICAP = {row['avg_micap']:.2f}{_ci_text(row)}")
         lines.append(f"    Avg Fleet = {row['avg_fleet']:.2f}")
         lines.append(f"    Avg Cd_F = {row['avg_cd_f']:.2f}")
         lines.append(f"    Avg Depot = {row['avg_depot']:.2f}")
@@ -289,7 +330,7 @@ def generate_analysis_text(df, best_results, best_by_parts, params_dict, depot_v
     lines.append(f"★★★ ABSOLUTE BEST across all {len(df)} simulations:")
     lines.append(f"    depot_capacity = {int(best_overall['depot_capacity'])}")
     lines.append(f"    n_total_parts = {int(best_overall['n_total_parts'])}")
-    lines.append(f"    Avg MICAP = {best_overall['avg_micap']:.2f}")
+    lines.append(f"    Avg MICAP = {best_overall['avg_micap']:.2f}{_ci_text(best_overall)}")
     lines.append(f"    Avg Fleet = {best_overall['avg_fleet']:.2f}")
     lines.append(f"    Avg Cd_F = {best_overall['avg_cd_f']:.2f}")
     lines.append(f"    Avg Depot = {best_overall['avg_depot']:.2f}")
@@ -10,6 +10,8 @@ Keeps track of:
 This fixes the bug where changing sidebar params after a run
 would not update until a full restart.
 """
+import uuid
+
 import streamlit as st
 from typing import Dict, Any, Optional
 
@@ -43,7 +45,8 @@ class SessionStateManager:
                 'datasets': None,
                 'validation_results': None,
                 'allocation': None,
-                'post_sim': None
+                'post_sim': None,
+                'run_id': None
             }
     
     def has_run(self) -> bool:
@@ -67,7 +70,9 @@ class SessionStateManager:
             'datasets': datasets,
             'validation_results': validation_results,
             'allocation': allocation,
-            'post_sim': validation_results.get('post_sim')
+            'post_sim': validation_results.get('post_sim'),
+            # Cache key of per-run derived data (e.g. download files)
+            'run_id': uuid.uuid4().hex
         }
     
     def get_run(self) -> Dict[str, Any]:
@@ -76,7 +81,7 @@ class SessionStateManager:
         
         Returns:
             Dictionary with keys: has_run, params, datasets, 
-            validation_results, allocation
+            validation_results, allocation, post_sim, run_id
         """
         return st.session_state.run_data
     
@@ -100,6 +105,10 @@ class SessionStateManager:
         """Get just the post_sim from the stored run."""
         return st.session_state.run_data.get('post_sim')
     
+    def get_run_id(self) -> Optional[str]:
+        """Get the unique id of the stored run (new on every store_run)."""
+        return st.session_state.run_data.get('run_id')
+    
     def clear_run(self) -> None:
         """Clear all stored run data (reset to initial state)."""
         st.session_state.run_data = {
@@ -108,5 +117,6 @@ class SessionStateManager:
             'datasets': None,
             'validation_results': None,
             'allocation': None,
-            'post_sim': None
+            'post_sim': None,
+            'run_id': None
         }
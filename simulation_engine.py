@@ -3,34 +3,89 @@ Simulation Engine for DES Simulation
 Handles simulation logic, formulas, and event processing.
 """
 
+import gzip
+import heapq
+import os
+import pickle
+from contextlib import nullcontext
+
 import numpy as np
-from scipy.special import gamma
 import pandas as pd
-import heapq
 
 try:
     # Try relative imports first (when used as module)
     from .initialization import Initialization
     from .ph_micap import MicapState
-    from .entity_part import PartManager
-    from .entity_ac import AircraftManager
+    from .entity_part import PartManager, ColumnarPartManager
+    from .entity_ac import AircraftManager, ColumnarAircraftManager
     from .ph_cda import ConditionAState
     from .ph_new_part import NewPart
     from .ds.data_science import DataSets
+    from .ds.streaming import (WipTracker, CycleStats, PART_DURATION_FIELDS, AC_DURATION_FIELDS,
+                               PART_START_FIELDS, AC_START_FIELDS)
+    from .ds.helpers import PART_WIP_FIELDS, AC_WIP_FIELDS
     from .post_sim import PostSim
+    from .duration_sampler import FORK_STAGE_STREAM, StageSamplers, child_seed_seq
+    from .parameters import Parameters
+    from .event_types import (DEPOT_COMPLETE, FLEET_COMPLETE, NEW_PART_ARRIVES, CF_DE, PART_FLEET_END,
+                              PART_CONDEMN, EVENT_TYPE_NAMES, N_EVENT_TYPES, event_counts_dict)
+    from .event_path import EventCode, append_event, encode_path, decode_path
+    from .engine_profiler import EngineProfiler
 except ImportError:
     # Fall back to absolute imports (when run directly)
     from initialization import Initialization
     from ph_micap import MicapState
-    from entity_part import PartManager
-    from entity_ac import AircraftManager
+    from entity_part import PartManager, ColumnarPartManager
+    from entity_ac import AircraftManager, ColumnarAircraftManager
     from ph_cda import ConditionAState
     from ph_new_part import NewPart
     from ds.data_science import DataSets
+    from ds.streaming import (WipTracker, CycleStats, PART_DURATION_FIELDS, AC_DURATION_FIELDS,
+                              PART_START_FIELDS, AC_START_FIELDS)
+    from ds.helpers import PART_WIP_FIELDS, AC_WIP_FIELDS
     from post_sim import PostSim
+    from duration_sampler import FORK_STAGE_STREAM, StageSamplers, child_seed_seq
+    from parameters import Parameters
+    from event_types import (DEPOT_COMPLETE, FLEET_COMPLETE, NEW_PART_ARRIVES, CF_DE, PART_FLEET_END,
+                             PART_CONDEMN, EVENT_TYPE_NAMES, N_EVENT_TYPES, event_counts_dict)
+    from event_path import EventCode, append_event, encode_path, decode_path
+    from engine_profiler import EngineProfiler
+
+# Encoded initial-condition paths of parts scheduled for CF_DE
+PATH_IC_IJCF = encode_path('IC_IjCF')
+PATH_IC_IZ_FE_CF = encode_path('IC_IZ_FS_FE', 'IC_FE_CF')
+
+# Transition codes as plain ints (an EventCode attribute lookup on every
+# transition is measurable in the handlers)
+CODE_CFS_CFE = EventCode.CFS_CFE.value
+CODE_DS_DE_CONDEMN = EventCode.DS_DE_CONDEMN.value
+CODE_DS_DE = EventCode.DS_DE.value
+CODE_DE_CA = EventCode.DE_CA.value
+CODE_DE_DMR_IE = EventCode.DE_DMR_IE.value
+CODE_ME_DMR_IE = EventCode.ME_DMR_IE.value
+CODE_DMR_CR_FS_FE = EventCode.DMR_CR_FS_FE.value
+CODE_CAE_IE = EventCode.CAE_IE.value
+CODE_FE_IE = EventCode.FE_IE.value
+CODE_CAP_CR_FS_FE = EventCode.CAP_CR_FS_FE.value
+CODE_FE_MS = EventCode.FE_MS.value
+CODE_NP_CA = EventCode.NP_CA.value
+CODE_NP_NMR_IE = EventCode.NP_NMR_IE.value
+CODE_ME_NMR_IE = EventCode.ME_NMR_IE.value
+CODE_NMR_CR_FS_FE = EventCode.NMR_CR_FS_FE.value
+CODE_CF_DE = EventCode.CF_DE.value
+
+# Bumped when the pickled engine layout changes; older checkpoints are rejected
+CHECKPOINT_VERSION = 3
+
+# Params fixed by initialization or baked into the engine's structures: a fork
+# from a warm-up snapshot cannot change them
+FORK_FIXED_PARAMS = frozenset({
+    'n_total_parts', 'n_total_aircraft', 'mission_capable_rate',
+    'parts_in_depot', 'parts_in_cond_f', 'parts_in_cond_a',
+    'warmup_periods', 'analysis_periods', 'closing_periods', 'sim_time', 'use_buffer',
+    'metrics_only', 'record_backend', 'stream_wip', 'time_weighted_averages', 'profile', 'random_seed',
+})
 
-def append_event(current_event, new_event):
-    return f"{current_event}, {new_event}"
 
 class SimulationEngine:
     """
@@ -43,64 +98,100 @@ class SimulationEngine:
     Contains formulas for stage durations and helper functions for event management.
     """
     
-    def __init__(self, params, allocation):
+    def __init__(self, params, allocation, rng):
         """
         Initialize SimulationEngine with centralized Parameters.
-        
+
+        The engine creates its own DataSets (self.datasets) for the simulation outputs.
+
         Args:
-            datasets: DataSets instance for storing simulation outputs
             params: Parameters object with all simulation parameters
             allocation: dict with initial part/aircraft allocation
+            rng: np.random.Generator owned by this run (allocation.make_sim_rng),
+                the same one passed to calculate_initial_allocation
         """
         self.params = params
         self.allocation = allocation
+        # Per-run random stream: no global np.random state is touched
+        self.rng = rng
+        # Pre-drawn duration blocks (fleet/depot + optional random multipliers)
+        self.samplers = StageSamplers(self.rng, params)
         self.active_depot: list = []
         
         # Event-driven structures
-        self.event_heap = []  # Priority queue: (time, counter, event_type, entity_id)
+        self.event_heap = []  # Priority queue: (time, counter, event_code, entity_id)
         self.event_counter = 0  # FIFO tie-breaker for same-time events
-        self.micap_state = MicapState()  # Manage MICAP aircraft
-        self.part_manager = PartManager() # Manage parts
-        self.ac_manager = AircraftManager() # Manage Aircrafts
-        self.cond_a_state = ConditionAState()  # Manage Condition A parts
-        self.new_part_state = NewPart(n_total_parts=params['n_total_parts'])  # Manage new parts on order
+        # Metrics-only: no per-cycle history, only streaming aggregates
+        # (WIP integrals, duration moments, event counts) - memory independent of sim_time
+        self.metrics_only = params.get('metrics_only', False)
+        keep_log = not self.metrics_only
+        self.micap_state = MicapState(keep_log=keep_log)  # Manage MICAP aircraft
+        # Record backend: 'dict' (default) or 'columnar' (NumPy column arrays)
+        record_backend = params.get('record_backend', 'dict')
+        if record_backend not in ('dict', 'columnar'):
+            raise ValueError(f"Unknown record_backend: {record_backend}")
+        if self.metrics_only and record_backend == 'columnar':
+            raise ValueError("metrics_only keeps no records: use record_backend='dict'")
+        # Streaming WIP: managers report WIP field writes, loop advances the clock.
+        # Time-weighted averages cover the analysis window [warmup, sim_time - closing].
+        # The per-write hook slows the event loop more than the post-hoc rebuild
+        # costs, so it is on only where no history is kept or the integral is used.
+        window = (params['warmup_periods'], params['sim_time'] - params['closing_periods'])
+        if self.metrics_only or params.get('stream_wip', params.get('time_weighted_averages', False)):
+            self.part_wip = WipTracker(PART_WIP_FIELDS, *window, keep_steps=keep_log)
+            self.ac_wip = WipTracker(AC_WIP_FIELDS, *window, keep_steps=keep_log)
+        else:
+            self.part_wip = self.ac_wip = None  # post-hoc reconstruction from records
+        if self.metrics_only:
+            self.part_stats = CycleStats(PART_DURATION_FIELDS, PART_START_FIELDS, *window)
+            self.ac_stats = CycleStats(AC_DURATION_FIELDS, AC_START_FIELDS, *window)
+        else:
+            self.part_stats = self.ac_stats = None  # stats come from all_parts_df/all_ac_df
+        if record_backend == 'columnar':
+            self.part_manager = ColumnarPartManager(wip_tracker=self.part_wip) # Manage parts
+            self.ac_manager = ColumnarAircraftManager(wip_tracker=self.ac_wip) # Manage Aircrafts
+        else:
+            self.part_manager = PartManager(wip_tracker=self.part_wip, keep_log=keep_log, cycle_stats=self.part_stats)
+            self.ac_manager = AircraftManager(wip_tracker=self.ac_wip, keep_log=keep_log, cycle_stats=self.ac_stats)
+        self.cond_a_state = ConditionAState(keep_log=keep_log)  # Manage Condition A parts
+        self.new_part_state = NewPart(n_total_parts=params['n_total_parts'], keep_log=keep_log)  # Manage new parts on order
         self.datasets = DataSets(warmup_periods=params['warmup_periods'], closing_periods=params['closing_periods'], sim_time=params['sim_time'], use_buffer=params.get('use_buffer', False))
 
         # Event tracking for progress display
-        self.event_counts = {
-            'depot_complete': 0,
-            'fleet_complete': 0,
-            'new_part_arrives': 0,
-            'CF_DE': 0,
-            'part_fleet_end': 0,
-            'part_condemn': 0,
-            'total': 0
-        }
+        self.event_type_counts = [0] * N_EVENT_TYPES  # Per-EventType counters (list index = code)
+        self.event_counts = event_counts_dict(self.event_type_counts)
         self.progress_callback = None
+        # Opt-in handler/heap/phase timings (engine_profiler.py)
+        self.profiler = EngineProfiler() if params.get('profile', False) else None
+
+        # Run progress (checkpoint/resume): events with time <= clock are processed
+        self.initialized = False
+        self.clock = -np.inf
     
     # ==========================================================================
     # STAGE DURATION FORMULAS
     # ==========================================================================
         
-    def calculate_fleet_duration(self):
+    def calculate_fleet_duration(self, ac_id=None):
         """
         Calculates distribution for length of stage based on chosen distribution:
         Normal or Weibull
+
+        Values come pre-drawn in blocks from self.samplers.fleet
+        (max(0, ...) truncation applied when the block is drawn).
+        With common random numbers the n-th fleet stage of ac_id gets the
+        n-th value of that aircraft's own substream.
         """
-        if self.params['sone_dist'] == "Normal":
-            return max(0, np.random.normal(self.params['sone_mean'], self.params['sone_sd']))
-        elif self.params['sone_dist'] == "Weibull":
-            return max(0, np.random.weibull(self.params['sone_mean']) * self.params['sone_sd'])
+        return self.samplers.fleet.next(ac_id)
     
     def calculate_depot_duration(self):
         """
         Calculates distribution for length of stage based on chosen distribution:
         Normal or Weibull
+
+        Values come pre-drawn in blocks from self.samplers.depot.
         """
-        if self.params['sthree_dist'] == "Normal":
-            return max(0, np.random.normal(self.params['sthree_mean'], self.params['sthree_sd']))
-        elif self.params['sthree_dist'] == "Weibull":
-            return max(0, np.random.weibull(self.params['sthree_mean']) * self.params['sthree_sd'])
+        return self.samplers.depot.next()
     
     # ==========================================================================
     # EVENT SCHEDULING METHODS
@@ -114,12 +205,13 @@ class SimulationEngine:
         ----------
         event_time : float
             Simulation time when event occurs (e.g., depot_end, fleet_end)
-        event_type : str
-            One of: 'depot_complete', 'fleet_complete', 'new_part_arrives', 'CF_DE', 'part_fleet_end', 'part_condemn'
+        event_type : int
+            Plain int event code (event_types constant): DEPOT_COMPLETE, FLEET_COMPLETE,
+            NEW_PART_ARRIVES, CF_DE, PART_FLEET_END, PART_CONDEMN
         entity_id : int
-            - For part events ('depot_complete', 'part_fleet_end', 'part_condemn', 'CF_DE'): sim_id from PartManager
-            - For aircraft events ('fleet_complete'): des_id from AircraftManager  
-            - For 'new_part_arrives': part_id from new_part_df
+            - For part events (DEPOT_COMPLETE, PART_FLEET_END, PART_CONDEMN, CF_DE): sim_id from PartManager
+            - For aircraft events (FLEET_COMPLETE): des_id from AircraftManager  
+            - For NEW_PART_ARRIVES: part_id from new_part_df
         
         Notes
         -----
@@ -136,7 +228,7 @@ class SimulationEngine:
     # HELPER FUNCTION: PROCESS NEW CYCLE STAGES (After Installation Completes)
     # ==========================================================================
 
-    def event_acp_fs_fe(self, s4_install_end, new_sim_id, new_des_id):
+    def event_acp_fs_fe(self, s4_install_end, new_sim_id, new_des_id, ac_id=None):
         """
         EVENT: Aircraft-Part Fleet Start to Fleet End
         
@@ -153,12 +245,14 @@ class SimulationEngine:
             Primary key for Part ID in PartManager active tracking
         new_des_id : int
             Primary key for Aircraft ID in AircraftManager active tracking
+        ac_id : int
+            Aircraft ID (keys the fleet duration stream with common random numbers)
         """
         sim_id = new_sim_id
         des_id = new_des_id
         
         # Calculate fleet duration and timing
-        d1 = self.calculate_fleet_duration()
+        d1 = self.calculate_fleet_duration(ac_id)
         s1_start = s4_install_end
         s1_end = s1_start + d1
         
@@ -175,10 +269,10 @@ class SimulationEngine:
         })
         
         # Schedule fleet_complete event
-        self.schedule_event(s1_end, 'fleet_complete', des_id)
+        self.schedule_event(s1_end, FLEET_COMPLETE, des_id)
         
         # Schedule part_fleet_end event 
-        self.schedule_event(s1_end, 'part_fleet_end', sim_id)
+        self.schedule_event(s1_end, PART_FLEET_END, sim_id)
 
 
     def event_p_cfs_de(self, sim_id):
@@ -207,21 +301,15 @@ class SimulationEngine:
         s1_end = active_part['fleet_end']
         
         # EVENT TYPES logic
-        eventtype_cfs_cfe = "CFS_CFE"
-        eventtype_ds_de_condemn="DS_DE_CONDEMN" # part is condemn
-        eventtype_ds_de="DS_DE"
+        eventtype_cfs_cfe = CODE_CFS_CFE
+        eventtype_ds_de_condemn=CODE_DS_DE_CONDEMN # part is condemn
+        eventtype_ds_de=CODE_DS_DE
 
         current_event = active_part['event_path']
 
         new_event = eventtype_cfs_cfe # event 1
         add_event_cfs_cfe = append_event(current_event, new_event)
 
-        new_event = eventtype_ds_de_condemn  # event 2
-        add_event_dsdecondemn = append_event(add_event_cfs_cfe, new_event)
-
-        new_event = eventtype_ds_de # event 3
-        add_event_ds_de = append_event(add_event_cfs_cfe, new_event)
-
         
         # pre-Calculate depot_start given DEPOT CONSTRAINT is satisfy
         if len(self.active_depot) < self.params['depot_capacity']:
@@ -258,14 +346,14 @@ class SimulationEngine:
             # Update depot info
             self.part_manager.update_fields(sim_id, {
             'condemn': condemn,
-            'event_path': add_event_dsdecondemn,
+            'event_path': append_event(add_event_cfs_cfe, eventtype_ds_de_condemn),
             'depot_start': s3_start,
             'depot_end': s3_end,
             'depot_duration': d3,
             })
             
             # Schedule condemn event at depot_end
-            self.schedule_event(s3_end, 'part_condemn', sim_id)
+            self.schedule_event(s3_end, PART_CONDEMN, sim_id)
             
         else:
             # NORMAL PART
@@ -274,14 +362,14 @@ class SimulationEngine:
             heapq.heappush(self.active_depot, s3_end)
             
             self.part_manager.update_fields(sim_id, {
-            'event_path': add_event_ds_de,
+            'event_path': append_event(add_event_cfs_cfe, eventtype_ds_de),
             'depot_start': s3_start,
             'depot_end': s3_end,
             'depot_duration': d3,
             })
 
             # Schedule normal depot completion
-            self.schedule_event(s3_end, 'depot_complete', sim_id)
+            self.schedule_event(s3_end, DEPOT_COMPLETE, sim_id)
 
 
     def event_p_condemn(self, sim_id):
@@ -326,7 +414,7 @@ class SimulationEngine:
         )
         
         # Schedule new part arrival
-        self.schedule_event(new_part_arrival_time, 'new_part_arrives', new_part_id)
+        self.schedule_event(new_part_arrival_time, NEW_PART_ARRIVES, new_part_id)
 
 
     def _schedule_initial_events(self):
@@ -347,7 +435,7 @@ class SimulationEngine:
         # 1. Schedule depot completions from initialization
         for sim_id, part in active_parts.items():
             if pd.notna(part.get('depot_end')) and part.get('condemn') == 'no':
-                self.schedule_event(part['depot_end'], 'depot_complete', sim_id)
+                self.schedule_event(part['depot_end'], DEPOT_COMPLETE, sim_id)
         
         # 2. Schedule fleet completions from initialization (using ac_manager)
         # Under assumption no aircraft were previously processed from fleet_end to MICAP or install
@@ -355,20 +443,20 @@ class SimulationEngine:
         active_aircraft = self.ac_manager.get_all_active_ac()
         for des_id, ac in active_aircraft.items():
             if pd.notna(ac.get('fleet_end')):
-                self.schedule_event(ac['fleet_end'], 'fleet_complete', des_id)
+                self.schedule_event(ac['fleet_end'], FLEET_COMPLETE, des_id)
         
         # 3. Schedule new part arrivals (if any exist in new_part_state)
         active_new_parts = self.new_part_state.get_all_active()
         for part_id, part in active_new_parts.items():
-            self.schedule_event(part['condition_a_start'], 'new_part_arrives', part_id)
+            self.schedule_event(part['condition_a_start'], NEW_PART_ARRIVES, part_id)
         
         # 4. Schedule Condition F PART-EVENTS (CF_DE parts)
         for sim_id, part in active_parts.items():
-            is_ic_ijcf = (part.get('event_path') == 'IC_IjCF') and (part.get('condition_f_start') == 0)
-            is_ic_fe_cf = (part.get('event_path') == 'IC_IZ_FS_FE, IC_FE_CF')  # IMPORTANT: DONT add IC_IZ_FS_FE, IC_FE_CF that DONT 
+            is_ic_ijcf = (part.get('event_path') == PATH_IC_IJCF) and (part.get('condition_f_start') == 0)
+            is_ic_fe_cf = (part.get('event_path') == PATH_IC_IZ_FE_CF)  # IMPORTANT: DONT add IC_IZ_FS_FE, IC_FE_CF that DONT 
             
             if is_ic_ijcf or is_ic_fe_cf:
-                self.schedule_event(part['condition_f_start'], 'CF_DE', sim_id)
+                self.schedule_event(part['condition_f_start'], CF_DE, sim_id)
     
     def handle_part_completes_depot(self, sim_id):
         """
@@ -395,10 +483,10 @@ class SimulationEngine:
         
         s3_end = part_row['depot_end']
 
-        eventtypeca="DE_CA"
-        eventtypemi="DE_DMR_IE"
-        eventtype_mac="ME_DMR_IE"
-        eventtypedemicr="DMR_CR_FS_FE"
+        eventtypeca=CODE_DE_CA
+        eventtypemi=CODE_DE_DMR_IE
+        eventtype_mac=CODE_ME_DMR_IE
+        eventtypedemicr=CODE_DMR_CR_FS_FE
         
         # Check if any aircraft in MICAP
         micap_pa_rm = self.micap_state.pop_and_rm_first(s3_end)
@@ -496,7 +584,8 @@ class SimulationEngine:
             self.event_acp_fs_fe(
                 s4_install_end=s4_install_end,
                 new_sim_id=new_sim_id,
-                new_des_id=new_des_id
+                new_des_id=new_des_id,
+                ac_id=first_micap['ac_id']
             )
             
     
@@ -527,10 +616,10 @@ class SimulationEngine:
         s1_end = ac_record['fleet_end']
 
         # EVENT TYPEs 
-        eventtypeca = "CAE_IE"
-        eventtype_ac = "FE_IE"
-        eventtypecacr = "CAP_CR_FS_FE"
-        eventtype = "FE_MS" 
+        eventtypeca = CODE_CAE_IE
+        eventtype_ac = CODE_FE_IE
+        eventtypecacr = CODE_CAP_CR_FS_FE
+        eventtype = CODE_FE_MS 
         
         # Check if part available in Condition A
         first_available = self.cond_a_state.pop_first_available(s1_end)
@@ -618,7 +707,8 @@ class SimulationEngine:
             self.event_acp_fs_fe(
                 s4_install_end=s4_install_end,
                 new_sim_id=new_sim_id,
-                new_des_id=new_des_id
+                new_des_id=new_des_id,
+                ac_id=ac_record['ac_id']
             )
             # Part already removed from cond_a_state by pop_first_available()
         
@@ -677,10 +767,10 @@ class SimulationEngine:
         self.new_part_state.remove_part(part_id)
 
         # EVENT TYPES
-        eventtypenca="NP_CA"
-        eventtypenma="NP_NMR_IE"
-        eventtype="ME_NMR_IE"
-        eventtypenmacr="NMR_CR_FS_FE"
+        eventtypenca=CODE_NP_CA
+        eventtypenma=CODE_NP_NMR_IE
+        eventtype=CODE_ME_NMR_IE
+        eventtypenmacr=CODE_NMR_CR_FS_FE
 
         # Check if any aircraft currently in MICAP
         micap_npa_rm = self.micap_state.pop_and_rm_first(condition_a_start)
@@ -789,7 +879,8 @@ class SimulationEngine:
             self.event_acp_fs_fe(
                 s4_install_end=s4_install_end,
                 new_sim_id=new_sim_id,
-                new_des_id=new_des_id
+                new_des_id=new_des_id,
+                ac_id=first_micap['ac_id']
             )
 
 
@@ -813,13 +904,13 @@ class SimulationEngine:
         part_row = self.part_manager.get_part(sim_id)
         
         # Verify correct event type. (add code so it logs the event types, and when error)
-        if part_row['event_path'] == 'IC_IjCF':
+        if part_row['event_path'] == PATH_IC_IJCF:
             assert part_row['condition_f_start'] == 0, \
                 f"IC_IjCF event must have condition_f_start=0, got {part_row['condition_f_start']}"
-        elif part_row['event_path'] == 'IC_IZ_FS_FE, IC_FE_CF':
+        elif part_row['event_path'] == PATH_IC_IZ_FE_CF:
             pass
         else:
-            raise AssertionError(f"Expected IC_IjCF or IC_IZ_FS_FE, IC_FE_CF event, got {part_row['event_path']}")
+            raise AssertionError(f"Expected IC_IjCF or IC_IZ_FS_FE, IC_FE_CF event, got {decode_path(part_row['event_path'])}")
         
         cf_start = part_row['condition_f_start']
         
@@ -835,7 +926,7 @@ class SimulationEngine:
         d2 = cf_end - cf_start  # Condition F duration (wait time)
         d_end = d_start + d_dur
         heapq.heappush(self.active_depot, d_end)
-        eventtype="CF_DE"
+        eventtype=CODE_CF_DE
 
         # update event info 
         current_event = part_row['event_path'] # part conditoon_f to depot_end
@@ -852,9 +943,95 @@ class SimulationEngine:
         })
         
         # Schedule depot completion event (standard flow from here)
-        self.schedule_event(d_end, 'depot_complete', sim_id)
+        self.schedule_event(d_end, DEPOT_COMPLETE, sim_id)
+
+    def _build_handler_table(self):
+        """
+        Return event handlers as a list indexed by event code.
+        """
+        table = [None] * N_EVENT_TYPES
+        table[DEPOT_COMPLETE] = self.handle_part_completes_depot
+        table[FLEET_COMPLETE] = self.handle_aircraft_needs_part
+        table[NEW_PART_ARRIVES] = self.handle_new_part_arrives
+        table[CF_DE] = self.event_cf_de
+        table[PART_FLEET_END] = self.event_p_cfs_de
+        table[PART_CONDEMN] = self.event_p_condemn
+        return table
+
+    def _process_events(self, until=None):
+        """
+        Pop and dispatch events until the heap is empty or sim_time is exceeded.
+
+        Dispatch goes through the handler table (list indexed by event code) and
+        counts go to self.event_type_counts; self.event_counts (string keys) is
+        rebuilt once after the loop.
+
+        Args:
+            until: Stop after the events at or before this time (checkpoint
+                boundary). The first later event goes back on the heap, so
+                running in chunks dispatches the same events in the same order.
+        """
+        heap = self.event_heap
+        heappop = heapq.heappop
+        sim_time = self.params['sim_time']
+        stop = sim_time if until is None else min(until, sim_time)
+        handlers = self._build_handler_table()
+        if self.profiler is not None:
+            handlers = self.profiler.wrap_handlers(handlers)
+            heappop = self.profiler.wrap_heappop(heappop)
+        type_counts = self.event_type_counts
+        callback = self.progress_callback
+        total = sum(type_counts)
+        part_wip, ac_wip = self.part_wip, self.ac_wip
+        # Pending-time heaps (same list objects for the whole run): checked inline
+        # so advance() is only called when a WIP change is due
+        part_pending = part_wip.pending_times if part_wip is not None else ()
+        ac_pending = ac_wip.pending_times if ac_wip is not None else ()
+
+        while heap:
+            # Get next event chronologically
+            event_time, _, event_code, entity_id = heappop(heap)
+            
+            # Stop if event exceeds simulation time limit (or the chunk end)
+            if event_time > stop:
+                if stop < sim_time:
+                    heapq.heappush(heap, (event_time, _, event_code, entity_id))
+                break
+            
+            # Apply WIP changes up to the event time
+            if part_pending and part_pending[0] <= event_time:
+                part_wip.advance(event_time)
+            if ac_pending and ac_pending[0] <= event_time:
+                ac_wip.advance(event_time)
+            
+            # Track event processing
+            type_counts[event_code] += 1
+            total += 1
+            
+            # Update progress UI if callback provided
+            if callback and total % 100 == 0:
+                callback(EVENT_TYPE_NAMES[event_code], type_counts[event_code], total)
+            
+            # Process event (handlers will schedule future events)
+            handlers[event_code](entity_id)
 
-    def run(self, progress_callback=None):
+        self.clock = stop
+        self.event_counts = event_counts_dict(type_counts)
+
+    def _phase(self, name):
+        """Profiler phase timer, or a no-op context when profiling is off."""
+        return self.profiler.phase(name) if self.profiler is not None else nullcontext()
+
+    def initialize(self):
+        """
+        Phase 1 + 2 of run(): initial conditions and initial events.
+        """
+        initializer = Initialization(self)
+        initializer.run_initialization()
+        self._schedule_initial_events()
+        self.initialized = True
+
+    def run(self, progress_callback=None, checkpoint_path=None, checkpoint_interval=None):
         """
         Execute event-driven discrete-event simulation.
 
@@ -870,6 +1047,14 @@ class SimulationEngine:
         5. Each event handler schedules future events
         6. Continue until heap empty or time limit reached
         7. Return trimmed and validated results
+
+        An engine restored with load_checkpoint() skips initialization and
+        continues from its clock.
+
+        Args:
+            progress_callback: Optional callback(event_name, type_count, total) every 100 events
+            checkpoint_path: File written by save_checkpoint() every checkpoint_interval
+            checkpoint_interval: Simulated days between checkpoints (None = no checkpoints)
         
         Returns
         -------
@@ -878,70 +1063,86 @@ class SimulationEngine:
         """
         self.progress_callback = progress_callback
         
-        # Phase 1: Initialization
-        initializer = Initialization(self)
-        initializer.run_initialization()
-        
-        # Phase 2: Schedule all initial events
-        self._schedule_initial_events()
+        # Phase 1 + 2: Initialization and initial events (done already when resumed)
+        if not self.initialized:
+            with self._phase('initialize'):
+                self.initialize()
         
         # Phase 3: Event-driven main loop
-        while self.event_heap:
-            # Get next event chronologically
-            event_time, _, event_type, entity_id = heapq.heappop(self.event_heap)
-            
-            # Stop if event exceeds simulation time limit
-            if event_time > self.params['sim_time']:
-                break
-            
-            # Track event processing
-            self.event_counts[event_type] = self.event_counts.get(event_type, 0) + 1
-            self.event_counts['total'] += 1
-            
-            # Update progress UI if callback provided
-            if self.progress_callback and self.event_counts['total'] % 100 == 0:
-                self.progress_callback(event_type, self.event_counts[event_type], 
-                                    self.event_counts['total'])
-            
-            # Process event (handlers will schedule future events)
-            if event_type == 'depot_complete':
-                # EVENT TYPE: Part Completes Depot
-                self.handle_part_completes_depot(entity_id)
-                # EVENT TYPE: Aircraft Completes Fleet
-            elif event_type == 'fleet_complete':
-                self.handle_aircraft_needs_part(entity_id)
-                # EVENT TYPE: New Part Arrives
-            elif event_type == 'new_part_arrives':
-                self.handle_new_part_arrives(entity_id)
-                # EVENT TYPE: CF_DE
-            elif event_type == 'CF_DE':
-                self.event_cf_de(entity_id)
-                # EVENT TYPE:
-            elif event_type == 'part_fleet_end':
-                self.event_p_cfs_de(entity_id)
-                # EVENT TYPE:
-            elif event_type == 'part_condemn':
-                self.event_p_condemn(entity_id)
-        
-        # Convert PartManager and AircraftManager data to DataFrames for analysis
-        self.datasets.build_part_ac_df(
-            get_all_parts_data_df=self.part_manager.get_all_parts_data_df,
-            get_ac_df_func=self.ac_manager.get_all_ac_data_df,
-            get_wip_end=self.part_manager.get_wip_end,
-            get_wip_raw=self.part_manager.get_wip_raw,
-            get_wip_ac_end=self.ac_manager.get_wip_ac_end,
-            get_wip_ac_raw=self.ac_manager.get_wip_ac_raw,
-            sim_time=self.params['sim_time'],
-        )
-        self.datasets.filter_by_remove_days()
+        if checkpoint_path and checkpoint_interval:
+            sim_time = self.params['sim_time']
+            start = max(self.clock, 0.0)
+            while self.event_heap and self.clock < sim_time:
+                with self._phase('event_loop'):
+                    self._process_events(until=start + checkpoint_interval)
+                start = self.clock
+                if self.clock < sim_time:
+                    with self._phase('save_checkpoint'):
+                        self.save_checkpoint(checkpoint_path)
+        else:
+            with self._phase('event_loop'):
+                self._process_events()
+        return self.finalize()
+
+    def finalize(self):
+        """
+        Phase 4 of run(): close WIP trackers and build datasets and PostSim.
+
+        Returns
+        -------
+        dict
+            Validation results (event_counts, datasets, post_sim, and
+            'profile' with EngineProfiler.summary() when params['profile'])
+        """
+        if self.part_wip is not None:
+            with self._phase('wip_finalize'):
+                self.part_wip.finalize()
+                self.ac_wip.finalize()
+        
+        # Time-weighted WIP averages cover the analysis window; only computed when used
+        window = (self.params['warmup_periods'], self.params['sim_time'] - self.params['closing_periods'])
+        time_weighted = self.params.get('time_weighted_averages', False)
+        
+        if self.metrics_only:
+            # Cycles still active at the end count like the ones in all_parts_df/all_ac_df
+            with self._phase('build_metrics'):
+                for record in self.part_manager.active.values():
+                    self.part_stats.add(record)
+                for record in self.ac_manager.active.values():
+                    self.ac_stats.add(record)
+                self.datasets.build_metrics(
+                    wip_time_avg=self.part_wip.time_weighted_averages(),
+                    wip_ac_time_avg=self.ac_wip.time_weighted_averages(),
+                    duration_stats={**self.part_stats.summary(), **self.ac_stats.summary()},
+                )
+        else:
+            # Convert PartManager and AircraftManager data to DataFrames for analysis
+            with self._phase('build_part_ac_df'):
+                # One merged snapshot of active + logged records for all exports
+                self.part_manager.freeze_records()
+                self.ac_manager.freeze_records()
+                self.datasets.build_part_ac_df(
+                    get_all_parts_data_df=self.part_manager.get_all_parts_data_df,
+                    get_ac_df_func=self.ac_manager.get_all_ac_data_df,
+                    get_wip_end=self.part_manager.get_wip_end,
+                    get_wip_raw=self.part_manager.get_wip_raw,
+                    get_wip_ac_end=self.ac_manager.get_wip_ac_end,
+                    get_wip_ac_raw=self.ac_manager.get_wip_ac_raw,
+                    sim_time=self.params['sim_time'],
+                    wip_time_avg=self.part_manager.get_wip_time_avg(*window) if time_weighted else None,
+                    wip_ac_time_avg=self.ac_manager.get_wip_ac_time_avg(*window) if time_weighted else None,
+                )
+            with self._phase('filter_by_remove_days'):
+                self.datasets.filter_by_remove_days()
         
         # Create PostSim to compute all stats and figures
-        post_sim = PostSim(
-            datasets=self.datasets,
-            event_counts=self.event_counts.copy(),
-            params=self.params,
-            allocation=self.allocation
-        )
+        with self._phase('post_sim'):
+            post_sim = PostSim(
+                datasets=self.datasets,
+                event_counts=self.event_counts.copy(),
+                params=self.params,
+                allocation=self.allocation
+            )
         
         # Build results dictionary with event counts, datasets, and post_sim
         # datasets is created fresh each run() call - prevents cache data in multi-scenario runs
@@ -950,7 +1151,105 @@ class SimulationEngine:
             'datasets': self.datasets,
             'post_sim': post_sim
         }
+        if self.profiler is not None:
+            validation_results['profile'] = self.profiler.summary()
         
         # i'll re add clear code later
         
         return validation_results
+
+    # ==========================================================================
+    # CHECKPOINT / RESUME
+    # ==========================================================================
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['progress_callback'] = None  # UI callbacks are not picklable
+        return state
+
+    def snapshot(self):
+        """
+        Engine state as bytes (uncompressed pickle, same content as a checkpoint).
+        """
+        return pickle.dumps({'version': CHECKPOINT_VERSION, 'engine': self}, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def warmup_snapshot(self):
+        """
+        Initialize, run the events up to warmup_periods and return snapshot().
+
+        Forks of the snapshot (fork()) continue from the end of warm-up.
+        """
+        if not self.initialized:
+            self.initialize()
+        self._process_events(until=self.params['warmup_periods'])
+        return self.snapshot()
+
+    @classmethod
+    def fork(cls, snapshot, rng=None, param_overrides=None):
+        """
+        New engine continuing from snapshot() bytes.
+
+        Args:
+            snapshot: bytes from snapshot() / warmup_snapshot()
+            rng: New np.random.Generator for the continuation (e.g. another
+                replication stream). None keeps the snapshot's stream, so run()
+                gives exactly the uninterrupted result.
+            param_overrides: dict of params for the continuation (e.g.
+                depot_capacity, condemn_cycle, part_order_lag, duration
+                distributions, inverse_cdf/antithetic). FORK_FIXED_PARAMS
+                cannot change.
+
+        Stage samplers are rebuilt from the new rng/params when either is given.
+        With param_overrides alone they are rebuilt from child FORK_STAGE_STREAM
+        of the snapshot's stream: spawning from that rng again would continue
+        at child 4 and give the fleet stream the INITIAL_CYCLE_STREAM key.
+
+        Returns:
+            SimulationEngine: Call run() to finish the simulation
+        """
+        checkpoint = pickle.loads(snapshot)
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {checkpoint.get('version')}")
+        engine = checkpoint['engine']
+        if param_overrides:
+            fixed = sorted(k for k, v in param_overrides.items()
+                           if k in FORK_FIXED_PARAMS and engine.params.get(k) != v)
+            if fixed:
+                raise ValueError(f"Cannot change {', '.join(fixed)} in a fork")
+            params = Parameters()
+            params.set_all(engine.params.to_dict())
+            params.set_all(param_overrides)
+            engine.params = params
+        if rng is not None:
+            engine.rng = rng
+            engine.samplers = StageSamplers(rng, engine.params)
+        elif param_overrides:
+            stage_rng = np.random.default_rng(child_seed_seq(engine.rng, FORK_STAGE_STREAM))
+            engine.samplers = StageSamplers(stage_rng, engine.params)
+        return engine
+
+    def save_checkpoint(self, path):
+        """
+        Write the full engine state (event heap, managers, phase states, WIP
+        trackers, samplers and RNG state, event counters) to a gzip-compressed pickle.
+
+        The file is written next to `path` and renamed into place, so a crash
+        during the write keeps the previous checkpoint.
+        """
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+            pickle.dump({'version': CHECKPOINT_VERSION, 'engine': self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_checkpoint(cls, path):
+        """
+        Restore an engine written by save_checkpoint().
+
+        Resume with engine.run(); the result is identical to an uninterrupted run.
+        """
+        with gzip.open(path, 'rb') as f:
+            checkpoint = pickle.load(f)
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {checkpoint.get('version')} in {path}")
+        return checkpoint['engine']
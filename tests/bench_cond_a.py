@@ -0,0 +1,127 @@
+"""
+Micro-benchmark for ConditionAState.pop_first_available.
+
+Compares the legacy sort-per-pop deque implementation against the heap-based
+ConditionAState at growing inventory sizes. Each round pops the earliest part
+and adds a replacement, so inventory size stays constant. The heap version
+should show a flat per-pop cost; the legacy cost grows with inventory.
+
+Both implementations are fed the same adds/pops and must produce identical
+selection order and condition_a_log.
+
+Usage:
+    python tests/bench_cond_a.py
+    python tests/bench_cond_a.py --sizes 100 1000 10000 --pops 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ph_cda import ConditionAState
+
+
+class LegacyConditionAState(ConditionAState):
+    """Pre-heap ConditionAState: sorts the whole deque on every pop (benchmark baseline)."""
+
+    def __init__(self):
+        super().__init__()
+        self.queue = deque()
+
+    def add_part(self, sim_id, part_id, event_path, condition_a_start):
+        if sim_id in self.lookup:
+            return {'success': False, 'error': f'Duplicate sim_id {sim_id} in Condition A'}
+        record = {
+            'event_time': condition_a_start,
+            'event': 'ENTER_COND_A',
+            'sim_id': sim_id,
+            'part_id': part_id,
+            'event_path': event_path,
+            'condition_a_start': condition_a_start,
+            'condition_a_end': None,
+            'count': len(self.queue)
+        }
+        self.queue.append(record)
+        self.lookup[sim_id] = record
+        self.condition_a_log.append(dict(record, count=len(self.queue)))
+        return {'success': True, 'error': None}
+
+    def pop_first_available(self, current_time):
+        if not self.queue:
+            return None
+        sorted_queue = sorted(self.queue, key=lambda x: (x['condition_a_start'], x['part_id']))
+        first_record = sorted_queue[0]
+        sim_id = first_record['sim_id']
+        self.lookup.pop(sim_id)
+        self.queue = deque(r for r in self.queue if r['sim_id'] != sim_id)
+        first_record['condition_a_end'] = current_time
+        self.condition_a_log.append({
+            'event_time': current_time,
+            'event': 'EXIT_COND_A',
+            'sim_id': sim_id,
+            'part_id': first_record['part_id'],
+            'event_path': first_record['event_path'],
+            'condition_a_start': first_record['condition_a_start'],
+            'condition_a_end': current_time,
+            'count': len(self.queue)
+        })
+        return first_record
+
+
+def run_rounds(state_cls, size, pops, seed):
+    """
+    Fill inventory to `size`, then time `pops` pop + add rounds.
+
+    Start times are rounded to whole days so (condition_a_start, part_id) ties occur.
+
+    Returns
+    -------
+    tuple
+        (seconds_per_pop, popped sim_ids, condition_a_log)
+    """
+    rng = np.random.default_rng(seed)
+    state = state_cls()
+    sim_id = 0
+    for _ in range(size):
+        state.add_part(sim_id, int(rng.integers(0, size)), 'DE_CA', float(rng.integers(0, 50)))
+        sim_id += 1
+
+    popped = []
+    now = 50.0
+    t0 = time.perf_counter()
+    for _ in range(pops):
+        record = state.pop_first_available(now)
+        popped.append(record['sim_id'])
+        state.add_part(sim_id, int(rng.integers(0, size)), 'DE_CA', now + float(rng.integers(0, 50)))
+        sim_id += 1
+        now += 1.0
+    elapsed = time.perf_counter() - t0
+    return elapsed / pops, popped, state.condition_a_log
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 5000], help='Inventory sizes')
+    parser.add_argument('--pops', type=int, default=1000, help='Pop + add rounds per size')
+    args = parser.parse_args()
+
+    print(f"{'inventory':>10} {'legacy us/pop':>15} {'heap us/pop':>13} {'speedup':>9}")
+    for size in args.sizes:
+        legacy_cost, legacy_popped, legacy_log = run_rounds(LegacyConditionAState, size, args.pops, seed=size)
+        heap_cost, heap_popped, heap_log = run_rounds(ConditionAState, size, args.pops, seed=size)
+
+        if legacy_popped != heap_popped or legacy_log != heap_log:
+            print(f"❌ ERROR: selection order or condition_a_log differs at inventory {size}")
+            sys.exit(1)
+
+        print(f"{size:>10,} {legacy_cost * 1e6:>15.1f} {heap_cost * 1e6:>13.1f} {legacy_cost / heap_cost:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+"""
+Micro-benchmark for SimulationEngine event dispatch.
+
+Compares events/sec for the legacy dispatch (string event types in the heap,
+if/elif chain, dict counters) against the integer-coded handler table. The
+default configuration is a production-sized run (Solo Run sidebar defaults:
+891 parts, 826 aircraft, 7800 analysis days plus 1400-day warm-up and closing
+buffers); --small uses the tests/test_simulation.py parameters.
+
+Both engines run the exact same handlers and random streams, so event counts
+must match; only the dispatch overhead differs.
+
+Usage:
+    python tests/bench_engine.py
+    python tests/bench_engine.py --small --repeat 50 --analysis-periods 42000
+"""
+
+import argparse
+import heapq
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import warnings # to silent future warnings, comment to test
+warnings.simplefilter("ignore", category=FutureWarning)
+
+from simulation_engine import SimulationEngine
+from event_types import EVENT_TYPE_NAMES
+from parameters import Parameters
+from utils import calculate_initial_allocation, make_sim_rng
+
+
+class LegacyDispatchEngine(SimulationEngine):
+    """SimulationEngine with the pre-EventType string dispatch loop (benchmark baseline)."""
+
+    def schedule_event(self, event_time, event_type, entity_id):
+        heapq.heappush(
+            self.event_heap,
+            (event_time, self.event_counter, EVENT_TYPE_NAMES[event_type], entity_id)
+        )
+        self.event_counter += 1
+
+    def _process_events(self, until=None):
+        # Same loop as SimulationEngine._process_events (chunk stop, WIP advance,
+        # progress callback) except for the dispatch and the counters
+        sim_time = self.params['sim_time']
+        stop = sim_time if until is None else min(until, sim_time)
+        part_wip, ac_wip = self.part_wip, self.ac_wip
+        part_pending = part_wip.pending_times if part_wip is not None else ()
+        ac_pending = ac_wip.pending_times if ac_wip is not None else ()
+        while self.event_heap:
+            event_time, counter, event_type, entity_id = heapq.heappop(self.event_heap)
+            if event_time > stop:
+                if stop < sim_time:
+                    heapq.heappush(self.event_heap, (event_time, counter, event_type, entity_id))
+                break
+            if part_pending and part_pending[0] <= event_time:
+                part_wip.advance(event_time)
+            if ac_pending and ac_pending[0] <= event_time:
+                ac_wip.advance(event_time)
+            self.event_counts[event_type] = self.event_counts.get(event_type, 0) + 1
+            self.event_counts['total'] += 1
+            if self.progress_callback and self.event_counts['total'] % 100 == 0:
+                self.progress_callback(event_type, self.event_counts[event_type],
+                                       self.event_counts['total'])
+            if event_type == 'depot_complete':
+                self.handle_part_completes_depot(entity_id)
+            elif event_type == 'fleet_complete':
+                self.handle_aircraft_needs_part(entity_id)
+            elif event_type == 'new_part_arrives':
+                self.handle_new_part_arrives(entity_id)
+            elif event_type == 'CF_DE':
+                self.event_cf_de(entity_id)
+            elif event_type == 'part_fleet_end':
+                self.event_p_cfs_de(entity_id)
+            elif event_type == 'part_condemn':
+                self.event_p_condemn(entity_id)
+        self.clock = stop
+
+
+def build_production_params(analysis_periods=7800):
+    """Solo Run sidebar defaults (Normal fleet, Normal depot, 2x fleet-mean buffers)."""
+    params = Parameters()
+    params.set_all({
+        'random_seed': 132,
+        'n_total_parts': 891,
+        'n_total_aircraft': 826,
+        'mission_capable_rate': 0.92,
+        'warmup_periods': 1400,
+        'analysis_periods': analysis_periods,
+        'closing_periods': 1400,
+        'use_buffer': True,
+        'sone_dist': 'Normal',
+        'sone_mean': 700.0,
+        'sone_sd': 140.0,
+        'sthree_dist': 'Normal',
+        'sthree_mean': 20.0,
+        'sthree_sd': 2.0,
+        'depot_capacity': 37,
+        'condemn_cycle': 1000,
+        'condemn_depot_fraction': 0.10,
+        'part_order_lag': 365,
+        'parts_in_depot': 37,
+        'parts_in_cond_f': 94,
+        'parts_in_cond_a': 0,
+        'use_fleet_rand': True,
+        'fleet_rand_min': 0.01,
+        'fleet_rand_max': 1.0,
+        'use_depot_rand': True,
+        'depot_rand_min': 0.01,
+        'depot_rand_max': 1.0,
+        'render_plots': False,
+    })
+    params.set('sim_time', params['warmup_periods'] + params['analysis_periods'] + params['closing_periods'])
+    return params
+
+
+def build_small_params(analysis_periods=4200):
+    """Default tests/test_simulation.py parameters (hardcoded allocation)."""
+    params = Parameters()
+    params.set_all({
+        'random_seed': 132,
+        'n_total_parts': 24,
+        'n_total_aircraft': 20,
+        'mission_capable_rate': 0.60,
+        'warmup_periods': 0,
+        'analysis_periods': analysis_periods,
+        'closing_periods': 0,
+        'sone_dist': 'Weibull',
+        'sone_mean': 9.17,
+        'sone_sd': 384.13,
+        'sthree_dist': 'Normal',
+        'sthree_mean': 40.0,
+        'sthree_sd': 1.2,
+        'depot_capacity': 10,
+        'condemn_cycle': 10,
+        'condemn_depot_fraction': 0.10,
+        'part_order_lag': 365,
+        'parts_in_depot': 5,
+        'parts_in_cond_f': 5,
+        'parts_in_cond_a': 2,
+        'use_fleet_rand': False,
+        'fleet_rand_min': 1.0,
+        'fleet_rand_max': 1.0,
+        'use_depot_rand': False,
+        'depot_rand_min': 1.0,
+        'depot_rand_max': 1.0,
+        'render_plots': False,
+    })
+    params.set('sim_time', params['warmup_periods'] + params['analysis_periods'] + params['closing_periods'])
+    return params
+
+
+def time_event_loop(engine_cls, params):
+    """
+    Run the engine once and time only the event loop (Phase 3).
+
+    Returns
+    -------
+    tuple
+        (loop_seconds, event_counts)
+    """
+    rng = make_sim_rng(params['random_seed'])
+    allocation = calculate_initial_allocation(params, rng=rng)
+    engine = engine_cls(params=params, allocation=allocation, rng=rng)
+
+    loop = engine._process_events
+    elapsed = []
+
+    def timed_loop():
+        t0 = time.perf_counter()
+        loop()
+        elapsed.append(time.perf_counter() - t0)
+
+    engine._process_events = timed_loop
+    results = engine.run()
+    return elapsed[0], results['event_counts']
+
+
+def best_rate(engine_classes, params, repeat):
+    """
+    Alternate engines for `repeat` rounds and keep each engine's best loop time.
+
+    Returns
+    -------
+    list of tuple
+        (best_events_per_sec, event_counts) per engine class
+    """
+    best = [float('inf')] * len(engine_classes)
+    counts = [None] * len(engine_classes)
+    for _ in range(repeat):
+        for i, engine_cls in enumerate(engine_classes):
+            seconds, counts[i] = time_event_loop(engine_cls, params)
+            best[i] = min(best[i], seconds)
+    return [(c['total'] / t if t > 0 else float('nan'), c) for t, c in zip(best, counts)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per engine (best time is reported)')
+    parser.add_argument('--analysis-periods', type=int, default=None,
+                        help='Analysis periods (days; default 7800, or 4200 with --small)')
+    parser.add_argument('--small', action='store_true', help='tests/test_simulation.py parameters (24 parts)')
+    args = parser.parse_args()
+
+    build_params = build_small_params if args.small else build_production_params
+    params = build_params(args.analysis_periods) if args.analysis_periods else build_params()
+
+    (legacy_rate, legacy_counts), (table_rate, table_counts) = best_rate(
+        [LegacyDispatchEngine, SimulationEngine], params, args.repeat)
+
+    if legacy_counts != table_counts:
+        print("❌ ERROR: event counts differ between dispatch implementations")
+        print(f"  legacy: {legacy_counts}")
+        print(f"  table:  {table_counts}")
+        sys.exit(1)
+
+    print(f"Events per run: {table_counts['total']:,} (sim_time={params['sim_time']}, best of {args.repeat})")
+    print(f"  Legacy string dispatch: {legacy_rate:>12,.0f} events/sec")
+    print(f"  EventType table:        {table_rate:>12,.0f} events/sec")
+    print(f"  Speedup:                {table_rate / legacy_rate:>12.2f}x")
+
+
+if __name__ == '__main__':
+    main()
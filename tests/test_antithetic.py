@@ -0,0 +1,130 @@
+"""
+Antithetic replication pairs test (sc_replications.py, duration_sampler.py).
+
+- replication_params / run_replication put replications 2k and 2k+1 on the
+  shared stream (k,), the second one with antithetic sampling
+- on a shared stream the two runs draw every stage duration and multiplier
+  from u and 1 - u (inverse-CDF path, also with per-aircraft substreams)
+- the CI of an antithetic sweep is computed over pair_means, and n_reps is
+  rounded up to whole pairs
+
+Usage:
+    python tests/test_antithetic.py
+    python -m pytest tests/test_antithetic.py
+"""
+
+import math
+import os
+import sys
+import warnings
+
+import numpy as np
+from scipy import stats
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import sc_executor
+from allocation import make_sim_rng
+from duration_sampler import StageSamplers
+from run_sweep import build_base_params
+from sc_executor import iter_point_results, run_replication
+from sc_replications import (REPLICATION_METRICS, aggregate_replications, confidence_interval, pair_means,
+                             replication_params)
+
+warnings.simplefilter("ignore", category=FutureWarning)
+
+SAMPLER_PARAMS = {
+    'sone_dist': 'Normal', 'sone_mean': 700.0, 'sone_sd': 140.0,
+    'sthree_dist': 'Weibull', 'sthree_mean': 6.11, 'sthree_sd': 22.61,
+    'use_fleet_rand': True, 'fleet_rand_min': 0.01, 'fleet_rand_max': 1.0,
+    'use_depot_rand': True, 'depot_rand_min': 0.01, 'depot_rand_max': 1.0,
+}
+
+# Tiny fleet so each replication runs in a few milliseconds
+BASE_PARAMS = build_base_params({'n_total_aircraft': 20, 'analysis_periods': 1500, 'use_buffer': False})
+
+
+def test_replication_streams():
+    for rep in range(6):
+        assert replication_params(rep) == ((rep,), {})
+        spawn_key, overrides = replication_params(rep, antithetic=True)
+        assert spawn_key == (rep // 2,)
+        assert overrides == {'inverse_cdf': True, 'antithetic': rep % 2 == 1}
+
+    # run_replication passes the pair's stream and sampling params to the run
+    runs = []
+
+    def fake_run_scenario_point(base_params, depot_cap, n_parts, fast_mode, spawn_key=()):
+        runs.append((spawn_key, base_params.get('inverse_cdf'), base_params.get('antithetic')))
+        return {}
+
+    real = sc_executor.run_scenario_point
+    sc_executor.run_scenario_point = fake_run_scenario_point
+    try:
+        for rep in range(4):
+            assert run_replication({}, 2, 22, True, rep, antithetic=True)['replication'] == rep
+    finally:
+        sc_executor.run_scenario_point = real
+    assert runs == [((0,), True, False), ((0,), True, True), ((1,), True, False), ((1,), True, True)]
+
+
+def stage_draws(spawn_key, antithetic, crn=False, n=500):
+    """Fleet, depot and multiplier draws of a run on stream spawn_key."""
+    params = dict(SAMPLER_PARAMS, inverse_cdf=True, antithetic=antithetic, common_random_numbers=crn)
+    samplers = StageSamplers(make_sim_rng(132, *spawn_key), params)
+    if crn:
+        fleet = [samplers.fleet.next(ac_id) for _ in range(n // 10) for ac_id in range(10)]
+        fleet_mult = [samplers.fleet_multiplier.next(ac_id) for ac_id in range(n)]
+    else:
+        fleet = [samplers.fleet.next() for _ in range(n)]
+        fleet_mult = [samplers.fleet_multiplier.next() for _ in range(n)]
+    return {
+        'fleet': stats.norm.cdf(np.array(fleet), 700.0, 140.0),
+        'depot': stats.weibull_min.cdf(np.array([samplers.depot.next() for _ in range(n)]), 6.11, scale=22.61),
+        'fleet_mult': (np.array(fleet_mult) - 0.01) / 0.99,
+        'depot_mult': (np.array([samplers.depot_multiplier.next() for _ in range(n)]) - 0.01) / 0.99,
+    }
+
+
+def test_pair_draws_u_and_one_minus_u():
+    for crn in (False, True):
+        first = stage_draws((1,), antithetic=False, crn=crn)
+        second = stage_draws((1,), antithetic=True, crn=crn)
+        other_pair = stage_draws((2,), antithetic=False, crn=crn)
+        for name, u in first.items():
+            np.testing.assert_allclose(u + second[name], 1.0, atol=1e-9, err_msg=name)
+            assert not np.allclose(u, other_pair[name]), name
+            # A long stage in one run is a short one in the other
+            assert np.corrcoef(u, second[name])[0, 1] < -0.999
+
+
+def test_ci_over_pair_means():
+    results = [
+        {'replication': rep, 'count': 10, 'total_events': 100,
+         **{metric: float(value) for metric in REPLICATION_METRICS}}
+        for rep, value in enumerate([0.0, 2.0, 1.0, 5.0, 2.0, 2.0])  # pair means 1, 3, 2
+    ]
+    aggregated = aggregate_replications(results, antithetic=True)
+    ci = confidence_interval([1.0, 3.0, 2.0])
+    assert aggregated['n_reps'] == 6 and aggregated['n_pairs'] == 3
+    assert aggregated['avg_micap'] == 2.0
+    assert math.isclose(aggregated['avg_micap_ci_half'], ci['half_width'])
+    assert aggregated['avg_micap_ci_half'] != confidence_interval([0.0, 2.0, 1.0, 5.0, 2.0, 2.0])['half_width']
+
+    # Sweep: n_reps=3 runs two whole pairs; the CI is that of the pair means of the runs
+    [(_, _, _, row, error)] = iter_point_results(BASE_PARAMS, [(2, 22)], True, n_reps=3, antithetic=True)
+    assert error is None, error
+    assert row['n_reps'] == 4 and row['n_pairs'] == 2
+    values = [run_replication(BASE_PARAMS, 2, 22, True, rep, antithetic=True)['avg_micap'] for rep in range(4)]
+    ci = confidence_interval(pair_means(values))
+    assert math.isclose(row['avg_micap'], ci['mean'])
+    assert math.isclose(row['avg_micap_ci_half'], ci['half_width'])
+
+
+if __name__ == '__main__':
+    test_replication_streams()
+    print("✅ replications 2k and 2k+1 share stream (k,), the second one antithetic")
+    test_pair_draws_u_and_one_minus_u()
+    print("✅ a pair draws every stage duration and multiplier from u and 1 - u")
+    test_ci_over_pair_means()
+    print("✅ the CI is computed over pair means")
@@ -0,0 +1,87 @@
+"""
+WIP plot decimation test (ui/wip_plots.decimate_series).
+
+- a long step series keeps, in every time bucket, its first and last rows and
+  its minimum and maximum value, plus the first and last rows of the series;
+  kept points are original (x, y) pairs in time order, at most 4 per bucket
+- series with at most 4 * n_buckets points, or no time span, pass through unchanged
+
+Usage:
+    python tests/test_decimate.py
+    python -m pytest tests/test_decimate.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ui.wip_plots import decimate_series
+
+N_BUCKETS = 100
+
+
+def step_series(n, seed=3):
+    """WIP-like step series: integer times with repeats, +-1 count changes with spikes."""
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.integers(0, 3, n)).astype(float)
+    y = np.cumsum(rng.choice([-1, 1], n)) + 50
+    spikes = rng.choice(n, 20, replace=False)
+    y[spikes] += rng.choice([-40, 40], 20)
+    return x, y
+
+
+def is_subsequence(x_kept, y_kept, x, y):
+    """True if the (x, y) pairs kept appear in the original series in the same order."""
+    pairs = iter(zip(x.tolist(), y.tolist()))
+    return all(any(pair == original for original in pairs) for pair in zip(x_kept.tolist(), y_kept.tolist()))
+
+
+def test_long_series_keeps_extremes():
+    x, y = step_series(50_000)
+    x_kept, y_kept = decimate_series(pd.Series(x), pd.Series(y), n_buckets=N_BUCKETS)
+
+    assert len(x_kept) <= 4 * N_BUCKETS
+    assert (x_kept[0], y_kept[0]) == (x[0], y[0])
+    assert (x_kept[-1], y_kept[-1]) == (x[-1], y[-1])
+    assert is_subsequence(x_kept, y_kept, x, y)
+
+    edges = np.linspace(x[0], x[-1], N_BUCKETS + 1)
+    for b in range(N_BUCKETS):
+        in_bucket = (x >= edges[b]) & ((x < edges[b + 1]) | (b == N_BUCKETS - 1))
+        kept = (x_kept >= edges[b]) & ((x_kept < edges[b + 1]) | (b == N_BUCKETS - 1))
+        if not in_bucket.any():
+            assert not kept.any(), b
+            continue
+        rows = np.flatnonzero(in_bucket)
+        assert len(rows) == rows[-1] - rows[0] + 1, f"bucket {b} is not contiguous"
+        kept_pairs = set(zip(x_kept[kept].tolist(), y_kept[kept].tolist()))
+        assert (x[rows[0]], y[rows[0]]) in kept_pairs, f"bucket {b} lost its first row"
+        assert (x[rows[-1]], y[rows[-1]]) in kept_pairs, f"bucket {b} lost its last row"
+        assert y_kept[kept].min() == y[rows].min(), f"bucket {b} lost its minimum"
+        assert y_kept[kept].max() == y[rows].max(), f"bucket {b} lost its maximum"
+        assert kept.sum() <= 4, b
+
+
+def test_short_series_unchanged():
+    x, y = step_series(4 * N_BUCKETS)
+    x_out, y_out = decimate_series(x, y, n_buckets=N_BUCKETS)
+    np.testing.assert_array_equal(x_out, x)
+    np.testing.assert_array_equal(y_out, y)
+
+    # No time span: nothing to bucket
+    x_flat = np.zeros(10 * N_BUCKETS)
+    y_flat = np.arange(10 * N_BUCKETS)
+    x_out, y_out = decimate_series(x_flat, y_flat, n_buckets=N_BUCKETS)
+    np.testing.assert_array_equal(x_out, x_flat)
+    np.testing.assert_array_equal(y_out, y_flat)
+
+
+if __name__ == '__main__':
+    test_long_series_keeps_extremes()
+    print(f"✅ decimate_series keeps first/last rows and min/max of each of {N_BUCKETS} buckets")
+    test_short_series_unchanged()
+    print("✅ decimate_series returns short series unchanged")
@@ -0,0 +1,107 @@
+"""
+Packed event_path test (event_path.py).
+
+- append_event / encode_path pack one TOKEN_BITS-bit code per transition and
+  decode_path / decode_paths give back the token string, for every token,
+  the longest path a run writes and paths longer than 64 bits
+- decode_event_path_column decodes int64 and object columns in place and
+  leaves empty frames and frames without event_path alone
+- every part and aircraft record of a run re-encodes to its packed path, and
+  the exported frames hold the decoded strings
+
+Usage:
+    python tests/test_event_path.py
+    python -m pytest tests/test_event_path.py
+"""
+
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from event_path import (EVENT_TOKENS, TOKEN_BITS, EventCode, append_event, decode_event_path_column,
+                        decode_path, decode_paths, encode_path)
+from test_checkpoint import build_params, new_engine
+
+warnings.simplefilter("ignore", category=FutureWarning)
+
+
+def tokens_of(decoded):
+    return decoded.split(', ') if decoded else []
+
+
+def test_round_trip():
+    assert encode_path() == 0 and decode_path(0) == ''
+    assert len(EVENT_TOKENS) < 1 << TOKEN_BITS
+    for code, token in enumerate(EVENT_TOKENS, start=1):
+        assert EventCode[token] == code
+        assert decode_path(append_event(0, code)) == token
+
+    # Codes are packed oldest first, one TOKEN_BITS slot each
+    path = encode_path('IC_IZ_FS_FE', 'IC_FE_CF', 'CF_DE', 'DE_CA', 'CAE_IE')
+    assert path == append_event(append_event(append_event(append_event(
+        EventCode.IC_IZ_FS_FE, EventCode.IC_FE_CF), EventCode.CF_DE), EventCode.DE_CA), EventCode.CAE_IE)
+    assert path >> (4 * TOKEN_BITS) == EventCode.IC_IZ_FS_FE
+    assert decode_path(path) == 'IC_IZ_FS_FE, IC_FE_CF, CF_DE, DE_CA, CAE_IE'
+
+    # Every token in one path (well past 64 bits) and repeated tokens
+    longest = encode_path(*EVENT_TOKENS, *reversed(EVENT_TOKENS))
+    assert longest.bit_length() > 64
+    assert tokens_of(decode_path(longest)) == list(EVENT_TOKENS) + list(reversed(EVENT_TOKENS))
+    last = EVENT_TOKENS[-1]
+    assert decode_path(encode_path(last, last, last)) == ', '.join([last] * 3)
+
+
+def test_decode_paths():
+    paths = [encode_path('IC_IZ_FS_FE', 'FE_MS'), 0, encode_path('NP_CA'), encode_path('IC_IZ_FS_FE', 'FE_MS')]
+    decoded = decode_paths(np.array(paths, dtype=np.int64))
+    assert decoded.dtype == object
+    assert decoded.tolist() == ['IC_IZ_FS_FE, FE_MS', '', 'NP_CA', 'IC_IZ_FS_FE, FE_MS']
+    assert decode_paths(np.array([], dtype=np.int64)).tolist() == []
+
+    df = pd.DataFrame({'sim_id': range(4), 'event_path': paths})
+    assert df['event_path'].dtype == np.int64
+    assert decode_event_path_column(df) is df
+    assert df['event_path'].tolist() == decoded.tolist()
+
+    # Paths above int64 are kept as Python ints (object column)
+    longest = encode_path(*EVENT_TOKENS)
+    df = pd.DataFrame({'event_path': [longest, paths[0]]})
+    assert decode_event_path_column(df)['event_path'].tolist() == [', '.join(EVENT_TOKENS), 'IC_IZ_FS_FE, FE_MS']
+
+    empty = pd.DataFrame(columns=['sim_id', 'event_path'])
+    assert decode_event_path_column(empty).empty
+    no_path = pd.DataFrame({'sim_id': [1, 2]})
+    assert decode_event_path_column(no_path).columns.tolist() == ['sim_id']
+
+
+def test_run_records():
+    engine = new_engine(build_params(time_weighted_averages=False))
+    engine.run()
+    part_manager, ac_manager = engine.part_manager, engine.ac_manager
+    longest = ''
+    for records, frame in (
+            (part_manager.part_log, part_manager.export_completed_cycles()),
+            (ac_manager.ac_log, ac_manager.exp_log_cycles())):
+        raw = [record['event_path'] for record in records]
+        assert frame['event_path'].tolist() == [decode_path(path) for path in raw]
+        for path in set(raw):
+            decoded = decode_path(path)
+            assert encode_path(*tokens_of(decoded)) == path
+            longest = max(longest, decoded, key=lambda s: len(tokens_of(s)))
+    # The longest path of the run: a part through Condition F, depot and Condition A
+    assert len(tokens_of(longest)) >= 5, longest
+
+
+if __name__ == '__main__':
+    test_round_trip()
+    print("✅ encode_path / decode_path round-trip every token and paths past 64 bits")
+    test_decode_paths()
+    print("✅ decode_paths / decode_event_path_column decode int and object columns")
+    test_run_records()
+    print("✅ run records re-encode to their packed paths")
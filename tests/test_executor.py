@@ -0,0 +1,56 @@
+"""
+Parallel sweep test (sc_executor.iter_point_results).
+
+- a small grid run serially (max_workers=1) and on a process pool
+  (max_workers=2) gives the same result rows once put in grid order with
+  order_results, for metrics-only and record-based runs
+- every point is yielded once, with its own grid index
+
+Usage:
+    python tests/test_executor.py
+    python -m pytest tests/test_executor.py
+"""
+
+import os
+import sys
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from run_sweep import build_base_params
+from sc_executor import build_scenario_grid, iter_point_results, order_results
+
+warnings.simplefilter("ignore", category=FutureWarning)
+
+# Tiny fleet so each point runs in a few milliseconds
+BASE_PARAMS = build_base_params({'n_total_aircraft': 20, 'analysis_periods': 1500, 'use_buffer': False})
+GRID = build_scenario_grid([2, 3], [21, 22, 24])
+
+
+def run_grid(base_params, max_workers):
+    """Results of GRID in grid order, checking each yielded index matches its point."""
+    results = {}
+    for grid_index, depot_cap, n_parts, result, error in iter_point_results(
+            base_params, GRID, True, max_workers=max_workers):
+        assert error is None, error
+        assert GRID[grid_index] == (depot_cap, n_parts)
+        assert grid_index not in results, f"point {grid_index} yielded twice"
+        results[grid_index] = result
+    assert sorted(results) == list(range(len(GRID)))
+    return order_results(results)
+
+
+def test_serial_equals_parallel():
+    record_based = dict(BASE_PARAMS, time_weighted_averages=False, metrics_only=False)
+    for base_params in (BASE_PARAMS, record_based):
+        serial = run_grid(base_params, max_workers=1)
+        parallel = run_grid(base_params, max_workers=2)
+        assert [(row['depot_capacity'], row['n_total_parts']) for row in serial] == GRID
+        assert serial == parallel
+    # The grid points do differ, so equal rows are not a degenerate pass
+    assert len({row['avg_micap'] for row in serial}) > 1
+
+
+if __name__ == '__main__':
+    test_serial_equals_parallel()
+    print("✅ serial and parallel sweeps give the same rows in grid order")
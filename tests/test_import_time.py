@@ -0,0 +1,71 @@
+"""
+Import-time budget for the simulation core.
+
+Headless workers (run_sweep.py, the scenario process pool) import the engine,
+managers, allocation and metrics before simulating anything. These must not
+pull in Streamlit or matplotlib (plotting is imported only when PostSim renders
+figures), and a cold `import simulation_engine` must stay under
+IMPORT_BUDGET_S.
+
+Each check runs in a fresh interpreter so nothing is already imported.
+
+Usage:
+    python tests/test_import_time.py
+    python -m pytest tests/test_import_time.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Seconds for a cold `import simulation_engine` (numpy + pandas dominate)
+IMPORT_BUDGET_S = 1.0
+# Best of N fresh interpreters, to ignore one-off disk/cache stalls
+IMPORT_TRIES = 3
+
+HEADLESS_MODULES = ('simulation_engine', 'allocation', 'post_sim', 'ds.stats', 'sc_utils', 'sc_executor')
+FORBIDDEN_MODULES = ('streamlit', 'matplotlib')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed,
+                  'loaded': [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+
+def cold_import(module):
+    """Import module in a fresh interpreter; returns {'seconds', 'loaded'}."""
+    code = PROBE.format(module=module, forbidden=FORBIDDEN_MODULES)
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_headless_modules_skip_ui_imports():
+    for module in HEADLESS_MODULES:
+        loaded = cold_import(module)['loaded']
+        assert not loaded, f"import {module} loads {', '.join(loaded)}"
+
+
+def check_engine_import_budget():
+    """Best cold `import simulation_engine` time over IMPORT_TRIES interpreters; fails above budget."""
+    seconds = min(cold_import('simulation_engine')['seconds'] for _ in range(IMPORT_TRIES))
+    assert seconds <= IMPORT_BUDGET_S, (
+        f"cold import simulation_engine took {seconds:.3f}s (budget {IMPORT_BUDGET_S}s)")
+    return seconds
+
+
+def test_engine_import_budget():
+    check_engine_import_budget()
+
+
+if __name__ == '__main__':
+    test_headless_modules_skip_ui_imports()
+    print(f"✅ {', '.join(HEADLESS_MODULES)} import without {', '.join(FORBIDDEN_MODULES)}")
+    seconds = check_engine_import_budget()
+    print(f"✅ cold import simulation_engine: {seconds:.3f}s (budget {IMPORT_BUDGET_S}s)")
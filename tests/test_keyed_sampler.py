@@ -0,0 +1,98 @@
+"""
+Common random numbers test (duration_sampler.KeyedSampler).
+
+- two scenarios with the same seed and common_random_numbers (different depot
+  capacity / part count) draw identical fleet durations per aircraft
+- KeyedSampler drops tiles no key is positioned in: the number of live tiles
+  stays bounded by the number of keys over a long run, and every value (also
+  from a tile redrawn for a key that starts late) equals the value of a
+  sampler that never drops tiles
+
+Usage:
+    python tests/test_keyed_sampler.py
+    python -m pytest tests/test_keyed_sampler.py
+"""
+
+import os
+import sys
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from duration_sampler import KeyedSampler, StageDurationSampler
+from test_checkpoint import build_params, new_engine
+
+warnings.simplefilter("ignore", category=FutureWarning)
+
+
+def fleet_draws(**overrides):
+    """Run with common random numbers and return {ac_id: [fleet durations in draw order]}."""
+    engine = new_engine(build_params(common_random_numbers=True, **overrides))
+    fleet = engine.samplers.fleet
+    draw = fleet.next
+    draws = {}
+
+    def recording_next(key):
+        value = draw(key)
+        draws.setdefault(key, []).append(value)
+        return value
+
+    fleet.next = recording_next
+    engine.run()
+    return draws
+
+
+def reference_value(seed_seq, sampler, key, n, rows, depth):
+    """n-th value of key drawn straight from its tile stream (no caching)."""
+    chunk, row = divmod(key, rows)
+    column, offset = divmod(n, depth)
+    child = np.random.SeedSequence(seed_seq.entropy, spawn_key=seed_seq.spawn_key + (chunk, column))
+    return sampler.sample(np.random.default_rng(child), (rows, depth))[row, offset]
+
+
+def test_scenarios_share_per_key_draws():
+    base = fleet_draws(depot_capacity=8)
+    other = fleet_draws(depot_capacity=5, condemn_cycle=12)
+    assert set(base) == set(other)
+    for ac_id, values in base.items():
+        n = min(len(values), len(other[ac_id]))
+        assert n > 1
+        assert values[:n] == other[ac_id][:n], f"ac_id {ac_id} draws differ between scenarios"
+
+
+def test_tiles_are_dropped():
+    rows, depth = 8, 4
+    seed_seq = np.random.SeedSequence(132, spawn_key=(0,))
+    sampler = StageDurationSampler(None, 'Normal', 700.0, 140.0)
+    keyed = KeyedSampler(seed_seq, sampler, rows=rows, depth=depth)
+    rng = np.random.default_rng(5)
+
+    keys = list(range(20))  # 3 chunks, the last one partly filled
+    taken = {}
+    max_tiles = 0
+    for step in range(5000):
+        if step == 2500:
+            keys.append(3 * rows + 1)  # starts in column 0 long after that tile was dropped
+        key = keys[int(rng.integers(len(keys)))]
+        n = taken.get(key, 0)
+        value = keyed.next(key)
+        taken[key] = n + 1
+        assert value == reference_value(seed_seq, sampler, key, n, rows, depth), (key, n)
+        max_tiles = max(max_tiles, len(keyed.tiles))
+
+    # At most one live tile per key (~ 5000 / 21 / 4 = 60 columns were used per key)
+    assert max_tiles <= len(keys), max_tiles
+    assert set(keyed.tiles) == set(keyed.tile_users)
+    live = {(key // rows, taken[key] // depth) for key in keys}
+    assert set(keyed.tiles) <= live
+    assert sum(keyed.tile_users.values()) == sum(1 for key in keys if taken[key] % depth)
+
+
+if __name__ == '__main__':
+    test_scenarios_share_per_key_draws()
+    print("✅ scenarios with the same seed draw the same per-aircraft fleet durations")
+    test_tiles_are_dropped()
+    print("✅ KeyedSampler drops consumed tiles and redraws them with the same values")
@@ -0,0 +1,128 @@
+"""
+Adaptive depot x parts search test (sc_optimizer.py).
+
+The simulation is replaced by a scripted Avg MICAP table (sc_optimizer's
+iter_point_results), so every search path can be forced:
+
+- bisection finds the smallest feasible n_total_parts per depot
+- bounds are shared between depot levels (an infeasible point at a larger
+  depot is a lower bound for smaller ones)
+- with non-monotone (noisy) MICAP an upper bound from another depot that a
+  depot's own run refuted is not inherited: every reported answer was run at
+  its own depot and met the target, and 'best' is always feasible
+- pareto_frontier keeps exactly the non-dominated rows
+
+Usage:
+    python tests/test_optimizer.py
+    python -m pytest tests/test_optimizer.py
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import sc_optimizer
+from sc_optimizer import pareto_frontier, search_min_parts
+
+TARGET = 0.5
+
+
+@contextmanager
+def scripted_micap(min_parts, calls=None):
+    """
+    Run search_min_parts against avg_micap = 0 when parts >= min_parts[depot], else 1.
+    Evaluated (depot, parts) points are appended to calls.
+    """
+    def fake_iter_point_results(base_params, points, fast_mode, **kwargs):
+        for index, (depot, n_parts) in enumerate(points):
+            if calls is not None:
+                calls.append((depot, n_parts))
+            avg_micap = 0.0 if n_parts >= min_parts[depot] else 1.0
+            yield index, depot, n_parts, {'depot_capacity': depot, 'n_total_parts': n_parts,
+                                          'avg_micap': avg_micap}, None
+
+    real = sc_optimizer.iter_point_results
+    sc_optimizer.iter_point_results = fake_iter_point_results
+    try:
+        yield
+    finally:
+        sc_optimizer.iter_point_results = real
+
+
+def test_bisection():
+    true_min = {2: 100, 3: 40, 4: 31, 5: 31, 6: 12}  # 100: above parts_max
+    calls = []
+    with scripted_micap(true_min, calls):
+        results = search_min_parts({}, list(true_min), 10, 63, TARGET, depot_cost=2.0, part_cost=1.0)
+    assert results['min_parts'] == {2: None, 3: 40, 4: 31, 5: 31, 6: 12}
+    assert len(calls) == len(set(calls)), "a point was evaluated twice"
+    assert len(calls) < 5 * 10, len(calls)  # log2(54) ~ 6 per depot
+    evaluations = results['evaluations']
+    assert (evaluations['feasible'] == (evaluations['avg_micap'] <= TARGET)).all()
+    assert sorted(results['candidates']['depot_capacity']) == [3, 4, 5, 6]
+    assert results['best']['depot_capacity'] == 6 and results['best']['cost'] == 2.0 * 6 + 12
+    assert results['errors'] == []
+
+
+def test_bound_sharing():
+    # Monotone MICAP: shared bounds agree with every depot's own search
+    true_min = {1: 60, 2: 60, 3: 40, 4: 40, 5: 40, 6: 40, 7: 20, 8: 20}
+    with scripted_micap(true_min):
+        assert search_min_parts({}, list(true_min), 0, 127, TARGET)['min_parts'] == true_min
+
+    # An infeasible point at a larger depot is a lower bound for smaller depots: depot 2
+    # misses at 8 parts in round 0, so depot 1 stops at its feasible 8 without trying below
+    calls = []
+    with scripted_micap({1: 5, 2: 9}, calls):
+        results = search_min_parts({}, [1, 2], 0, 15, TARGET)
+    assert results['min_parts'] == {1: 8, 2: 9}
+    assert [n_parts for depot, n_parts in calls if depot == 1] == [8]
+
+
+def test_inherited_answer_confirmed():
+    # Non-monotone (noisy) MICAP: depot 3 misses at 8 parts where depots 1 and 2 meet the
+    # target, so their upper bound of 8 must not become depot 3's answer
+    for true_min in ({1: 0, 2: 0, 3: 9}, {1: 0, 2: 0, 3: 1}, {1: 3, 2: 0, 3: 5}):
+        calls = []
+        with scripted_micap(true_min, calls):
+            results = search_min_parts({}, [1, 2, 3], 0, 15, TARGET, depot_cost=0.0, part_cost=1.0)
+        for depot, n_parts in results['min_parts'].items():
+            assert n_parts >= true_min[depot], (true_min, results['min_parts'])
+            assert (depot, n_parts) in calls, "answer was not run at its own depot"
+        assert results['min_parts'][3] == true_min[3]
+        assert results['candidates']['feasible'].all()
+        assert results['best']['feasible']
+
+
+def test_pareto_frontier():
+    df = pd.DataFrame({
+        'depot_capacity': [2, 2, 3, 3, 4, 4, 2],
+        'n_total_parts':  [40, 50, 30, 40, 30, 20, 40],
+        'avg_micap':      [0.2, 0.1, 0.4, 0.4, 0.3, 0.9, 0.2],
+        'tag':            ['a', 'b', 'c', 'dominated', 'e', 'f', 'a_dup'],
+    })
+    frontier = pareto_frontier(df)
+    # (3, 40, 0.4) is dominated by (3, 30, 0.4); equal rows do not dominate each other
+    assert sorted(frontier['tag']) == ['a', 'a_dup', 'b', 'c', 'e', 'f']
+    assert list(frontier.columns) == list(df.columns)
+    ordered = frontier[['depot_capacity', 'n_total_parts', 'avg_micap']].to_records(index=False).tolist()
+    assert ordered == sorted(ordered)
+
+    # Two columns: (30, 0.4) and (40, 0.4) now lose to (30, 0.3)
+    frontier_2d = pareto_frontier(df, columns=('n_total_parts', 'avg_micap'))
+    assert sorted(frontier_2d['tag']) == ['a', 'a_dup', 'b', 'e', 'f']
+
+
+if __name__ == '__main__':
+    test_bisection()
+    print("✅ bisection finds the smallest feasible parts per depot")
+    test_bound_sharing()
+    print("✅ bounds are shared between depot levels")
+    test_inherited_answer_confirmed()
+    print("✅ only answers run at their own depot and meeting the target are reported")
+    test_pareto_frontier()
+    print("✅ pareto_frontier keeps the non-dominated rows")
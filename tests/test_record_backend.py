@@ -0,0 +1,153 @@
+"""
+Dict vs columnar record backend test.
+
+Runs the same configuration with params['record_backend'] = 'dict' and
+'columnar' and checks the exported frames hold the same rows. The columnar
+backend returns rows in sim_id/des_id order with int32 IDs, so rows are
+sorted by key and integer widths are not compared.
+
+The aircraft managers are also compared directly: AircraftManager and
+ColumnarAircraftManager get the same scripted add/update/complete sequence
+and must return the same records, exports and WIP frames.
+
+Usage:
+    python tests/test_record_backend.py
+    python -m pytest tests/test_record_backend.py
+"""
+
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from entity_ac import AircraftManager, ColumnarAircraftManager
+from event_path import append_event, encode_path, EventCode
+from test_checkpoint import build_params, new_engine
+
+warnings.simplefilter("ignore", category=FutureWarning)
+
+# Frame name -> sort key (None: already in time order)
+FRAMES = {
+    'all_parts_df': 'sim_id',
+    'all_ac_df': 'des_id',
+    'wip_df': None,
+    'wip_raw': None,
+    'wip_ac_df': None,
+    'wip_ac_raw': None,
+}
+
+
+def assert_same_rows(df_dict, df_columnar, key, name):
+    if key is not None:
+        df_dict = df_dict.sort_values(key).reset_index(drop=True)
+        df_columnar = df_columnar.sort_values(key).reset_index(drop=True)
+    pd.testing.assert_frame_equal(df_dict, df_columnar, check_exact=True, check_dtype=False, obj=name)
+    # Same dtype kinds (int64 vs int32 is fine, int vs float is not)
+    assert [d.kind for d in df_dict.dtypes] == [d.kind for d in df_columnar.dtypes], name
+
+
+def check_backends(**overrides):
+    results = {
+        backend: new_engine(build_params(record_backend=backend, **overrides)).run()
+        for backend in ('dict', 'columnar')
+    }
+    expected, actual = results['dict'], results['columnar']
+    assert expected['event_counts'] == actual['event_counts']
+    assert expected['post_sim'].multi_run_averages == actual['post_sim'].multi_run_averages
+    assert expected['datasets'].duration_stats == actual['datasets'].duration_stats
+    for name, key in FRAMES.items():
+        assert_same_rows(getattr(expected['datasets'], name), getattr(actual['datasets'], name), key, name)
+    return expected['event_counts']['total']
+
+
+def run_aircraft_script(manager, n_aircraft=25, n_cycles=300, seed=7):
+    """
+    Drive an aircraft manager through initial fleet cycles, then random
+    fleet end -> (MICAP) -> install -> new fleet cycle transitions.
+
+    Returns
+    -------
+    float
+        Last simulated time
+    """
+    rng = np.random.default_rng(seed)
+    current = {}
+    for ac_id in range(n_aircraft):
+        fleet_end = float(rng.uniform(5.0, 60.0))
+        result = manager.add_initial_ac(ac_id, event_path=encode_path('IC_IZ_FS_FE'), fleet_start=0.0,
+                                        fleet_end=fleet_end, fleet_duration=fleet_end, simone_id=ac_id, partone_id=ac_id)
+        current[ac_id] = result['des_id']
+    assert not manager.add_ac(current[0], 0)['success'], "duplicate des_id must be refused"
+    assert not manager.update_fields(10 ** 6, {'micap_start': 1.0}), "unknown des_id must not update"
+
+    clock = 0.0
+    for _ in range(n_cycles):
+        ac_id = int(rng.integers(n_aircraft))
+        des_id = current[ac_id]
+        record = manager.get_ac(des_id)
+        start = record['fleet_end']
+        path = record['event_path']
+        if rng.random() < 0.4:
+            micap_end = start + float(rng.uniform(0.0, 20.0))
+            path = append_event(path, EventCode.FE_MS)
+            manager.update_fields(des_id, {'event_path': path, 'micap_start': start,
+                                           'micap_end': micap_end, 'micap_duration': micap_end - start})
+            start = micap_end
+        part_id = int(rng.integers(1000))
+        manager.update_fields(des_id, {'event_path': append_event(path, EventCode.FE_IE), 'install_start': start,
+                                       'install_end': start, 'install_duration': 0.0,
+                                       'simtwo_id': part_id, 'parttwo_id': part_id})
+        manager.complete_ac_cycle(des_id)
+
+        new_des_id = manager.get_next_des_id()
+        fleet_end = start + float(rng.uniform(5.0, 60.0))
+        manager.add_ac(new_des_id, ac_id, event_path=encode_path('CAP_CR_FS_FE'), fleet_start=start,
+                       fleet_end=fleet_end, fleet_duration=fleet_end - start, simone_id=part_id, partone_id=part_id)
+        current[ac_id] = new_des_id
+        clock = max(clock, fleet_end)
+    return clock
+
+
+def test_aircraft_managers_match():
+    managers = {'dict': AircraftManager(), 'columnar': ColumnarAircraftManager()}
+    sim_time = {name: run_aircraft_script(manager) for name, manager in managers.items()}
+    assert sim_time['dict'] == sim_time['columnar']
+    expected, actual = managers['dict'], managers['columnar']
+
+    assert sorted(expected.get_all_active_ac()) == sorted(actual.get_all_active_ac())
+    for des_id, record in expected.get_all_active_ac().items():
+        view = actual.get_ac(des_id)
+        for field, value in record.items():
+            assert value == view[field] or (pd.isna(value) and pd.isna(view[field])), (des_id, field)
+
+    for name in ('exp_active_ac', 'exp_log_cycles', 'get_all_ac_data_df'):
+        assert_same_rows(getattr(expected, name)(), getattr(actual, name)(), 'des_id', name)
+    expected.freeze_records()
+    actual.freeze_records()
+    assert_same_rows(expected.get_all_ac_data_df(), actual.get_all_ac_data_df(), 'des_id', 'frozen get_all_ac_data_df')
+    assert_same_rows(expected.get_wip_ac_raw(), actual.get_wip_ac_raw(), None, 'wip_ac_raw')
+    end = int(np.ceil(sim_time['dict']))
+    assert_same_rows(expected.get_wip_ac_end(end, 1), actual.get_wip_ac_end(end, 1), None, 'wip_ac_end')
+    assert expected.get_wip_ac_time_avg(50.0, end - 50.0) == actual.get_wip_ac_time_avg(50.0, end - 50.0)
+
+
+def test_backends_match():
+    check_backends()
+
+
+def test_backends_match_stream_wip():
+    check_backends(stream_wip=True)
+
+
+if __name__ == '__main__':
+    n_events = check_backends()
+    print(f"✅ dict and columnar backends export the same rows ({n_events} events)")
+    check_backends(stream_wip=True)
+    print("✅ dict and columnar backends match with streaming WIP")
+    test_aircraft_managers_match()
+    print("✅ AircraftManager and ColumnarAircraftManager return the same records")
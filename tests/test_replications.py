@@ -0,0 +1,168 @@
+"""
+Replication test (sc_replications.py and the replicated sweep in sc_executor.py).
+
+- confidence_interval: mean, standard error and Student-t half-width
+- additional_replications: next batch ~ (t * s / target)^2, stops at the
+  target half-width, at max_reps, for a fixed R and on NaN metrics
+- threshold_replications: doubles while the CI contains the threshold
+- aggregate_replications: mean / se / CI columns, n_reps, summed events
+- a replicated sweep runs the same replications (and gives the same rows) on
+  1 and 3 workers: each batch size depends only on the finished replications
+
+Usage:
+    python tests/test_replications.py
+    python -m pytest tests/test_replications.py
+"""
+
+import math
+import os
+import sys
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from run_sweep import build_base_params
+from sc_executor import iter_point_results, order_results, run_replication
+from sc_replications import (REPLICATION_METRICS, additional_replications, aggregate_replications,
+                             confidence_interval, threshold_replications)
+
+warnings.simplefilter("ignore", category=FutureWarning)
+
+T_975_DF3 = 3.182446305284263  # Student t 97.5% quantile, 3 degrees of freedom
+
+# Tiny fleet so each replication runs in a few milliseconds
+BASE_PARAMS = build_base_params({'n_total_aircraft': 20, 'analysis_periods': 1500, 'use_buffer': False})
+POINTS = [(2, 22), (2, 24), (3, 22), (3, 24), (2, 21)]
+
+
+def test_confidence_interval():
+    ci = confidence_interval([1.0, 2.0, 3.0, 4.0])
+    se = math.sqrt(5 / 3) / 2  # sample sd / sqrt(n)
+    assert ci['mean'] == 2.5
+    assert math.isclose(ci['se'], se)
+    assert math.isclose(ci['half_width'], T_975_DF3 * se)
+    assert math.isclose(ci['low'], 2.5 - T_975_DF3 * se) and math.isclose(ci['high'], 2.5 + T_975_DF3 * se)
+
+    # A wider confidence level widens the interval; one value has no spread estimate
+    assert confidence_interval([1.0, 2.0, 3.0, 4.0], confidence=0.99)['half_width'] > ci['half_width']
+    single = confidence_interval([0.3])
+    assert single['mean'] == 0.3 and all(math.isnan(single[k]) for k in ('se', 'half_width', 'low', 'high'))
+
+
+def test_additional_replications():
+    values = [1.0, 2.0, 3.0, 4.0]
+    half_width = confidence_interval(values)['half_width']  # ~2.05
+    std = math.sqrt(5 / 3)
+
+    # Fixed R, target met, or max_reps reached: no more replications
+    assert additional_replications(values, None, 100) == 0
+    assert additional_replications(values, half_width, 100) == 0
+    assert additional_replications(values, 0.01, 4) == 0
+    assert additional_replications([np.nan, np.nan, np.nan], 0.01, 100) == 0
+
+    # Fewer than 2 values: run up to 2 first
+    assert additional_replications([], 0.01, 100) == 2
+    assert additional_replications([1.0], 0.01, 100) == 1
+    assert additional_replications([1.0], 0.01, 1) == 0
+
+    # Next batch: n ~ (t * s / target)^2 minus the replications already run, capped by max_reps
+    target = 1.0
+    needed = math.ceil((T_975_DF3 * std / target) ** 2)
+    assert additional_replications(values, target, 100) == needed - 4 == 13
+    assert additional_replications(values, target, 10) == 6
+    # At least one more replication while the half-width is above target
+    assert additional_replications(values, half_width * 0.999, 100) == 1
+
+    # Antithetic: CI over pair means, whole pairs added
+    pairs = [0.0, 2.0, 1.0, 5.0, 2.0, 2.0, 4.0, 6.0]  # pair means 1, 3, 2, 5
+    assert additional_replications(pairs, target, 200, antithetic=True) == 2 * (
+        additional_replications([1.0, 3.0, 2.0, 5.0], target, 100))
+    assert additional_replications(pairs, target, 9, antithetic=True) == 0  # 9 // 2 = 4 pairs run
+
+
+def test_threshold_replications():
+    values = [1.0, 2.0, 3.0, 4.0]  # CI ~ [0.45, 4.55]
+    assert threshold_replications(values, 2.0, 100) == 4  # contains the threshold: double
+    assert threshold_replications(values, 2.0, 6) == 2
+    assert threshold_replications(values, 2.0, 4) == 0
+    assert threshold_replications(values, 5.0, 100) == 0  # decided
+    assert threshold_replications(values, 0.1, 100) == 0
+    assert threshold_replications([1.0], 2.0, 100) == 1
+
+
+def test_aggregate_replications():
+    results = [
+        {'replication': rep, 'count': 10 + rep, 'total_events': 100, 'cache_hit': rep != 2,
+         **{metric: float(rep + i) for i, metric in enumerate(REPLICATION_METRICS)}}
+        for rep in (3, 1, 0, 2)  # completion order
+    ]
+    aggregated = aggregate_replications(results)
+    assert aggregated['n_reps'] == 4 and 'replication' not in aggregated
+    assert aggregated['total_events'] == 400
+    assert aggregated['count'] == 11.5
+    assert aggregated['cache_hit'] is False
+    ci = confidence_interval([0.0, 1.0, 2.0, 3.0])
+    for i, metric in enumerate(REPLICATION_METRICS):
+        assert math.isclose(aggregated[metric], ci['mean'] + i)
+        assert math.isclose(aggregated[f'{metric}_se'], ci['se'])
+        assert math.isclose(aggregated[f'{metric}_ci_half'], ci['half_width'])
+        assert math.isclose(aggregated[f'{metric}_ci_low'], ci['low'] + i)
+        assert math.isclose(aggregated[f'{metric}_ci_high'], ci['high'] + i)
+
+
+def run_sweep(max_workers, target_half_width, max_reps):
+    rows = {}
+    for grid_index, _, _, result, error in iter_point_results(
+            BASE_PARAMS, POINTS, True, max_workers=max_workers,
+            n_reps=2, max_reps=max_reps, target_half_width=target_half_width):
+        assert error is None, error
+        rows[grid_index] = result
+    return order_results(rows)
+
+
+def replayed_reps(values, target_half_width, max_reps):
+    """Replications the stopping rule runs given each replication's value (n_reps=2)."""
+    n = 2
+    while True:
+        batch = additional_replications(values[:n], target_half_width, max_reps)
+        if not batch:
+            return n
+        n += batch
+
+
+def test_batches_independent_of_workers():
+    target_half_width, max_reps = 0.01, 8
+    serial = run_sweep(1, target_half_width, max_reps)
+    parallel = run_sweep(3, target_half_width, max_reps)
+    assert [row['n_reps'] for row in serial] == [row['n_reps'] for row in parallel]
+    for row_serial, row_parallel in zip(serial, parallel):
+        for metric in REPLICATION_METRICS:
+            assert row_serial[metric] == row_parallel[metric]
+            assert row_serial[f'{metric}_ci_half'] == row_parallel[f'{metric}_ci_half']
+
+    n_reps = []
+    for (depot_cap, n_parts), row in zip(POINTS, serial):
+        values = [run_replication(BASE_PARAMS, depot_cap, n_parts, True, rep)['avg_micap']
+                  for rep in range(max_reps)]
+        assert row['n_reps'] == replayed_reps(values, target_half_width, max_reps)
+        assert row['n_reps'] == max_reps or row['avg_micap_ci_half'] <= target_half_width
+        n_reps.append(row['n_reps'])
+    # The sweep covers all three stopping cases: first batch, later batch, max_reps
+    assert min(n_reps) == 2 and max(n_reps) == max_reps
+    assert any(2 < n < max_reps for n in n_reps), n_reps
+    assert any(row['n_reps'] == max_reps and row['avg_micap_ci_half'] > target_half_width for row in serial)
+
+
+if __name__ == '__main__':
+    test_confidence_interval()
+    print("✅ confidence_interval gives the Student-t half-width")
+    test_additional_replications()
+    print("✅ additional_replications sizes batches and stops at the target or max_reps")
+    test_threshold_replications()
+    print("✅ threshold_replications doubles while the CI contains the threshold")
+    test_aggregate_replications()
+    print("✅ aggregate_replications builds mean / se / CI columns")
+    test_batches_independent_of_workers()
+    print("✅ replicated sweep runs the same replications on 1 and 3 workers")
@@ -0,0 +1,125 @@
+"""
+Scenario result cache test (sc_cache.py).
+
+- cache_key is stable: independent of dict order, numpy vs Python scalars and
+  the interpreter (fresh process, different hash seed), unchanged by
+  CACHE_EXCLUDED_KEYS, and different for any change in params, spawn_key or
+  fast_mode
+- code_version hashes the figure modules whose PNG bytes full-mode results hold
+- ResultCache evicts least recently used entries once above max_bytes
+
+Usage:
+    python tests/test_result_cache.py
+    python -m pytest tests/test_result_cache.py
+"""
+
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import types
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import sc_cache
+from sc_cache import CACHE_EXCLUDED_KEYS, FIGURE_SOURCES, ResultCache, cache_key
+
+PARAMS = {
+    'n_total_parts': 130,
+    'n_total_aircraft': 120,
+    'depot_capacity': 8,
+    'mission_capable_rate': 0.92,
+    'sone_dist': 'Normal',
+    'sone_mean': 700.0,
+    'random_seed': 132,
+    'use_buffer': True,
+}
+
+KEY_PROBE = """
+import json, sys
+sys.path.insert(0, {root!r})
+from sc_cache import cache_key
+print(cache_key(json.loads({params!r}), (3, 1), True))
+"""
+
+
+def test_cache_key_stable():
+    key = cache_key(PARAMS, (3, 1), True)
+    assert key == cache_key(dict(reversed(list(PARAMS.items()))), (3, 1), True)
+    numpy_params = dict(PARAMS, n_total_parts=np.int64(130), sone_mean=np.float64(700.0), use_buffer=np.bool_(True))
+    assert key == cache_key(numpy_params, (3, 1), True)
+    assert key == cache_key(dict(PARAMS, **{k: 'ignored' for k in CACHE_EXCLUDED_KEYS}), (3, 1), True)
+
+    code = KEY_PROBE.format(root=ROOT, params=json.dumps(PARAMS))
+    env = dict(os.environ, PYTHONHASHSEED='12345')
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, env=env)
+    assert out.stdout.strip() == key, "cache_key differs between interpreters"
+
+
+def test_cache_key_changes():
+    key = cache_key(PARAMS, (3, 1), True)
+    changed = [
+        cache_key(dict(PARAMS, depot_capacity=9), (3, 1), True),
+        cache_key(dict(PARAMS, sone_mean=700.0000001), (3, 1), True),
+        cache_key(dict(PARAMS, common_random_numbers=True), (3, 1), True),
+        cache_key(PARAMS, (3, 2), True),
+        cache_key(PARAMS, (), True),
+        cache_key(PARAMS, (3, 1), False),
+    ]
+    assert key not in changed
+    assert len(set(changed)) == len(changed)
+
+
+def test_code_version_covers_figure_modules():
+    files = {os.path.relpath(path, ROOT).replace(os.sep, '/') for path in sc_cache._source_files(ROOT)}
+    for name in FIGURE_SOURCES:
+        assert os.path.exists(os.path.join(ROOT, name)), name
+        assert name in files, name
+    assert 'simulation_engine.py' in files and 'ds/streaming.py' in files
+
+
+def test_lru_eviction():
+    entry = {'value': 'x' * 1000}
+    size = len(pickle.dumps(dict(entry, i=0), protocol=pickle.HIGHEST_PROTOCOL))
+    real_time = sc_cache.time
+    ticks = iter(range(1, 1000))
+    # Strictly increasing access times, so LRU order does not depend on clock resolution
+    sc_cache.time = types.SimpleNamespace(time=lambda: float(next(ticks)))
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ResultCache(tmp_dir, max_bytes=3 * size + size // 2)
+            for i in range(3):
+                cache.put(f'k{i}', dict(entry, i=i))
+            assert cache.stats()['entries'] == 3
+            assert cache.get('k0')['i'] == 0  # k0 is now the most recently used
+
+            cache.put('k3', dict(entry, i=3))  # over the limit: evicts k1 (least recently used)
+            assert cache.get('k1') is None
+            assert [cache.get(k)['i'] for k in ('k0', 'k2', 'k3')] == [0, 2, 3]
+            assert cache.stats()['entries'] == 3
+            assert cache.stats()['size_bytes'] <= cache.max_bytes
+
+            cache.put('big', {'value': 'y' * (4 * size)})  # larger than max_bytes: everything goes
+            assert cache.stats()['entries'] == 0
+            assert cache.get('missing') is None
+
+            cache.put('k4', dict(entry, i=4))
+            cache.clear()
+            assert cache.stats() == {'entries': 0, 'size_bytes': 0}
+    finally:
+        sc_cache.time = real_time
+
+
+if __name__ == '__main__':
+    test_cache_key_stable()
+    test_cache_key_changes()
+    print("✅ cache_key is stable across dict order, numpy scalars and interpreters, and changes with the run")
+    test_code_version_covers_figure_modules()
+    print(f"✅ code_version hashes {', '.join(FIGURE_SOURCES)}")
+    test_lru_eviction()
+    print("✅ ResultCache evicts least recently used entries above max_bytes")
@@ -0,0 +1,136 @@
+"""
+Headless sweep CLI test (run_sweep.py).
+
+- --resume skips the (depot, parts) points already in the output and runs the rest
+- an existing output without --resume/--overwrite, and a resume with different
+  settings (<output>.meta.json), are refused
+- a .parquet output resumes the same way; without pyarrow the sweep exits
+  before running any point
+- append_rows keeps columns the existing CSV header lacks
+
+Usage:
+    python tests/test_run_sweep.py
+    python -m pytest tests/test_run_sweep.py
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from run_sweep import append_rows, main
+
+# Tiny fleet so each point runs in a few milliseconds
+CONFIG = {
+    'params': {'n_total_aircraft': 20, 'analysis_periods': 1500, 'use_buffer': False},
+    'depot_capacity': [2, 3],
+    'n_total_parts': [22, 24],
+}
+
+
+def run_main(tmp_dir, config, *args, output='results.csv'):
+    """Write config and run main() in tmp_dir. Returns (exit code, stdout)."""
+    config_path = os.path.join(tmp_dir, 'sweep.json')
+    with open(config_path, 'w') as f:
+        json.dump(config, f)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        code = main([config_path, '-o', os.path.join(tmp_dir, output), '-w', '1', '-q', *args])
+    return code, out.getvalue()
+
+
+def assert_refused(tmp_dir, config, *args, match, output='results.csv'):
+    try:
+        run_main(tmp_dir, config, *args, output=output)
+    except SystemExit as e:
+        assert match in str(e.code), e.code
+    else:
+        raise AssertionError(f"sweep {args} should have been refused ({match!r})")
+
+
+def test_resume():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        code, _ = run_main(tmp_dir, dict(CONFIG, depot_capacity=[2]))
+        assert code == 0
+        first = pd.read_csv(os.path.join(tmp_dir, 'results.csv'))
+        assert sorted(zip(first['depot_capacity'], first['n_total_parts'])) == [(2, 22), (2, 24)]
+
+        code, out = run_main(tmp_dir, CONFIG, '--resume')
+        assert code == 0
+        assert "2 done, 2 to run" in out, out
+        results = pd.read_csv(os.path.join(tmp_dir, 'results.csv'))
+        points = list(zip(results['depot_capacity'], results['n_total_parts']))
+        assert sorted(points) == [(2, 22), (2, 24), (3, 22), (3, 24)]
+        # Points that were done are kept as written, not re-run
+        pd.testing.assert_frame_equal(results.iloc[:2], first)
+
+        code, out = run_main(tmp_dir, CONFIG, '--resume')
+        assert code == 0 and "4 done, 0 to run" in out, out
+        assert len(pd.read_csv(os.path.join(tmp_dir, 'results.csv'))) == 4
+
+
+def test_refuses_existing_output():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        run_main(tmp_dir, dict(CONFIG, depot_capacity=[2]))
+        assert_refused(tmp_dir, CONFIG, match="--resume")
+
+        changed = dict(CONFIG, params=dict(CONFIG['params'], random_seed=7))
+        assert_refused(tmp_dir, changed, '--resume', match="different settings")
+        assert len(pd.read_csv(os.path.join(tmp_dir, 'results.csv'))) == 2
+
+        code, out = run_main(tmp_dir, changed, '--overwrite')
+        assert code == 0 and "0 done, 4 to run" in out, out
+
+
+def test_parquet_output():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, 'results.parquet')
+        run_main(tmp_dir, dict(CONFIG, depot_capacity=[2]), output='results.parquet')
+        code, out = run_main(tmp_dir, CONFIG, '--resume', output='results.parquet')
+        assert code == 0 and "2 done, 2 to run" in out, out
+        results = pd.read_parquet(output)
+        assert sorted(zip(results['depot_capacity'], results['n_total_parts'])) == [(2, 22), (2, 24), (3, 22), (3, 24)]
+
+        # Without a Parquet engine the sweep stops before running (and losing) any point
+        real = sys.modules.get('pyarrow')
+        sys.modules['pyarrow'] = None  # import pyarrow raises ImportError
+        try:
+            assert_refused(tmp_dir, dict(CONFIG, depot_capacity=[4]), output='missing.parquet', match="pyarrow")
+        finally:
+            if real is None:
+                del sys.modules['pyarrow']
+            else:
+                sys.modules['pyarrow'] = real
+        assert not os.path.exists(os.path.join(tmp_dir, 'missing.parquet'))
+        assert not os.path.exists(os.path.join(tmp_dir, 'missing.parquet.meta.json'))
+
+
+def test_append_rows_schema_change():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, 'results.csv')
+        append_rows(output, [{'depot_capacity': 2, 'n_total_parts': 22, 'avg_micap': 0.5}])
+        append_rows(output, [{'depot_capacity': 2, 'n_total_parts': 24}])
+        append_rows(output, [{'depot_capacity': 3, 'n_total_parts': 22, 'avg_micap': 0.25, 'n_reps': 4}])
+        results = pd.read_csv(output)
+        assert list(results.columns) == ['depot_capacity', 'n_total_parts', 'avg_micap', 'n_reps']
+        assert results['n_total_parts'].tolist() == [22, 24, 22]
+        assert results['avg_micap'].isna().tolist() == [False, True, False]
+        assert results['n_reps'].isna().tolist() == [True, True, False]
+        assert not os.path.exists(output + '.tmp')
+
+
+if __name__ == '__main__':
+    test_resume()
+    print("✅ --resume skips completed points and runs the rest")
+    test_refuses_existing_output()
+    print("✅ existing output and changed settings are refused without --resume/--overwrite")
+    test_parquet_output()
+    print("✅ Parquet output resumes, and a missing Parquet engine stops the sweep before it runs")
+    test_append_rows_schema_change()
+    print("✅ append_rows keeps new columns")
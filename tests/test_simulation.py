@@ -25,17 +25,15 @@ from ds.data_science import DataSets
 from simulation_engine import SimulationEngine
 from initialization import Initialization
 from parameters import Parameters
-from utils import calculate_initial_allocation
+from utils import calculate_initial_allocation, make_sim_rng
 
 import warnings # to silent future warnings, comment to test
 warnings.simplefilter("ignore", category=FutureWarning)
 
-# Set random seed for reproducibility (matching ui_components.py default)
-np.random.seed(132)
-
 # Create Parameters object with hardcoded test values (matching ui_components.py defaults)
 params = Parameters()
 params.set_all({
+    'random_seed': 132, # matching ui_components.py default
     'n_total_parts': 24, # 35
     'n_total_aircraft': 20, # 30
     'mission_capable_rate': 0.60, # 0.60
@@ -102,8 +100,11 @@ else:
 print("Running simulation...")
 print(f"Parameters: {params['n_total_parts']} parts, {params['n_total_aircraft']} aircraft, {sim_time} days")
 
+# Per-run random stream shared by allocation and engine
+rng = make_sim_rng(params['random_seed'])
+
 # Calculate initial allocation & include exogenous params
-allocation = calculate_initial_allocation(params)
+allocation = calculate_initial_allocation(params, rng=rng)
 
 print(f"\nInitial Allocation:")
 print(f"  Aircraft with parts: {allocation['n_aircraft_with_parts']}")
@@ -134,7 +135,8 @@ datasets = DataSets()
 sim_engine = SimulationEngine(
     datasets=datasets,
     params=params,
-    allocation=allocation
+    allocation=allocation,
+    rng=rng
 )
 
 # Run simulation
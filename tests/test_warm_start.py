@@ -0,0 +1,101 @@
+"""
+Warm-up snapshot / fork test for SimulationEngine.
+
+- fork() of a warm-up snapshot with no options runs to the same result as an
+  uninterrupted run
+- FORK_FIXED_PARAMS cannot be overridden in a fork
+- a fork with param_overrides and no new rng rebuilds its stage samplers on a
+  stream that does not collide with the run's stage or initial cycle streams
+- warm-start replications (sc_utils.build_engine with params['warm_start'])
+  share the warm-up but differ from each other after it
+
+Usage:
+    python tests/test_warm_start.py
+    python -m pytest tests/test_warm_start.py
+"""
+
+import os
+import sys
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from duration_sampler import INITIAL_CYCLE_STREAM, KeyedSampler
+from sc_utils import build_engine
+from simulation_engine import FORK_FIXED_PARAMS, SimulationEngine
+from test_checkpoint import assert_same_results, build_params, new_engine
+
+warnings.simplefilter("ignore", category=FutureWarning)
+
+
+def changed_value(value):
+    """A different value of the same kind (flag, number or record backend name)."""
+    if value is None or isinstance(value, bool):
+        return not value
+    if isinstance(value, (int, float)):
+        return value + 1
+    return 'columnar' if value == 'dict' else 'dict'
+
+
+def test_fork_matches_uninterrupted():
+    for overrides in ({}, {'common_random_numbers': True}):
+        params = build_params(**overrides)
+        uninterrupted = new_engine(params).run()
+        snapshot = new_engine(params).warmup_snapshot()
+        assert_same_results(uninterrupted, SimulationEngine.fork(snapshot).run())
+
+
+def test_fork_fixed_params_raise():
+    params = build_params()
+    snapshot = new_engine(params).warmup_snapshot()
+    for name in sorted(FORK_FIXED_PARAMS):
+        try:
+            SimulationEngine.fork(snapshot, param_overrides={name: changed_value(params.get(name))})
+        except ValueError as e:
+            assert name in str(e), e
+        else:
+            raise AssertionError(f"fork accepted a change of {name}")
+    # Unchanged values of fixed params are accepted
+    SimulationEngine.fork(snapshot, param_overrides={'n_total_parts': params['n_total_parts'], 'depot_capacity': 9})
+
+
+def test_fork_override_streams():
+    params = build_params(common_random_numbers=True)
+    snapshot = new_engine(params).warmup_snapshot()
+    run_keys = {(i,) for i in range(INITIAL_CYCLE_STREAM + 1)}
+
+    engine = SimulationEngine.fork(snapshot, param_overrides={'depot_capacity': 9})
+    samplers = engine.samplers
+    assert isinstance(samplers.fleet, KeyedSampler)
+    keys = [samplers.fleet.seed_seq.spawn_key, samplers.fleet_multiplier.seed_seq.spawn_key,
+            samplers.depot.rng.bit_generator.seed_seq.spawn_key,
+            samplers.depot_multiplier.rng.bit_generator.seed_seq.spawn_key]
+    assert len(set(keys)) == len(keys)
+    assert not run_keys & set(keys), keys
+
+    # Same snapshot and overrides give the same continuation
+    result = engine.run()
+    again = SimulationEngine.fork(snapshot, param_overrides={'depot_capacity': 9}).run()
+    assert_same_results(result, again)
+
+
+def test_warm_start_replications_differ():
+    params = build_params(warm_start=True)
+    results = [build_engine(params, (rep,)).run() for rep in range(2)]
+    averages = [result['post_sim'].multi_run_averages for result in results]
+    assert averages[0] != averages[1]
+    assert results[0]['event_counts'] != results[1]['event_counts']
+    # A replication is reproducible from its spawn key
+    assert_same_results(results[1], build_engine(params, (1,)).run())
+
+
+if __name__ == '__main__':
+    test_fork_matches_uninterrupted()
+    print("✅ fork() with no options matches the uninterrupted run")
+    test_fork_fixed_params_raise()
+    print(f"✅ fork() refuses changes to {len(FORK_FIXED_PARAMS)} fixed params")
+    test_fork_override_streams()
+    print("✅ fork() with param_overrides rebuilds samplers on non-colliding streams")
+    test_warm_start_replications_differ()
+    print("✅ warm-start replications differ from each other")
@@ -4,9 +4,12 @@ import streamlit as st
 
 def render_duration_plots(post_sim):
     """
-    Render all duration comparison plots using pre-computed figures from PostSim.
+    Render all duration comparison plots from PostSim (PNG bytes, rendered on first view).
+
+    Each figure group sits behind a toggle (off by default): Streamlit runs
+    every tab body on each rerun, so figures are only rendered once asked for.
     """
-    if not post_sim.dist_figs:
+    if not post_sim.has_figures():
         st.info("Plot rendering is disabled. Check 'Render Plots' in sidebar to enable.")
         return
     
@@ -15,54 +18,55 @@ def render_duration_plots(post_sim):
     ############################
     st.subheader("📈 Fleet Duration Comparison")
     
-    col1, col2 = st.columns(2)
-    with col1:
-        st.write("**Fleet Duration (No Initial Conditions)**")
-        if post_sim.dist_figs.get('fleet_no_init'):
-            st.pyplot(post_sim.dist_figs['fleet_no_init'])
-    
-    with col2:
-        st.write("**Fleet Duration (Initial Conditions Only)**")
-        if post_sim.dist_figs.get('fleet_init_only'):
-            st.pyplot(post_sim.dist_figs['fleet_init_only'])
+    if st.toggle("Show fleet duration plots", key='show_fleet_duration_plots'):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("**Fleet Duration (No Initial Conditions)**")
+            _show_dist_fig(post_sim, 'fleet_no_init')
+        
+        with col2:
+            st.write("**Fleet Duration (Initial Conditions Only)**")
+            _show_dist_fig(post_sim, 'fleet_init_only')
     
     ############################
     # DEPOT DURATION PLOTS
     ############################
     st.subheader("📈 Depot Duration Comparison")
     
-    col3, col4 = st.columns(2)
-    with col3:
-        st.write("**Depot Duration (No Initial Conditions)**")
-        if post_sim.dist_figs.get('depot_no_init'):
-            st.pyplot(post_sim.dist_figs['depot_no_init'])
-    
-    with col4:
-        st.write("**Depot Duration (Initial Conditions Only)**")
-        if post_sim.dist_figs.get('depot_init_only'):
-            st.pyplot(post_sim.dist_figs['depot_init_only'])
+    if st.toggle("Show depot duration plots", key='show_depot_duration_plots'):
+        col3, col4 = st.columns(2)
+        with col3:
+            st.write("**Depot Duration (No Initial Conditions)**")
+            _show_dist_fig(post_sim, 'depot_no_init')
+        
+        with col4:
+            st.write("**Depot Duration (Initial Conditions Only)**")
+            _show_dist_fig(post_sim, 'depot_init_only')
         
     ############################
     # Rest of distribution plots
     ############################
     st.subheader("📈 Stage Duration Distributions")
     
-    col1, col2 = st.columns(2)
-    with col1:
-        if post_sim.dist_figs.get('fleet_full'):
-            st.pyplot(post_sim.dist_figs['fleet_full'])
-    with col2:
-        if post_sim.dist_figs.get('condition_f'):
-            st.pyplot(post_sim.dist_figs['condition_f'])
-    
-    col3, col4 = st.columns(2)
-    with col3:
-        if post_sim.dist_figs.get('depot_full'):
-            st.pyplot(post_sim.dist_figs['depot_full'])
-    with col4:
-        if post_sim.dist_figs.get('condition_a'):
-            st.pyplot(post_sim.dist_figs['condition_a'])
+    if st.toggle("Show stage duration distributions", key='show_stage_duration_plots'):
+        col1, col2 = st.columns(2)
+        with col1:
+            _show_dist_fig(post_sim, 'fleet_full')
+        with col2:
+            _show_dist_fig(post_sim, 'condition_f')
+        
+        col3, col4 = st.columns(2)
+        with col3:
+            _show_dist_fig(post_sim, 'depot_full')
+        with col4:
+            _show_dist_fig(post_sim, 'condition_a')
+
 
+def _show_dist_fig(post_sim, key):
+    """Show one PostSim distribution figure (nothing if it has no data)."""
+    png = post_sim.get_dist_fig(key)
+    if png:
+        st.image(png, use_container_width=True)
 
 
 def plot_fleet_duration_full(all_parts_df):
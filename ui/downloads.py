@@ -3,7 +3,12 @@ downloads.py
 ------------
 Handles download functionality for simulation results.
 
-Provides options for CSV (fast) or Excel (multi-sheet) export.
+Provides options for CSV (fast), Parquet (columnar, compressed) or Excel
+(multi-sheet) export.
+
+The generators are cached by the run id from SessionStateManager. The
+DataSets argument is underscore-prefixed so st.cache_data does not hash the
+DataFrames on every rerun.
 """
 import streamlit as st
 import pandas as pd
@@ -11,35 +16,54 @@ import zipfile
 from io import BytesIO
 
 
-@st.cache_data
-def generate_csv_zip(all_parts_df, all_ac_df, wip_df, wip_raw, wip_ac_df, wip_ac_raw):
-    """Generate ZIP file with CSVs - cached to avoid regeneration."""
+# (file/sheet name, DataSets attribute) of the exported frames
+EXPORT_FRAMES = (
+    ('parts', 'all_parts_df'),
+    ('ac', 'all_ac_df'),
+    ('wip', 'wip_df'),
+    ('wip_raw', 'wip_raw'),
+    ('wip_ac', 'wip_ac_df'),
+    ('wip_ac_raw', 'wip_ac_raw'),
+)
+
+
+@st.cache_data(max_entries=2)
+def generate_csv_zip(run_id, _datasets):
+    """Generate ZIP file with CSVs - cached per run to avoid regeneration."""
     zip_buffer = BytesIO()
     with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr('parts.csv', all_parts_df.to_csv(index=False))
-        zf.writestr('ac.csv', all_ac_df.to_csv(index=False))
-        zf.writestr('wip.csv', wip_df.to_csv(index=False))
-        zf.writestr('wip_raw.csv', wip_raw.to_csv(index=False))
-        zf.writestr('wip_ac.csv', wip_ac_df.to_csv(index=False))
-        zf.writestr('wip_ac_raw.csv', wip_ac_raw.to_csv(index=False))
+        for name, attr in EXPORT_FRAMES:
+            zf.writestr(f'{name}.csv', getattr(_datasets, attr).to_csv(index=False))
+    return zip_buffer.getvalue()
+
+
+@st.cache_data(max_entries=2)
+def generate_parquet_zip(run_id, _datasets):
+    """
+    Generate ZIP file with one Parquet file per frame (zstd-compressed columns) -
+    cached per run. Each file is written straight into the archive, without a
+    text copy of the frame.
+    """
+    zip_buffer = BytesIO()
+    # Parquet pages are compressed already
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_STORED) as zf:
+        for name, attr in EXPORT_FRAMES:
+            with zf.open(f'{name}.parquet', 'w') as f:
+                getattr(_datasets, attr).to_parquet(f, engine='pyarrow', compression='zstd', index=False)
     return zip_buffer.getvalue()
 
 
-@st.cache_data
-def generate_excel(all_parts_df, all_ac_df, wip_df, wip_raw, wip_ac_df, wip_ac_raw):
-    """Generate Excel file - cached to avoid regeneration."""
+@st.cache_data(max_entries=2)
+def generate_excel(run_id, _datasets):
+    """Generate Excel file - cached per run to avoid regeneration."""
     output = BytesIO()
     with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        all_parts_df.to_excel(writer, sheet_name='parts', index=False)
-        all_ac_df.to_excel(writer, sheet_name='ac', index=False)
-        wip_df.to_excel(writer, sheet_name='wip', index=False)
-        wip_raw.to_excel(writer, sheet_name='wip_raw', index=False)
-        wip_ac_df.to_excel(writer, sheet_name='wip_ac', index=False)
-        wip_ac_raw.to_excel(writer, sheet_name='wip_ac_raw', index=False)
+        for name, attr in EXPORT_FRAMES:
+            getattr(_datasets, attr).to_excel(writer, sheet_name=name, index=False)
     return output.getvalue()
 
 
-def render_download_section(datasets):
+def render_download_section(datasets, run_id):
     """
     Render the download section with format selection.
     
@@ -47,6 +71,9 @@ def render_download_section(datasets):
     ----------
     datasets : DataSets
         DataSets object containing all_parts_df, all_ac_df, and wip_df.
+    run_id : str
+        Id of the stored run (SessionStateManager.get_run_id), the cache key
+        of the generated files
     """
     st.markdown("---")
     st.subheader("💾 Download Results")
@@ -54,20 +81,15 @@ def render_download_section(datasets):
     # Format selection
     download_format = st.radio(
         "Select download format:",
-        ["CSV (Fast)", "Excel (Slower, multi-sheet)"],
+        ["CSV (Fast)", "Parquet (Fastest, compressed)", "Excel (Slower, multi-sheet)"],
         horizontal=True,
-        help="CSV creates a zip with separate files. Excel creates one file with multiple sheets but takes longer to generate."
+        help="CSV creates a zip with separate files. Parquet creates a zip of compressed columnar files "
+             "(pandas.read_parquet, Arrow, R arrow) - best for large runs. "
+             "Excel creates one file with multiple sheets but takes longer to generate."
     )
     
     if download_format == "CSV (Fast)":
-        csv_data = generate_csv_zip(
-            datasets.all_parts_df,
-            datasets.all_ac_df,
-            datasets.wip_df,
-            datasets.wip_raw,
-            datasets.wip_ac_df,
-            datasets.wip_ac_raw
-        )
+        csv_data = generate_csv_zip(run_id, datasets)
         
         st.download_button(
             label="📥 Download CSV Files (ZIP)",
@@ -76,17 +98,20 @@ def render_download_section(datasets):
             mime="application/zip"
         )
     
+    elif download_format == "Parquet (Fastest, compressed)":
+        parquet_data = generate_parquet_zip(run_id, datasets)
+        
+        st.download_button(
+            label="📥 Download Parquet Files (ZIP)",
+            data=parquet_data,
+            file_name="simulation_results_parquet.zip",
+            mime="application/zip"
+        )
+    
     else:  # Excel format
         st.info("⏳ Excel generation may take a few seconds for large datasets.")
         
-        excel_data = generate_excel(
-            datasets.all_parts_df,
-            datasets.all_ac_df,
-            datasets.wip_df,
-            datasets.wip_raw,
-            datasets.wip_ac_df,
-            datasets.wip_ac_raw
-        )
+        excel_data = generate_excel(run_id, datasets)
         
         st.download_button(
             label="📥 Download Excel File",
@@ -5,35 +5,8 @@ Provides Streamlit widgets for configuring loop parameters in multi-run simulati
 """
 
 import streamlit as st
-import numpy as np
 
-
-def build_loop_values(use_list, value_list, range_min, range_max, range_mode, range_param):
-    """
-    Build list of values based on configuration.
-    """
-    if use_list:
-        return value_list
-    
-    if range_mode == 'all':
-        # Every value in range
-        return list(range(range_min, range_max + 1))
-    
-    elif range_mode == 'interval':
-        # Every X interval
-        values = list(range(range_min, range_max + 1, range_param))
-        # Ensure max is included if not already
-        if values[-1] != range_max:
-            values.append(range_max)
-        return values
-    
-    elif range_mode == 'count':
-        # X evenly spaced values
-        if range_param <= 1:
-            return [range_max]
-        return [int(round(v)) for v in np.linspace(range_min, range_max, range_param)]
-    
-    return list(range(range_min, range_max + 1))
+from sc_executor import build_loop_values
 
 
 def parse_list_input(text):
@@ -0,0 +1,144 @@
+"""
+Stores the code for the scenario Optimizer TAB
+
+Runs sc_optimizer.search_min_parts over the depot values from the Setup tab:
+smallest n_total_parts meeting a MICAP target per depot level, the cheapest
+configuration and the Pareto frontier of the evaluated points.
+"""
+import traceback
+
+import streamlit as st
+import matplotlib.pyplot as plt
+
+from sc_optimizer import search_min_parts
+
+
+def render_optimizer_tab(base_params, depot_values, parts_values, max_workers,
+                         n_reps=1, max_reps=None, antithetic=False):
+    """
+    Render the Optimizer tab (inputs, run button and stored results).
+
+    Args:
+        base_params: dict of fixed parameters (same as the grid sweep)
+        depot_values: Depot capacities from the Setup tab loop parameters
+        parts_values: n_total_parts values from the Setup tab (default search range)
+        max_workers: Number of worker processes
+        n_reps, max_reps, antithetic: Replication settings from the sidebar
+    """
+    st.subheader("🎯 Optimizer: Minimum Parts per Depot Capacity")
+    st.markdown(
+        "Bisection over **n_total_parts** for every depot capacity in the Setup tab, "
+        "instead of running the full grid. Uses fast mode runs."
+    )
+    if n_reps > 1 or antithetic:
+        st.caption("Points whose MICAP CI contains the target get more replications (up to Max Replications).")
+
+    if 'optimizer_results' not in st.session_state:
+        st.session_state.optimizer_results = None
+
+    parts_default_min = min(parts_values) if parts_values else 1
+    parts_default_max = max(parts_values) if parts_values else 100
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        parts_min = st.number_input("Parts Min", min_value=1, value=int(parts_default_min), step=1, key="opt_parts_min")
+        parts_max = st.number_input("Parts Max", min_value=1, value=int(parts_default_max), step=1, key="opt_parts_max")
+    with col2:
+        micap_target = st.number_input(
+            "Target Avg MICAP", min_value=0.0, value=1.0, step=0.1, format="%.3f", key="opt_micap_target",
+            help="A configuration is feasible when its average MICAP is at or below this value"
+        )
+    with col3:
+        depot_cost = st.number_input("Cost per Depot Slot", min_value=0.0, value=1.0, step=0.5, key="opt_depot_cost")
+        part_cost = st.number_input("Cost per Part", min_value=0.0, value=1.0, step=0.5, key="opt_part_cost")
+
+    run_optimizer = st.button("▶️ Run Optimizer", type="primary", key="run_optimizer")
+
+    if run_optimizer:
+        if not depot_values:
+            st.error("Please enter valid depot capacity values in the Setup tab.")
+            return
+        if parts_min > parts_max:
+            st.error("Parts Min must be less than or equal to Parts Max.")
+            return
+
+        plt.close('all')
+        status_text = st.empty()
+
+        def progress(round_index, n_evaluations, result):
+            status_text.text(
+                f"Round {round_index + 1}: {n_evaluations} points evaluated | "
+                f"depot={int(result['depot_capacity'])}, parts={int(result['n_total_parts'])}, "
+                f"Avg MICAP: {result['avg_micap']:.3f}"
+            )
+
+        optimizer_params = dict(base_params, render_plots=False,
+                                metrics_only=base_params.get('time_weighted_averages', False))
+        if optimizer_params['metrics_only']:
+            optimizer_params['record_backend'] = 'dict'  # metrics-only keeps no records
+        with st.spinner("Searching..."):
+            results = search_min_parts(
+                optimizer_params, depot_values, int(parts_min), int(parts_max), micap_target,
+                max_workers=max_workers, n_reps=n_reps, max_reps=max_reps, antithetic=antithetic,
+                depot_cost=depot_cost, part_cost=part_cost, progress=progress
+            )
+        status_text.empty()
+        for depot_cap, n_parts, error in results['errors']:
+            st.warning(f"Run (depot={depot_cap}, parts={n_parts}) failed: {error}")
+            st.code("".join(traceback.format_exception(error)))
+
+        grid_size = len(set(depot_values)) * (int(parts_max) - int(parts_min) + 1)
+        results['summary'] = (
+            f"Evaluated {len(results['evaluations'])} of {grid_size} grid points "
+            f"(target Avg MICAP <= {micap_target:g})"
+        )
+        st.session_state.optimizer_results = results
+
+    results = st.session_state.optimizer_results
+    if results is None:
+        st.info("Set the search range and MICAP target, then click **Run Optimizer**.")
+        return
+
+    st.success(results['summary'])
+    best = results['best']
+    if best is None:
+        st.warning("No configuration in the search range meets the MICAP target.")
+    else:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Best Depot Capacity", int(best['depot_capacity']))
+        col2.metric("Best N Total Parts", int(best['n_total_parts']))
+        micap_text = f"{best['avg_micap']:.3f}"
+        if 'avg_micap_ci_half' in best:
+            micap_text += f" ± {best['avg_micap_ci_half']:.3f}"
+        col3.metric("Avg MICAP", micap_text)
+        col4.metric("Cost", f"{best['cost']:g}")
+
+    # Minimum parts by depot capacity
+    min_parts = {d: p for d, p in results['min_parts'].items() if p is not None}
+    if min_parts:
+        fig, ax = plt.subplots(figsize=(10, 5))
+        ax.plot(list(min_parts), list(min_parts.values()), marker='o')
+        ax.set_xlabel('Depot Capacity')
+        ax.set_ylabel('Minimum N Total Parts')
+        ax.set_title('Minimum Parts Meeting the MICAP Target')
+        ax.grid(True, alpha=0.3)
+        st.pyplot(fig)
+        plt.close(fig)
+
+    base_columns = ['depot_capacity', 'n_total_parts', 'avg_micap']
+    ci_columns = [c for c in ('avg_micap_ci_half', 'n_reps') if c in results['evaluations']]
+
+    st.markdown("#### Minimal Configuration per Depot Capacity")
+    if len(results['candidates']):
+        st.dataframe(results['candidates'][base_columns + ci_columns + ['cost']], use_container_width=True)
+
+    st.markdown("#### Pareto Frontier (Depot Capacity, N Total Parts, Avg MICAP)")
+    if len(results['frontier']):
+        st.dataframe(results['frontier'][base_columns + ci_columns], use_container_width=True)
+
+    with st.expander("All Evaluated Points", expanded=False):
+        if len(results['evaluations']):
+            st.dataframe(
+                results['evaluations'][base_columns + ci_columns + ['feasible', 'round', 'avg_fleet', 'avg_depot']],
+                use_container_width=True
+            )
@@ -24,6 +24,9 @@ def compute_summaries(df):
     """
     Compute best configurations from results DataFrame.
     
+    With replications (avg_micap_ci_half column) the summaries also show the
+    95% CI half-width of MICAP and the number of replications.
+    
     Args:
         df: DataFrame with simulation results
         
@@ -32,6 +35,7 @@ def compute_summaries(df):
                    summary_df, summary_parts_df, best_row
     """
     best_row = df.loc[df['avg_micap'].idxmin()]
+    has_ci = 'avg_micap_ci_half' in df.columns
     depots = sorted(df['depot_capacity'].unique())
     parts_unique = sorted(df['n_total_parts'].unique())
     
@@ -51,6 +55,9 @@ def compute_summaries(df):
             'Avg Depot': round(best['avg_depot'], 2),
             'Avg Cd_A': round(best['avg_cd_a'], 2),
         })
+        if has_ci:
+            summary_rows[-1]['MICAP ±95% CI'] = round(best['avg_micap_ci_half'], 2)
+            summary_rows[-1]['Reps'] = int(best['n_reps'])
     
     summary_df = pd.DataFrame(summary_rows)
     
@@ -70,6 +77,9 @@ def compute_summaries(df):
             'Avg Depot': round(best['avg_depot'], 2),
             'Avg Cd_A': round(best['avg_cd_a'], 2),
         })
+        if has_ci:
+            summary_parts_rows[-1]['MICAP ±95% CI'] = round(best['avg_micap_ci_half'], 2)
+            summary_parts_rows[-1]['Reps'] = int(best['n_reps'])
     
     summary_parts_df = pd.DataFrame(summary_parts_rows)
     
@@ -88,7 +98,11 @@ def display_best_metrics(best_row):
     """Display the best overall metrics at top of results."""
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Best MICAP", f"{best_row['avg_micap']:.2f}")
+        if 'avg_micap_ci_half' in best_row:
+            st.metric("Best MICAP", f"{best_row['avg_micap']:.2f} ± {best_row['avg_micap_ci_half']:.2f}",
+                      help=f"Mean of {int(best_row['n_reps'])} replications ± 95% CI half-width")
+        else:
+            st.metric("Best MICAP", f"{best_row['avg_micap']:.2f}")
     with col2:
         st.metric("Best Depot", f"{int(best_row['depot_capacity'])}")
     with col3:
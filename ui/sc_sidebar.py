@@ -8,6 +8,8 @@ Combines multi_run and multi_fast functionality with a Fast Mode toggle.
 import streamlit as st
 import numpy as np
 from utils import init_fleet_random, init_depot_random, weibull_mean
+from sc_executor import default_worker_count
+from sc_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_MB, ResultCache
 
 
 def render_scenarios_sidebar():
@@ -19,7 +21,11 @@ def render_scenarios_sidebar():
     - use_percentage_plots option is hidden (not needed)
     
     Returns:
-        dict: All sidebar parameter values including 'fast_mode' flag
+        dict: All sidebar parameter values including 'fast_mode' flag,
+              'time_weighted' and 'compact_records' flags, 'max_workers' (parallel worker processes) and
+              replication settings ('n_reps', 'max_reps', 'target_half_width',
+              'common_random_numbers', 'antithetic', 'warm_start') and result cache settings
+              ('cache_dir', 'cache_max_mb', 'force_recompute')
     """
     
     # ================================================================
@@ -35,7 +41,139 @@ def render_scenarios_sidebar():
     
     if fast_mode:
         st.sidebar.info("⚡ Fast Mode: Plot rendering disabled for speed.")
-    
+
+    time_weighted = st.sidebar.checkbox(
+        "Time-Weighted Averages",
+        value=False,
+        help="Average WIP/MICAP as area under the step curve divided by the analysis window "
+             "(warmup/closing excluded). Unchecked: mean of raw WIP rows, one row per change. "
+             "With Fast Mode the raw WIP tables are not built at all.",
+        key="scenario_time_weighted"
+    )
+
+    compact_records = st.sidebar.checkbox(
+        "Compact Records",
+        value=False,
+        help="Store part/aircraft cycles in NumPy column arrays: about half the record memory and "
+             "faster table export, slightly slower event loop. Results are the same. Not used with "
+             "Fast Mode + Time-Weighted Averages (no records are kept).",
+        key="scenario_compact_records"
+    )
+
+    cpu_count = default_worker_count()
+    max_workers = st.sidebar.number_input(
+        "Parallel Workers",
+        min_value=1,
+        max_value=cpu_count,
+        value=cpu_count,
+        step=1,
+        help="Number of worker processes used to run scenarios in parallel. Set to 1 to run serially.",
+        key="scenario_max_workers"
+    )
+
+    # ================================================================
+    # REPLICATIONS (independent seeded runs per grid point)
+    # ================================================================
+    st.sidebar.markdown("**Replications**")
+    common_random_numbers = st.sidebar.checkbox(
+        "Common Random Numbers",
+        value=False,
+        help="Draw fleet durations from per-aircraft substreams and initial part cycles from "
+             "per-part substreams, so neighbouring grid points see the same aircraft "
+             "histories and differences between points have lower variance.",
+        key="scenario_common_random_numbers"
+    )
+    n_reps = st.sidebar.number_input(
+        "Replications per Point",
+        min_value=1,
+        value=1,
+        step=1,
+        help="Independent runs per (depot, parts) point on separate random streams. "
+             "With more than 1, results show the mean with standard error and 95% CI.",
+        key="scenario_n_reps"
+    )
+    antithetic = st.sidebar.checkbox(
+        "Antithetic Pairs",
+        value=False,
+        help="Run replications in pairs on the same seed; the second run of a pair draws fleet/depot "
+             "durations from 1 - u (inverse CDF). Pairs are averaged before the CI. "
+             "Replication counts are rounded up to even.",
+        key="scenario_antithetic"
+    )
+    warm_start = st.sidebar.checkbox(
+        "Warm-Start Replications",
+        value=False,
+        help="Run the warm-up period once per point and fork every replication from the end of "
+             "warm-up (only post-warm-up events use the replication stream). Saves the warm-up "
+             "share of run time; the CI then covers post-warm-up variability only.",
+        key="scenario_warm_start"
+    )
+    sequential_stopping = st.sidebar.checkbox(
+        "Sequential Stopping",
+        value=False,
+        help="Keep adding replications to a point until the 95% CI half-width of Avg MICAP "
+             "is at or below the target (or the max is reached).",
+        key="scenario_sequential_stopping"
+    )
+    max_reps = int(n_reps)
+    target_half_width = None
+    if sequential_stopping:
+        target_half_width = st.sidebar.number_input(
+            "Target MICAP CI Half-Width",
+            min_value=0.001,
+            value=0.5,
+            step=0.1,
+            format="%.3f",
+            key="scenario_target_half_width"
+        )
+        max_reps = st.sidebar.number_input(
+            "Max Replications per Point",
+            min_value=max(2, int(n_reps)),
+            value=max(30, int(n_reps)),
+            step=1,
+            key="scenario_max_reps"
+        )
+
+    # ================================================================
+    # RESULT CACHE (on-disk results keyed by full parameter hash)
+    # ================================================================
+    st.sidebar.markdown("**Result Cache**")
+    use_cache = st.sidebar.checkbox(
+        "Use Result Cache",
+        value=False,
+        help="Reuse stored results of runs with identical parameters, random stream and code "
+             "version, so re-running an overlapping sweep only simulates the new points.",
+        key="scenario_use_cache"
+    )
+    force_recompute = False
+    cache_max_mb = DEFAULT_MAX_MB
+    if use_cache:
+        force_recompute = st.sidebar.checkbox(
+            "Force Recompute",
+            value=False,
+            help="Run every point again and overwrite the stored results.",
+            key="scenario_force_recompute"
+        )
+        cache_max_mb = st.sidebar.number_input(
+            "Cache Size Limit (MB)",
+            min_value=1,
+            value=DEFAULT_MAX_MB,
+            step=64,
+            help="Least recently used results are evicted above this size.",
+            key="scenario_cache_max_mb"
+        )
+        # The SQLite file is only opened on a button press here (runs open it per point)
+        col_size, col_clear = st.sidebar.columns(2)
+        show_size = col_size.button("Cache Size", key="scenario_cache_size")
+        clear_cache = col_clear.button("Clear Cache", key="scenario_clear_cache")
+        if show_size or clear_cache:
+            cache = ResultCache(DEFAULT_CACHE_DIR, max_bytes=int(cache_max_mb) * 1024 * 1024)
+            if clear_cache:
+                cache.clear()
+                st.sidebar.success("Result cache cleared.")
+            cache_stats = cache.stats()
+            st.sidebar.caption(f"Cache: {cache_stats['entries']:,} results, {cache_stats['size_bytes'] / 1024 ** 2:.1f} MB")
+
     st.sidebar.markdown("---")
     
     # ================================================================
@@ -185,6 +323,18 @@ def render_scenarios_sidebar():
     # Return all sidebar values
     return {
         'fast_mode': fast_mode,
+        'time_weighted': time_weighted,
+        'compact_records': compact_records,
+        'max_workers': int(max_workers),
+        'n_reps': int(n_reps),
+        'max_reps': int(max_reps),
+        'target_half_width': target_half_width,
+        'common_random_numbers': common_random_numbers,
+        'antithetic': antithetic,
+        'warm_start': warm_start,
+        'cache_dir': DEFAULT_CACHE_DIR if use_cache else None,
+        'cache_max_mb': int(cache_max_mb),
+        'force_recompute': force_recompute,
         'n_total_aircraft': n_total_aircraft,
         'analysis_periods': analysis_periods,
         'condemn_cycle': condemn_cycle,
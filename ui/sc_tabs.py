@@ -113,6 +113,13 @@ def render_full_data_tab(df, summary_df, summary_parts_df):
     
     for col in ['MICAP', 'Fleet', 'Cd_F', 'Depot(WIP)', 'Cd_A']:
         display_df[col] = display_df[col].round(2)
+
+    # Replications: 95% CI half-width per metric (full CI/SE columns are in the download)
+    if 'n_reps' in df.columns:
+        for metric, col in [('avg_micap', 'MICAP'), ('avg_fleet', 'Fleet'), ('avg_cd_f', 'Cd_F'),
+                            ('avg_depot', 'Depot(WIP)'), ('avg_cd_a', 'Cd_A')]:
+            display_df.insert(display_df.columns.get_loc(col) + 1, f'{col} ±', df[f'{metric}_ci_half'].round(2).values)
+        display_df['Reps'] = df['n_reps'].values
     
     st.dataframe(display_df, use_container_width=True, hide_index=True)
     
@@ -1,95 +1,14 @@
 """
 stats.py
 --------
-Calculates and renders simulation statistics for the UI.
+Renders simulation statistics for the UI (computed in ds/stats.py).
 """
 import streamlit as st
 import pandas as pd
 import numpy as np
 
-
-def calculate_duration_stats(series, name):
-    """
-    Calculate min, mean, max for a duration series.
-    
-    Parameters
-    ----------
-    series : pd.Series
-        Duration values (with NaN allowed)
-    name : str
-        Name of the duration for display
-    
-    Returns
-    -------
-    dict
-        Keys: name, count, mean, min, max
-    """
-    clean = series.dropna()
-    if len(clean) == 0:
-        return {'name': name, 'count': 0, 'mean': np.nan, 'min': np.nan, 'max': np.nan}
-    
-    return {
-        'name': name,
-        'count': len(clean),
-        'mean': clean.mean(),
-        'min': clean.min(),
-        'max': clean.max()
-    }
-
-
-def calculate_simulation_stats(datasets):
-    """
-    Calculate all simulation statistics from datasets.
-    
-    Parameters
-    ----------
-    datasets : DataSets
-        Contains all_parts_df, all_ac_df, wip_df
-    
-    Returns
-    -------
-    dict
-        All calculated statistics
-    """
-    stats = {}
-    
-    # --- MICAP Stats (from wip_df) ---
-    df = datasets.wip_ac_raw
-    if df is not None and len(df) > 0:
-        micap_all = df['micap']
-        micap_nonzero = df[df['micap'] > 0]['micap']
-        
-        stats['micap'] = {
-            'avg_with_zeros': micap_all.mean(), # average w/ no-micap days included
-            'count_all': len(micap_all),
-            # average micap including days where at least one MICAP existed
-            'avg_no_zeros': micap_nonzero.mean() if len(micap_nonzero) > 0 else np.nan,
-            'count_nonzero': len(micap_nonzero),
-            'max_micap': micap_all.max(),
-            'min_micap': micap_all.min()
-        }
-    else:
-        stats['micap'] = None
-    
-    # --- Duration Stats (from all_parts_df) ---
-    parts_df = datasets.all_parts_df
-    if parts_df is not None and len(parts_df) > 0:
-        stats['fleet_duration'] = calculate_duration_stats(
-            parts_df['fleet_duration'], 'Fleet Duration')
-        stats['depot_duration'] = calculate_duration_stats(
-            parts_df['depot_duration'], 'Depot Duration')
-        stats['condition_a_duration'] = calculate_duration_stats(
-            parts_df['condition_a_duration'], 'Condition A Duration')
-        stats['condition_f_duration'] = calculate_duration_stats(
-            parts_df['condition_f_duration'], 'Condition F Duration')
-    
-    # --- MICAP Duration (from all_ac_df) ---
-    ac_df = datasets.all_ac_df
-    if ac_df is not None and len(ac_df) > 0:
-        stats['micap_duration'] = calculate_duration_stats(
-            ac_df['micap_duration'], 'MICAP Duration')
-    
-    return stats
+from ds.stats import (calculate_duration_stats, calculate_simulation_stats,
+                      calculate_multi_run_averages)
 
 
  # POSTSIM CLASS - NEW: render_stats_tab now takes post_sim
@@ -152,29 +71,6 @@ def render_stats_tab(post_sim):
 
 
 
-def calculate_multi_run_averages(datasets):
-    """
-    Compute averages for multi-model results (for a single run).
-    """
-    wip_ac_raw = datasets.wip_ac_raw
-    wip_raw = datasets.wip_raw
-    if wip_ac_raw is None or len(wip_ac_raw) == 0 or wip_raw is None or len(wip_raw) == 0:
-        return {
-            'avg_micap': np.nan,
-            'avg_fleet': np.nan,
-            'avg_cd_f': np.nan,
-            'avg_depot': np.nan,
-            'avg_cd_a': np.nan,
-            'count': 0
-        }
-    return {
-        'avg_micap': wip_ac_raw['micap'].mean(),
-        'avg_fleet': wip_raw['fleet'].mean(),
-        'avg_cd_f': wip_raw['condition_f'].mean(),
-        'avg_depot': wip_raw['depot'].mean(),
-        'avg_cd_a': wip_raw['condition_a'].mean(),
-        'count': len(wip_ac_raw)
-    }
 def render_multi_run_averages(post_sim):
     """
     Render the multi-model averages (used in multi_run) for a single run.
@@ -190,4 +86,38 @@ def render_multi_run_averages(post_sim):
         st.metric("Avg Depot", f"{avgs['avg_depot']:.2f}")
     with col3:
         st.metric("Avg Cd_A", f"{avgs['avg_cd_a']:.2f}")
-        st.caption(f"n = {avgs['count']:,}")
\ No newline at end of file
+        st.caption(f"n = {avgs['count']:,}")
+
+def render_engine_profile(profile):
+    """
+    Render the engine profile (validation_results['profile'] from a run with
+    'Profile Engine' checked): handler timings, phase timings and heap size.
+    """
+    st.subheader("⏱️ Engine Profile")
+
+    phases = profile['phases']
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Profiled Time", f"{sum(phases.values()):.3f} s")
+    with col2:
+        st.metric("Event Loop", f"{phases.get('event_loop', 0.0):.3f} s")
+        st.caption(f"Outside handlers: {profile['loop_overhead_s']:.3f} s")
+    with col3:
+        st.metric("Max Heap Size", f"{profile['heap']['max']:,}")
+        st.caption("Peak over every event (the chart is sampled)")
+
+    st.markdown("**Event Handlers**")
+    handlers = pd.DataFrame(profile['handlers'])
+    st.dataframe(
+        handlers.style.format({'total_s': '{:.4f}', 'mean_us': '{:.2f}', 'share': '{:.1%}'}),
+        use_container_width=True
+    )
+
+    st.markdown("**Phases**")
+    phase_df = pd.DataFrame(list(phases.items()), columns=['phase', 'seconds'])
+    st.dataframe(phase_df.style.format({'seconds': '{:.4f}'}), use_container_width=True)
+
+    heap = pd.DataFrame({'sim_time': profile['heap']['sim_time'], 'heap_size': profile['heap']['heap_size']})
+    if len(heap):
+        st.markdown("**Event Heap Size Over Simulation Time** (sampled every 100 events)")
+        st.line_chart(heap, x='sim_time', y='heap_size')
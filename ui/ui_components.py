@@ -21,6 +21,21 @@ def render_sidebar():
         help="Uncheck to skip plot rendering (faster for testing)"
     )
 
+    # Toggle for engine profiling
+    profile = st.sidebar.checkbox(
+        "Profile Engine",
+        value=False,
+        help="Time each event handler, the event heap size and the post-processing phases (small overhead)"
+    )
+
+    # Toggle for the columnar record backend
+    compact_records = st.sidebar.checkbox(
+        "Compact Records",
+        value=False,
+        help="Store part/aircraft cycles in NumPy column arrays: about half the record memory and "
+             "faster table export, slightly slower event loop. Results are the same."
+    )
+
     # Basic parameters
     n_total_parts = st.sidebar.number_input(
         "Total Parts",
@@ -56,8 +71,8 @@ def render_sidebar():
     """
     The model is programmed to condemn parts after a specified number of cycles.
     Randomizing initial cycles requires `condemn_cycle` to be greater than 1.
-     - np.random.randint(1, condemn_cycle)
-     - With condemn_cycle = 1, this is randint(1, 1) which raises ValueError: low >= high
+     - rng.integers(1, condemn_cycle)
+     - With condemn_cycle = 1, this is integers(1, 1) which raises ValueError: low >= high
 
      
     `SimulationEngine.initialize_depot` is not designed to handle part condemnation.
@@ -245,6 +260,8 @@ def render_sidebar():
     # Combine all parameters
     return {
         'render_plots': render_plots,
+        'profile': profile,
+        'record_backend': 'columnar' if compact_records else 'dict',
         'n_total_parts': n_total_parts,
         'n_total_aircraft': n_total_aircraft,
         'warmup_periods': warmup_periods,
@@ -1,6 +1,58 @@
+import numpy as np
 import streamlit as st
 import matplotlib.pyplot as plt
 
+# Time buckets for plotted WIP series (>= the 1500 px width of a 10in figure at 150 dpi)
+PLOT_BUCKETS = 2000
+
+# PostSim WIP figure key -> toggle label
+WIP_PLOT_LABELS = {
+    'micap': 'MICAP',
+    'fleet': 'fleet WIP',
+    'condition_f': 'Condition F WIP',
+    'depot': 'depot WIP',
+    'condition_a': 'Condition A WIP',
+}
+
+
+def decimate_series(x, y, n_buckets=PLOT_BUCKETS):
+    """
+    Downsample a time series for plotting, keeping its shape at pixel resolution.
+
+    x is split into n_buckets equal time buckets and each bucket keeps its
+    first, last, minimum and maximum point (in time order), so every step and
+    peak that can show up in the plot is still drawn. Series with at most
+    4 * n_buckets points are returned unchanged.
+
+    Parameters
+    ----------
+    x : array-like
+        Sorted times (e.g. wip_raw['sim_time'])
+    y : array-like
+        Values at x
+    n_buckets : int
+        Number of time buckets
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (x, y) with at most 4 * n_buckets points
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    if n <= 4 * n_buckets or x[-1] <= x[0]:
+        return x, y
+    edges = np.linspace(x[0], x[-1], n_buckets + 1)
+    bucket = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, n_buckets - 1)
+    # x is sorted, so each bucket is a contiguous run of rows
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    # Rows ordered by (bucket, y): first/last row of each run = min/max of the bucket
+    by_value = np.lexsort((y, bucket))
+    keep = np.unique(np.concatenate([starts, ends, by_value[starts], by_value[ends]]))
+    return x[keep], y[keep]
+
 
 def add_stats_box(ax, data, column_name):
     """Add average and standard deviation statistics to plot."""
@@ -16,32 +68,28 @@ def add_stats_box(ax, data, column_name):
 
 def render_wip_plots(post_sim):
     """
-    Render individual WIP plots using pre-computed figures from PostSim.
+    Render individual WIP plots from PostSim (PNG bytes, rendered on first view).
     
     Parameters
     ----------
     post_sim : PostSim
-        PostSim object containing pre-computed wip_figs
+        PostSim object with the run's datasets
     """
     if not post_sim.has_wip_data():
         st.warning("No WIP data available to plot.")
         return
     
-    if not post_sim.wip_figs:
+    if not post_sim.has_figures():
         st.info("Plot rendering is disabled. Check 'Render Plots' in sidebar to enable.")
         return
     
-    # Display pre-computed plots
-    if post_sim.wip_figs.get('micap'):
-        st.pyplot(post_sim.wip_figs['micap'])
-    if post_sim.wip_figs.get('fleet'):
-        st.pyplot(post_sim.wip_figs['fleet'])
-    if post_sim.wip_figs.get('condition_f'):
-        st.pyplot(post_sim.wip_figs['condition_f'])
-    if post_sim.wip_figs.get('depot'):
-        st.pyplot(post_sim.wip_figs['depot'])
-    if post_sim.wip_figs.get('condition_a'):
-        st.pyplot(post_sim.wip_figs['condition_a'])
+    # One toggle per plot (off by default): Streamlit runs every tab body on
+    # each rerun, so a plot is only rendered once asked for (then memoized)
+    for key, label in WIP_PLOT_LABELS.items():
+        if st.toggle(f"Show {label} over time", key=f'show_wip_{key}_plot'):
+            png = post_sim.get_wip_fig(key)
+            if png:
+                st.image(png, use_container_width=True)
 
 
 def plot_micap_over_time(wip_ac_raw, n_total_aircraft, use_percentage=True):
@@ -50,7 +98,7 @@ def plot_micap_over_time(wip_ac_raw, n_total_aircraft, use_percentage=True):
     
     if use_percentage:
         y_data = wip_ac_raw['micap'] / n_total_aircraft * 100
-        ax.step(wip_ac_raw['sim_time'], y_data, where='post', linewidth=2, color='red')
+        ax.step(*decimate_series(wip_ac_raw['sim_time'], y_data), where='post', linewidth=2, color='red')
         ax.set_ylabel('Percentage of Aircraft (%)')
         # Stats box showing percentage
         avg_val = y_data.mean()
@@ -58,7 +106,7 @@ def plot_micap_over_time(wip_ac_raw, n_total_aircraft, use_percentage=True):
         stats_text = f'avg = {avg_val:.2f}%\nstd = {std_val:.2f}%'
     else:
         y_data = wip_ac_raw['micap']
-        ax.step(wip_ac_raw['sim_time'], y_data, where='post', linewidth=2, color='red')
+        ax.step(*decimate_series(wip_ac_raw['sim_time'], y_data), where='post', linewidth=2, color='red')
         ax.set_ylabel('Number of MICAP Aircraft')
         # Stats box showing counts
         avg_val = y_data.mean()
@@ -81,7 +129,7 @@ def plot_fleet_wip_over_time(wip_ac_raw, n_total_aircraft, use_percentage=True):
     
     if use_percentage:
         y_data = wip_ac_raw['fleet'] / n_total_aircraft * 100
-        ax.plot(wip_ac_raw['sim_time'], y_data, linewidth=2, color='steelblue')
+        ax.plot(*decimate_series(wip_ac_raw['sim_time'], y_data), linewidth=2, color='steelblue')
         ax.set_ylabel('Percentage of Aircraft (%)')
         # Stats box showing percentage
         avg_val = y_data.mean()
@@ -89,7 +137,7 @@ def plot_fleet_wip_over_time(wip_ac_raw, n_total_aircraft, use_percentage=True):
         stats_text = f'avg = {avg_val:.2f}%\nstd = {std_val:.2f}%'
     else:
         y_data = wip_ac_raw['fleet']
-        ax.plot(wip_ac_raw['sim_time'], y_data, linewidth=2, color='steelblue')
+        ax.plot(*decimate_series(wip_ac_raw['sim_time'], y_data), linewidth=2, color='steelblue')
         ax.set_ylabel('Number of Aircraft')
         # Stats box showing counts
         avg_val = y_data.mean()
@@ -113,7 +161,7 @@ def plot_condition_f_wip_over_time(wip_raw, n_total_parts, use_percentage=True):
     
     if use_percentage:
         y_data = wip_raw['condition_f'] / n_total_parts * 100
-        ax.plot(wip_raw['sim_time'], y_data, linewidth=2, color='coral')
+        ax.plot(*decimate_series(wip_raw['sim_time'], y_data), linewidth=2, color='coral')
         ax.set_ylabel('Percentage of Parts (%)')
         # Stats box showing percentage
         avg_val = y_data.mean()
@@ -121,7 +169,7 @@ def plot_condition_f_wip_over_time(wip_raw, n_total_parts, use_percentage=True):
         stats_text = f'avg = {avg_val:.2f}%\nstd = {std_val:.2f}%'
     else:
         y_data = wip_raw['condition_f']
-        ax.plot(wip_raw['sim_time'], y_data, linewidth=2, color='coral')
+        ax.plot(*decimate_series(wip_raw['sim_time'], y_data), linewidth=2, color='coral')
         ax.set_ylabel('Number of Parts')
         # Stats box showing counts
         avg_val = y_data.mean()
@@ -144,7 +192,7 @@ def plot_depot_wip_over_time(wip_raw, depot_capacity, use_percentage=True):
     
     if use_percentage:
         y_data = wip_raw['depot'] / depot_capacity * 100
-        ax.plot(wip_raw['sim_time'], y_data, linewidth=2, color='mediumseagreen')
+        ax.plot(*decimate_series(wip_raw['sim_time'], y_data), linewidth=2, color='mediumseagreen')
         ax.set_ylabel('Percentage of Depot Capacity (%)')
         # Stats box showing percentage
         avg_val = y_data.mean()
@@ -152,7 +200,7 @@ def plot_depot_wip_over_time(wip_raw, depot_capacity, use_percentage=True):
         stats_text = f'avg = {avg_val:.2f}%\nstd = {std_val:.2f}%'
     else:
         y_data = wip_raw['depot']
-        ax.plot(wip_raw['sim_time'], y_data, linewidth=2, color='mediumseagreen')
+        ax.plot(*decimate_series(wip_raw['sim_time'], y_data), linewidth=2, color='mediumseagreen')
         ax.set_ylabel('Number of Parts')
         # Stats box showing counts
         avg_val = y_data.mean()
@@ -175,7 +223,7 @@ def plot_condition_a_wip_over_time(wip_raw, n_total_parts, use_percentage=True):
     
     if use_percentage:
         y_data = wip_raw['condition_a'] / n_total_parts * 100
-        ax.plot(wip_raw['sim_time'], y_data, linewidth=2, color='mediumpurple')
+        ax.plot(*decimate_series(wip_raw['sim_time'], y_data), linewidth=2, color='mediumpurple')
         ax.set_ylabel('Percentage of Parts (%)')
         # Stats box showing percentage
         avg_val = y_data.mean()
@@ -183,7 +231,7 @@ def plot_condition_a_wip_over_time(wip_raw, n_total_parts, use_percentage=True):
         stats_text = f'avg = {avg_val:.2f}%\nstd = {std_val:.2f}%'
     else:
         y_data = wip_raw['condition_a']
-        ax.plot(wip_raw['sim_time'], y_data, linewidth=2, color='mediumpurple')
+        ax.plot(*decimate_series(wip_raw['sim_time'], y_data), linewidth=2, color='mediumpurple')
         ax.set_ylabel('Number of Parts')
         # Stats box showing counts
         avg_val = y_data.mean()
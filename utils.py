@@ -3,116 +3,10 @@ import numpy as np
 from scipy.special import gamma
 from scipy.optimize import fsolve
 
+# Re-exported: the Streamlit-free versions live in allocation.py
+from allocation import make_sim_rng, calculate_initial_allocation
 
 
-def calculate_initial_allocation(params) -> dict:
-    """
-    Calculate Initial Conditions.
-    
-    Parameters
-    ----------
-    params :
-        - n_total_parts: Total parts in the system
-        - n_total_aircraft: Total aircraft in the fleet
-        - mission_capable_rate: Percentage (0.0 to 1.0) of aircraft with parts
-        - depot_capacity: Maximum parts that can be in depot
-        - condemn_cycle: Maximum cycle number for randomizing initial cycles
-        - parts_in_depot: Number of parts starting in depot (from UI)
-        - parts_in_cond_f: Number of parts starting in Condition F (from UI)
-        - parts_in_cond_a: Number of parts starting in Condition A (from UI)
-        
-    Returns
-    -------
-    dict with keys:
-
-        'parts_in_depot': Number of parts starting in depot
-        'parts_in_cond_a': Number of parts starting in Condition A
-        'parts_in_cond_f': Number of parts starting in Condition F
-        'n_aircraft_with_parts': Number of aircraft with parts installed
-        'n_aircraft_w_out_parts': Number of aircraft starting in MICAP
-        'cond_a_part_ids': List of part_ids for Condition A
-        'cond_a_cycles': List of randomized cycle numbers for Condition A parts (NEW)
-        'cond_f_part_ids': List of part_ids for Condition F
-        'depot_part_ids': List of part_ids for depot
-        'micap_ac_ids': List of aircraft IDs starting in MICAP
-    """
-    # Extract params
-    n_total_parts = params['n_total_parts']
-    n_total_aircraft = params['n_total_aircraft']
-    mission_capable_rate = params['mission_capable_rate']
-    depot_capacity = params['depot_capacity']
-    condemn_cycle = params['condemn_cycle']
-    parts_in_depot = params['parts_in_depot']
-    parts_in_cond_f = params['parts_in_cond_f']
-    parts_in_cond_a = params['parts_in_cond_a']
-    
-    # Validate mission_capable_rate
-    if not (0.0 <= mission_capable_rate <= 1.0):
-        raise ValueError(
-            f"mission_capable_rate must be between 0.0 and 1.0, got {mission_capable_rate}"
-        )
-    
-    # Step 1: Calculate aircraft with parts (mission capable). rounds up
-    n_aircraft_with_parts = min(n_total_parts, int(np.ceil(mission_capable_rate * n_total_aircraft)))
-
-    
-    # Aircraft without parts (will start in MICAP)
-    n_aircraft_w_out_parts = n_total_aircraft - n_aircraft_with_parts
-    
-    # Step 2: Calculate part_id lists
-    # Part allocation order: aircraft -> depot -> cond_f -> cond_a
-    
-    # NEED to Get RID of using this to also allocate initial sim_id and des_id
-    # until then the order these events are added need to happen in this order. IC_FS is 1st
-    f_start_ac_part_ids = list(range(0, n_aircraft_with_parts))
-    depot_part_ids = list(range(n_aircraft_with_parts, n_aircraft_with_parts + parts_in_depot)) # 2nd
-    cond_f_part_ids = list(range(n_aircraft_with_parts + parts_in_depot, n_aircraft_with_parts
-                                  + parts_in_depot + parts_in_cond_f)) # 3rd
-    cond_a_part_ids = list(range(n_aircraft_with_parts + parts_in_depot + parts_in_cond_f, 
-                                 n_aircraft_with_parts + parts_in_depot + parts_in_cond_f + parts_in_cond_a)) # 4th
-    micap_ac_ids = list(range(n_aircraft_with_parts, n_aircraft_with_parts + n_aircraft_w_out_parts))
-
-    # Generate randomized cycles for Condition A parts
-    # (1, condemn_cycle + 1) = 1 ≤ cycle ≤ condemn_cycle = randomly chosen between 1 and 20
-    # remove the 1 so randomized does not start part in condemn. 
-    # it will be better to have +1 so it starts parts in condemn
-    # just need to handle the initial functions
-    # to handle condemn parts
-    # I guess code can be added to condmen parts with cycle >=20
-    # but also parts shouldn't have cycles higher then condemn
-    # so its better to find a part with a cycle above 20 then to have the 
-    # model blindly handle them
-
-    # I temporarily set cond_a_cycle to do one less because its restarting cycle in initial
-    # so if it starts at cycle 19, it will be at cycle 20 by end of init cond
-    # and init cond does not have code to handle condemn parts yet
-    cond_a_cycles = [np.random.randint(1, condemn_cycle - 1) for _ in range(parts_in_cond_a)]
-
-    # generate randomized cycles for parts starting in DEPOT
-    # added in SimulationEngine.inject_initial_depot_parts
-    # (1, condemn_cycle + 1) = 1 ≤ cycle ≤ condemn_cycle = randomly chosen between 1 and 20
-    depot_cycles = [np.random.randint(1, condemn_cycle) for _ in range(parts_in_depot)]
-
-    # generate randomized cycles for parts starting in CONDITION F
-    # added in SimulationEngine.inject_init_cond_f
-    cond_f_cycles = [np.random.randint(1, condemn_cycle) for _ in range(parts_in_cond_f)]
-
-    return {
-        'parts_in_depot': parts_in_depot,
-        'parts_in_cond_a': parts_in_cond_a,
-        'parts_in_cond_f': parts_in_cond_f,
-        'n_aircraft_with_parts': n_aircraft_with_parts,
-        'n_aircraft_w_out_parts': n_aircraft_w_out_parts,
-        'f_start_ac_part_ids': f_start_ac_part_ids,
-        'cond_a_part_ids': cond_a_part_ids,
-        'cond_f_part_ids': cond_f_part_ids,
-        'depot_part_ids': depot_part_ids,
-        'micap_ac_ids': micap_ac_ids,
-        'cond_a_cycles': cond_a_cycles,
-        'depot_cycles': depot_cycles,
-        'cond_f_cycles': cond_f_cycles
-    }
-
 def render_allocation_inputs(n_total_parts, n_total_aircraft, mission_capable_rate, 
                               depot_capacity, parts_air_dif):
     """